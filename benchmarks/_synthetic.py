@@ -0,0 +1,102 @@
+"""Generate synthetic "juju status --format json" output for Juju 2.9 models of any size."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+SINCE = '15 Jul 2025 22:21:35+12:00'
+
+
+def status_dict(
+    *, apps: int = 10, units_per_app: int = 40, machines: int | None = None
+) -> dict[str, Any]:
+    """Return a decoded status dict with *apps* x *units_per_app* units.
+
+    Each unit is placed on its own machine unless *machines* is given, in which case units are
+    spread round-robin over that many machines (extra machines have no units).
+    """
+    num_units = apps * units_per_app
+    if machines is None:
+        machines = num_units
+    machine_dicts = {str(i): _machine(i) for i in range(machines)}
+    app_dicts: dict[str, Any] = {}
+    n = 0
+    for a in range(apps):
+        name = f'app{a}'
+        units: dict[str, Any] = {}
+        for u in range(units_per_app):
+            units[f'{name}/{u}'] = _unit(u, str(n % machines) if machines else '')
+            n += 1
+        app_dicts[name] = {
+            'charm': name,
+            'series': 'jammy',
+            'os': 'ubuntu',
+            'charm-origin': 'charmhub',
+            'charm-name': name,
+            'charm-rev': 42,
+            'charm-channel': 'stable',
+            'exposed': False,
+            'application-status': {'current': 'active', 'since': SINCE},
+            'relations': {'peers': [name]},
+            'units': units,
+            'version': '1.0',
+            'endpoint-bindings': {'': 'alpha', 'peers': 'alpha'},
+        }
+    return {
+        'model': {
+            'name': 'bench',
+            'type': 'iaas',
+            'controller': 'lxd',
+            'cloud': 'localhost',
+            'region': 'localhost',
+            'version': '2.9.52',
+            'model-status': {'current': 'available', 'since': SINCE},
+            'sla': 'unsupported',
+        },
+        'machines': machine_dicts,
+        'applications': app_dicts,
+        'storage': {},
+        'controller': {'timestamp': '22:25:16+12:00'},
+    }
+
+
+def status_json(**kwargs: Any) -> str:
+    """Return :func:`status_dict` encoded the way the Juju CLI does (compact JSON)."""
+    return json.dumps(status_dict(**kwargs), separators=(',', ':'))
+
+
+def _unit(index: int, machine: str) -> dict[str, Any]:
+    return {
+        'workload-status': {'current': 'active', 'message': 'ready', 'since': SINCE},
+        'juju-status': {'current': 'idle', 'since': SINCE, 'version': '2.9.52'},
+        'leader': index == 0,
+        'machine': machine,
+        'open-ports': ['8080/tcp'],
+        'public-address': f'10.0.{index // 250}.{index % 250}',
+    }
+
+
+def _machine(index: int) -> dict[str, Any]:
+    address = f'10.1.{index // 250}.{index % 250}'
+    return {
+        'juju-status': {'current': 'started', 'since': SINCE, 'version': '2.9.52'},
+        'hostname': f'juju-abcdef-{index}',
+        'dns-name': address,
+        'ip-addresses': [address, f'fd42:51ee:3f62:3b1f:216:3eff:fe08:{index:04x}'],
+        'instance-id': f'juju-abcdef-{index}',
+        'machine-status': {'current': 'running', 'message': 'Running', 'since': SINCE},
+        'modification-status': {'current': 'applied', 'since': SINCE},
+        'series': 'jammy',
+        'network-interfaces': {
+            'eth0': {
+                'ip-addresses': [address],
+                'mac-address': '00:16:3e:08:2b:06',
+                'gateway': '10.1.0.1',
+                'space': 'alpha',
+                'is-up': True,
+            },
+        },
+        'constraints': 'arch=amd64',
+        'hardware': 'arch=amd64 cores=2 mem=4096M',
+    }
@@ -0,0 +1,92 @@
+"""Compare fetching the status with the CLI transport and with the API transport.
+
+Run from the repository root with ``PYTHONPATH=. uv run python benchmarks/api_transport.py``.
+
+The fake ``juju`` takes CLI_TIME seconds per command, standing in for the real CLI's process
+start-up, login, and connection to the controller, and the API transport talks to the fake
+API server from the unit tests, on localhost, over a single connection.
+"""
+
+from __future__ import annotations
+
+import json
+import pathlib
+import sys
+import tempfile
+import time
+from typing import Any
+
+import jubilant_backports as jubilant
+from tests.unit.fake_api import APIServer
+
+APPS = 5
+CALLS = 20
+CLI_TIME = 0.2
+
+FAKE_JUJU = """\
+#!{python}
+import pathlib, sys, time
+time.sleep({cli_time})
+print((pathlib.Path(sys.argv[0]).parent / 'status.json').read_text())
+"""
+
+
+def full_status(apps: int) -> dict[str, Any]:
+    """Return a ``Client.FullStatus`` result with *apps* apps of three units each."""
+    status = {'status': 'active', 'since': '2025-02-24T12:03:17Z'}
+    return {
+        'model': {'name': 'mdl', 'type': 'caas', 'cloud-tag': 'cloud-k8s', 'version': '3.6.1'},
+        'machines': {},
+        'applications': {
+            f'app{i}': {
+                'charm': f'ch:amd64/jammy/app{i}-1',
+                'base': {'name': 'ubuntu', 'channel': '22.04'},
+                'status': status,
+                'units': {
+                    f'app{i}/{u}': {'workload-status': status, 'agent-status': status}
+                    for u in range(3)
+                },
+            }
+            for i in range(apps)
+        },
+        'relations': [],
+        'controller-timestamp': '2025-02-24T12:04:55Z',
+    }
+
+
+def fetch(juju: jubilant.Juju) -> float:
+    """Return the seconds taken to fetch the status CALLS times."""
+    t0 = time.perf_counter()
+    for _ in range(CALLS):
+        juju.status()
+    return time.perf_counter() - t0
+
+
+def main():
+    """Print the time for CALLS status fetches each way."""
+    server = APIServer()
+    server.handle('Client', 'FullStatus', full_status(APPS))
+    with tempfile.TemporaryDirectory() as tmp:
+        state = pathlib.Path(tmp)
+        transport = jubilant.APITransport(state / 'juju-data', tls=False)
+        server.write_juju_data(state / 'juju-data')
+        api_juju = jubilant.Juju(model='mdl', cli_version='3.6.1', transport=transport)
+
+        # Have the fake CLI output the same status that the API transport returns.
+        stdout = api_juju.cli('status', '--format', 'json')
+        (state / 'status.json').write_text(stdout)
+        juju_path = state / 'juju'
+        juju_path.write_text(FAKE_JUJU.format(python=sys.executable, cli_time=CLI_TIME))
+        juju_path.chmod(0o755)
+        cli_juju = jubilant.Juju(model='mdl', cli_binary=juju_path, cli_version='3.6.1')
+
+        print(f'{CALLS} status calls, {APPS} apps; each "juju" command takes {CLI_TIME}s:')
+        print(f'  {"CLI transport:":16} {fetch(cli_juju):6.3f}s')
+        print(f'  {"API transport:":16} {fetch(api_juju):6.3f}s')
+        assert json.loads(stdout)['applications'].keys() == {f'app{i}' for i in range(APPS)}
+        transport.close()
+    server.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Compare setting up a 10-app model one command at a time and with ``Juju.batch``.
+
+Run from the repository root with ``uv run python benchmarks/batch_setup.py``.
+
+The fake ``juju`` sleeps for CLI_TIME seconds for every command, standing in for the process
+start-up, controller login, and round trip of a real one. The setup deploys a database and
+nine apps, configures each app, and integrates each app with the database.
+"""
+
+from __future__ import annotations
+
+import pathlib
+import sys
+import tempfile
+import time
+
+import jubilant_backports as jubilant
+
+CLI_TIME = 0.3
+APPS = [f'app{i}' for i in range(9)]
+
+FAKE_JUJU = """\
+#!{python}
+import time
+time.sleep({cli_time})
+"""
+
+
+def serial(juju: jubilant.Juju) -> None:
+    """Set up the model one command after another."""
+    juju.deploy('db')
+    for app in APPS:
+        juju.deploy(app)
+        juju.config(app, {'debug': True})
+        juju.integrate(app, 'db')
+
+
+def batched(juju: jubilant.Juju, max_workers: int) -> None:
+    """Set up the model with a batch, integrating each app after it and the db are deployed."""
+    with juju.batch(max_workers=max_workers) as batch:
+        db = batch.submit(juju.deploy, 'db')
+        for app in APPS:
+            deployed = batch.submit(juju.deploy, app)
+            batch.submit(juju.config, app, {'debug': True}, after=[deployed])
+            batch.submit(juju.integrate, app, 'db', after=[deployed, db])
+
+
+def main():
+    """Print the wall-clock time for each way of setting up the model."""
+    with tempfile.TemporaryDirectory() as tmp:
+        juju_path = pathlib.Path(tmp) / 'juju'
+        juju_path.write_text(FAKE_JUJU.format(python=sys.executable, cli_time=CLI_TIME))
+        juju_path.chmod(0o755)
+        juju = jubilant.Juju(cli_binary=juju_path, cli_version='2.9.52')
+
+        print(f'10 deploys, 9 configs, and 9 integrates; each command takes {CLI_TIME}s:')
+        t0 = time.perf_counter()
+        serial(juju)
+        print(f'  {"serial:":24} {time.perf_counter() - t0:5.2f}s')
+        for workers in (4, 8, 16):
+            t0 = time.perf_counter()
+            batched(juju, workers)
+            label = f'batch(max_workers={workers}):'
+            print(f'  {label:24} {time.perf_counter() - t0:5.2f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""Compare repeated read-only queries with and without a ``CLICache``.
+
+Run from the repository root with ``uv run python benchmarks/cli_cache.py``.
+
+A test helper checks the status and two apps' config before and after each of ROUNDS config
+changes, as test code often does. The fake ``juju`` takes CLI_TIME seconds per command.
+"""
+
+from __future__ import annotations
+
+import json
+import pathlib
+import sys
+import tempfile
+import time
+
+import _synthetic
+
+import jubilant_backports as jubilant
+
+CLI_TIME = 0.1
+ROUNDS = 5
+
+FAKE_JUJU = """\
+#!{python}
+import pathlib, sys, time
+time.sleep({cli_time})
+state = pathlib.Path(sys.argv[0]).parent
+if sys.argv[1] == 'status':
+    print((state / 'status.json').read_text())
+elif sys.argv[1] == 'config' and '--format' in sys.argv:
+    print('{{"settings": {{"debug": {{"type": "boolean", "value": false}}}}}}')
+"""
+
+
+def check(juju: jubilant.Juju) -> None:
+    """Check the status and config, like a test helper."""
+    juju.status()
+    juju.config('app0')
+    juju.config('app1')
+
+
+def scenario(juju: jubilant.Juju) -> None:
+    """Check the model several times around each config change."""
+    for i in range(ROUNDS):
+        for _ in range(3):
+            check(juju)
+        juju.config('app0', {'debug': i % 2 == 0})
+        check(juju)
+
+
+def main():
+    """Print the wall-clock time and number of CLI calls each way."""
+    with tempfile.TemporaryDirectory() as tmp:
+        state = pathlib.Path(tmp)
+        (state / 'status.json').write_text(json.dumps(_synthetic.status_dict(apps=5)))
+        juju_path = state / 'juju'
+        juju_path.write_text(FAKE_JUJU.format(python=sys.executable, cli_time=CLI_TIME))
+        juju_path.chmod(0o755)
+
+        print(f'{ROUNDS} config changes, checking status and config around each:')
+        for label, cache in [('no cache', None), ('CLICache', jubilant.CLICache())]:
+            juju = jubilant.Juju(cli_binary=juju_path, cli_version='2.9.52', cache=cache)
+            t0 = time.perf_counter()
+            scenario(juju)
+            elapsed = time.perf_counter() - t0
+            counts = '' if cache is None else f' ({cache.hits} hits, {cache.misses} misses)'
+            print(f'  {label + ":":10} {elapsed:5.2f}s{counts}')
+
+
+if __name__ == '__main__':
+    main()
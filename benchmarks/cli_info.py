@@ -0,0 +1,60 @@
+"""Measure constructing ``Juju`` with the CLI version remembered on disk, and without it.
+
+Run from the repository root with ``uv run python benchmarks/cli_info.py``.
+
+The fake ``juju`` takes CLI_TIME seconds for ``juju version``, standing in for the process
+start-up of the real (Go) binary, which is slower when it's a snap. Test suites construct
+``Juju`` for every ``temp_model()``.
+"""
+
+from __future__ import annotations
+
+import os
+import pathlib
+import sys
+import tempfile
+import time
+
+import jubilant_backports as jubilant
+
+CLI_TIME = 0.05
+INSTANCES = 50
+
+FAKE_JUJU = """\
+#!{python}
+import time
+time.sleep({cli_time})
+print('"3.6.8"')
+"""
+
+
+def construct(juju_path: pathlib.Path) -> float:
+    """Return the seconds taken to construct INSTANCES instances."""
+    t0 = time.perf_counter()
+    for _ in range(INSTANCES):
+        jubilant.Juju(cli_binary=juju_path)
+    return time.perf_counter() - t0
+
+
+def main():
+    """Print the time to construct ``Juju`` instances each way."""
+    with tempfile.TemporaryDirectory() as tmp:
+        juju_path = pathlib.Path(tmp) / 'juju'
+        juju_path.write_text(FAKE_JUJU.format(python=sys.executable, cli_time=CLI_TIME))
+        juju_path.chmod(0o755)
+        cache_file = pathlib.Path(tmp) / 'cache' / 'cli-info.json'
+        os.environ['JUBILANT_CACHE_DIR'] = str(cache_file.parent)
+
+        print(f'Constructing {INSTANCES} Juju instances; "juju version" takes {CLI_TIME}s:')
+        uncached = 0.0
+        for _ in range(INSTANCES):
+            cache_file.unlink(missing_ok=True)
+            t0 = time.perf_counter()
+            jubilant.Juju(cli_binary=juju_path)
+            uncached += time.perf_counter() - t0
+        print(f'  {"version not cached:":22} {uncached:6.3f}s')
+        print(f'  {"version cached:":22} {construct(juju_path):6.3f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""Compare running a command on many units with ``exec`` and with ``exec_multiple``.
+
+Run from the repository root with ``uv run python benchmarks/exec_multiple.py``.
+
+The fake ``juju`` sleeps for CLI_TIME seconds for every command, standing in for the process
+start-up, controller login, and round trip of a real one, then prints a Juju 2.9 ``exec``
+result for each unit it was given.
+"""
+
+from __future__ import annotations
+
+import pathlib
+import sys
+import tempfile
+import time
+
+import jubilant_backports as jubilant
+
+CLI_TIME = 0.3
+UNITS = [f'ubuntu/{i}' for i in range(50)]
+
+FAKE_JUJU = """\
+#!{python}
+import json, sys, time
+time.sleep({cli_time})
+units = sys.argv[sys.argv.index('--unit') + 1].split(',')
+print(json.dumps([{{'unit': u, 'return-code': 0, 'stdout': u + '\\\\n'}} for u in units]))
+"""
+
+
+def main():
+    """Print the wall-clock time to gather a file from every unit each way."""
+    with tempfile.TemporaryDirectory() as tmp:
+        juju_path = pathlib.Path(tmp) / 'juju'
+        juju_path.write_text(FAKE_JUJU.format(python=sys.executable, cli_time=CLI_TIME))
+        juju_path.chmod(0o755)
+        juju = jubilant.Juju(cli_binary=juju_path, cli_version='2.9.52')
+
+        print(f'cat /etc/hostname on {len(UNITS)} units; each command takes {CLI_TIME}s:')
+        t0 = time.perf_counter()
+        one_by_one = {unit: juju.exec('cat /etc/hostname', unit=unit).stdout for unit in UNITS}
+        print(f'  {"exec per unit:":16} {time.perf_counter() - t0:5.2f}s')
+        t0 = time.perf_counter()
+        tasks = juju.exec_multiple('cat /etc/hostname', units=UNITS)
+        print(f'  {"exec_multiple:":16} {time.perf_counter() - t0:5.2f}s')
+        assert {unit: task.stdout for unit, task in tasks.items()} == one_by_one
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""Compare running an action on many units with ``run`` and with ``run_multiple``.
+
+Run from the repository root with ``uv run python benchmarks/run_multiple.py``.
+
+The fake ``juju`` takes CLI_TIME seconds for every command. Actions take ACTION_TIME seconds
+on each unit: ``run-action --wait`` sleeps that long, and a background ``run-action`` records
+when the tasks will finish, for ``show-operation`` to report.
+"""
+
+from __future__ import annotations
+
+import os
+import pathlib
+import sys
+import tempfile
+import time
+
+import jubilant_backports as jubilant
+
+CLI_TIME = 0.1
+ACTION_TIME = 2.0
+UNITS = [f'mysql/{i}' for i in range(10)]
+
+FAKE_JUJU = """\
+#!{python}
+import json, os, pathlib, sys, time
+time.sleep({cli_time})
+state = pathlib.Path(os.environ['FAKE_JUJU_STATE'])
+args = sys.argv[1:]
+if args[0] == 'run-action' and '--wait' in args:
+    time.sleep({action_time})
+    unit = args[3]
+    tag = 'unit-' + unit.replace('/', '-')
+    print(json.dumps({{tag: {{'id': '1', 'status': 'completed', 'results': {{}}}}}}))
+elif args[0] == 'run-action':
+    units = args[1:-1]
+    (state / 'units').write_text(json.dumps(units))
+    (state / 'done_at').write_text(str(time.time() + {action_time}))
+    print('Scheduled operation 1 with %d tasks' % len(units), file=sys.stderr)
+elif args[0] == 'show-operation':
+    units = json.loads((state / 'units').read_text())
+    done = time.time() >= float((state / 'done_at').read_text())
+    status = 'completed' if done else 'running'
+    tasks = {{
+        str(i + 2): {{'host': 'unit-' + u.replace('/', '-'), 'status': status}}
+        for i, u in enumerate(units)
+    }}
+    print(json.dumps({{'status': status, 'tasks': tasks}}))
+"""
+
+
+def main():
+    """Print the wall-clock time to run an action on every unit each way."""
+    with tempfile.TemporaryDirectory() as tmp:
+        juju_path = pathlib.Path(tmp) / 'juju'
+        fake = FAKE_JUJU.format(python=sys.executable, cli_time=CLI_TIME, action_time=ACTION_TIME)
+        juju_path.write_text(fake)
+        juju_path.chmod(0o755)
+        os.environ['FAKE_JUJU_STATE'] = tmp
+        juju = jubilant.Juju(cli_binary=juju_path, cli_version='2.9.52')
+
+        print(f'Action taking {ACTION_TIME}s on {len(UNITS)} units:')
+        t0 = time.perf_counter()
+        for unit in UNITS:
+            juju.run(unit, 'backup')
+        print(f'  {"run per unit:":26} {time.perf_counter() - t0:5.2f}s')
+        for delay in (1.0, 0.25):
+            t0 = time.perf_counter()
+            tasks = juju.run_multiple(UNITS, 'backup', delay=delay)
+            label = f'run_multiple(delay={delay}):'
+            print(f'  {label:26} {time.perf_counter() - t0:5.2f}s')
+            assert sorted(tasks) == sorted(UNITS)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""Compare worker processes polling the status directly and through a shared broker.
+
+Run from the repository root with ``uv run python benchmarks/shared_status.py``.
+
+Each of WORKERS processes, like pytest-xdist workers on one model, calls ``juju.wait()``
+for a model that becomes active ACTIVE_AFTER seconds after they start. The fake ``juju``
+takes CLI_TIME seconds per ``juju status`` and counts its calls.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+import subprocess
+import sys
+import tempfile
+import time
+
+import _synthetic
+
+CLI_TIME = 0.3
+WORKERS = 6
+ACTIVE_AFTER = 4.0
+
+FAKE_JUJU = """\
+#!{python}
+import os, pathlib, time
+state = pathlib.Path(os.environ['FAKE_JUJU_STATE'])
+with open(state / 'calls', 'a') as f:
+    f.write('status\\n')
+time.sleep({cli_time})
+ready_at = float((state / 'ready_at').read_text())
+name = 'active' if time.time() >= ready_at else 'maintenance'
+print((state / (name + '.json')).read_text())
+"""
+
+WORKER = """\
+import sys
+import jubilant_backports as jubilant
+juju = jubilant.Juju(model='bench', cli_binary=sys.argv[1], cli_version='2.9.52')
+juju.__dict__['_temp_dir'] = sys.argv[2]
+if sys.argv[3] == 'shared':
+    juju.status_broker(interval=1.0, shared=True)
+juju.wait(jubilant.all_active, successes=1)
+"""
+
+
+def run_workers(state: pathlib.Path, mode: str) -> tuple[float, int]:
+    """Return the time for all the workers to finish, and the number of CLI calls."""
+    (state / 'calls').write_text('')
+    (state / 'ready_at').write_text(str(time.time() + ACTIVE_AFTER))
+    shared_dir = tempfile.mkdtemp(dir=state)
+    t0 = time.perf_counter()
+    workers = [
+        subprocess.Popen([sys.executable, '-c', WORKER, str(state / 'juju'), shared_dir, mode])
+        for _ in range(WORKERS)
+    ]
+    for worker in workers:
+        worker.wait()
+    return time.perf_counter() - t0, len((state / 'calls').read_text().split())
+
+
+def main():
+    """Print the number of ``juju status`` processes each way."""
+    with tempfile.TemporaryDirectory() as tmp:
+        state = pathlib.Path(tmp)
+        active = _synthetic.status_dict(apps=5, units_per_app=3)
+        maintenance = json.loads(json.dumps(active).replace('"active"', '"maintenance"'))
+        (state / 'active.json').write_text(json.dumps(active))
+        (state / 'maintenance.json').write_text(json.dumps(maintenance))
+        juju_path = state / 'juju'
+        juju_path.write_text(FAKE_JUJU.format(python=sys.executable, cli_time=CLI_TIME))
+        juju_path.chmod(0o755)
+        os.environ['FAKE_JUJU_STATE'] = tmp
+
+        print(
+            f'{WORKERS} processes waiting {ACTIVE_AFTER}s for a model; status takes {CLI_TIME}s:'
+        )
+        for mode in ('direct', 'shared'):
+            elapsed, calls = run_workers(state, mode)
+            print(f'  {mode + ":":8} {elapsed:5.2f}s, {calls:3} juju status calls')
+
+
+if __name__ == '__main__':
+    main()
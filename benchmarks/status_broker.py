@@ -0,0 +1,81 @@
+"""Compare threads polling the status directly and through a shared ``StatusBroker``.
+
+Run from the repository root with ``uv run python benchmarks/status_broker.py``.
+
+Each of THREADS threads calls ``juju.status()`` in a loop for DURATION seconds, like fixtures
+and helper threads each waiting on the same model. The fake ``juju`` takes CLI_TIME seconds
+per ``juju status`` and counts its calls.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+import sys
+import tempfile
+import threading
+import time
+
+import _synthetic
+
+import jubilant_backports as jubilant
+
+CLI_TIME = 0.3
+THREADS = 8
+DURATION = 5.0
+
+FAKE_JUJU = """\
+#!{python}
+import os, pathlib, time
+state = pathlib.Path(os.environ['FAKE_JUJU_STATE'])
+with open(state / 'calls', 'a') as f:
+    f.write('status\\n')
+time.sleep({cli_time})
+print((state / 'status.json').read_text())
+"""
+
+
+def poll(juju: jubilant.Juju, polls: list[int]) -> None:
+    """Call ``juju.status()`` until DURATION has passed."""
+    end = time.monotonic() + DURATION
+    count = 0
+    while time.monotonic() < end:
+        juju.status()
+        count += 1
+    polls.append(count)
+
+
+def run_threads(state: pathlib.Path, juju: jubilant.Juju) -> tuple[int, int]:
+    """Return the number of status results the threads got, and of CLI calls made."""
+    (state / 'calls').write_text('')
+    polls: list[int] = []
+    threads = [threading.Thread(target=poll, args=(juju, polls)) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(polls), len((state / 'calls').read_text().split())
+
+
+def main():
+    """Print the number of ``juju status`` processes each way."""
+    with tempfile.TemporaryDirectory() as tmp:
+        state = pathlib.Path(tmp)
+        (state / 'status.json').write_text(json.dumps(_synthetic.status_dict(apps=5)))
+        juju_path = state / 'juju'
+        juju_path.write_text(FAKE_JUJU.format(python=sys.executable, cli_time=CLI_TIME))
+        juju_path.chmod(0o755)
+        os.environ['FAKE_JUJU_STATE'] = tmp
+        juju = jubilant.Juju(cli_binary=juju_path, cli_version='2.9.52')
+
+        print(f'{THREADS} threads calling status() for {DURATION}s; each call takes {CLI_TIME}s:')
+        results, calls = run_threads(state, juju)
+        print(f'  {"direct:":16} {results:4} results from {calls:4} juju status calls')
+        with juju.status_broker(interval=1.0):
+            results, calls = run_threads(state, juju)
+        print(f'  {"status broker:":16} {results:4} results from {calls:4} juju status calls')
+
+
+if __name__ == '__main__':
+    main()
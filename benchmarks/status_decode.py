@@ -0,0 +1,43 @@
+"""Compare full and per-section decoding of a large machine model's status.
+
+Run from the repository root with ``uv run python benchmarks/status_decode.py``.
+
+Each round decodes the status JSON, parses it lazily, and evaluates ``all_active`` and
+``any_error``, which is what one ``wait()`` poll does with the default predicates.
+"""
+
+from __future__ import annotations
+
+import json
+import timeit
+from typing import Any, Callable
+
+import _synthetic
+
+import jubilant_backports as jubilant
+from jubilant_backports._status_json import loads_sections
+
+ROUNDS = 20
+
+
+def main():
+    """Print the time per poll for both decoders."""
+    text = _synthetic.status_json(apps=20, units_per_app=10, machines=2000)
+    print(f'2,000 machines, 200 units: {len(text) / 1e6:.1f} MB of JSON')
+    full = _time(lambda: _poll(json.loads(text)))
+    sections = _time(lambda: _poll(loads_sections(text)))
+    print(f'  json.loads:     {full * 1000:6.1f} ms per poll')
+    print(f'  loads_sections: {sections * 1000:6.1f} ms per poll ({full / sections:.1f}x faster)')
+
+
+def _poll(d: Any) -> bool:
+    status = jubilant.Status._from_dict(d, lazy=True)
+    return jubilant.all_active(status) and not jubilant.any_error(status)
+
+
+def _time(func: Callable[[], object]) -> float:
+    return min(timeit.repeat(func, number=1, repeat=ROUNDS))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Measure the memory used by parsed Status objects, with and without ``__slots__``.
+
+Run from the repository root with ``uv run python benchmarks/status_memory.py``.
+
+The "dict" numbers rebuild the status dataclasses without slots (as they were before slots were
+added), so both layouts can be compared in one run.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import gc
+import sys
+import tracemalloc
+from typing import Any
+
+import _synthetic
+
+from jubilant_backports import statustypes
+
+SLOTTED = [
+    'MeterStatus',
+    'UnitStatus',
+    'AppStatus',
+    'BranchStatus',
+    'MachineStatus',
+    'ModelStatus',
+]
+HISTORY = 20
+
+
+def main():
+    """Print per-unit memory for a history of parsed statuses."""
+    d = _synthetic.status_dict(apps=10, units_per_app=40)
+    num_units = 400
+    slotted = _measure(d)
+    slotted_unit = _object_size(statustypes.Status._from_dict(d).apps['app0'].units['app0/0'])
+    originals = {name: getattr(statustypes, name) for name in SLOTTED}
+    try:
+        for name, cls in originals.items():
+            setattr(statustypes, name, _unslotted(cls))
+        unslotted = _measure(d)
+        unslotted_unit = _object_size(
+            statustypes.Status._from_dict(d).apps['app0'].units['app0/0']
+        )
+    finally:
+        for name, cls in originals.items():
+            setattr(statustypes, name, cls)
+
+    print(f'{HISTORY} statuses of {num_units} units (and {num_units} machines) each')
+    for label, total in [('dict', unslotted), ('slots', slotted)]:
+        per_unit = total / (HISTORY * num_units)
+        print(f'  {label:>5}: {total / 1e6:7.1f} MB total, {per_unit:6.0f} bytes per unit')
+    print(f'  saved: {100 * (1 - slotted / unslotted):.0f}%')
+    print(f'UnitStatus instance itself: {unslotted_unit} bytes -> {slotted_unit} bytes')
+
+
+def _measure(d: dict[str, Any]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    history = [statustypes.Status._from_dict(d) for _ in range(HISTORY)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del history
+    return current
+
+
+def _object_size(obj: object) -> int:
+    size = sys.getsizeof(obj)
+    if hasattr(obj, '__dict__'):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def _unslotted(cls: Any) -> Any:
+    fields = [(f.name, f.type, f) for f in dataclasses.fields(cls)]
+    namespace = {k: v for k, v in vars(cls).items() if isinstance(v, (classmethod, property))}
+    return dataclasses.make_dataclass(
+        cls.__name__, fields, bases=cls.__bases__, frozen=True, namespace=namespace
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""Compare the ``all_*`` and ``any_*`` helpers with and without the columnar status table.
+
+Run from the repository root with ``uv run python benchmarks/status_predicates.py``.
+
+The "loops" numbers wrap the status so the helpers can't see its table and fall back to
+walking the apps and units (as they did before the table was added, and still do for Juju 3
+statuses). Each round parses a fresh status, so the table's per-app masks are built once per
+round.
+"""
+
+from __future__ import annotations
+
+import functools
+import timeit
+from typing import Any, Callable
+
+import _synthetic
+
+import jubilant_backports as jubilant
+
+ROUNDS = 20
+
+
+class _Unindexed:
+    """Status stand-in with only what the helpers' loops use."""
+
+    def __init__(self, status: jubilant.Status):
+        self.apps = status.apps
+        self.get_units = status.get_units
+
+
+def main():
+    """Print the time to evaluate typical wait predicates on a 10,000 unit status."""
+    d = _synthetic.status_dict(apps=100, units_per_app=100, machines=100)
+    print('100 apps x 100 units:')
+    for label, check in [
+        ('ready and error', _ready_and_error),
+        ('six predicates', _six_predicates),
+    ]:
+        loops = _time(d, lambda status, check=check: check(_Unindexed(status)))
+        table = _time(d, check)
+        print(f'  {label + ":":17} loops {loops * 1000:6.2f} ms, table {table * 1000:6.2f} ms')
+
+
+def _ready_and_error(status: Any) -> bool:
+    return jubilant.all_active(status) and not jubilant.any_error(status)
+
+
+def _six_predicates(status: Any) -> bool:
+    return (
+        jubilant.all_active(status, 'app1', 'app2')
+        and jubilant.all_agents_idle(status)
+        and not jubilant.any_error(status)
+        and not jubilant.any_blocked(status)
+        and not jubilant.any_maintenance(status, 'app3')
+        and jubilant.all_active(status)
+    )
+
+
+def _time(d: dict[str, Any], check: Callable[[Any], bool]) -> float:
+    """Return the time to run *check* on a fresh status, excluding parsing."""
+    times: list[float] = []
+    for _ in range(ROUNDS):
+        status = jubilant.Status._from_dict(d)
+        # Build the apps and units up front; the table is built inside the timed call.
+        status.get_units('app0')
+        times.append(timeit.timeit(functools.partial(check, status), number=1))
+    return min(times)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Compare the ways ``wait`` can wait between status calls, against a fake Juju CLI.
+
+Run from the repository root with ``uv run python benchmarks/wait_for.py``.
+
+The fake ``juju`` reports a model whose units are in "maintenance" until a fixed time after
+the wait starts, and "active" after that. Its ``wait-for`` sleeps until then, and its
+``debug-log`` logs a hook running then. Latency is the time from the model becoming active to
+``wait`` returning.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+import sys
+import tempfile
+import time
+from typing import Any
+
+import _synthetic
+
+import jubilant_backports as jubilant
+
+ACTIVE_AFTER = 3.5
+
+FAKE_JUJU = """\
+#!{python}
+import json, os, pathlib, sys, time
+
+state = pathlib.Path(os.environ['FAKE_JUJU_STATE'])
+with open(state / 'calls', 'a') as f:
+    f.write(sys.argv[1] + '\\n')
+ready_at = float((state / 'ready_at').read_text())
+if sys.argv[1] == 'status':
+    name = 'active' if time.time() >= ready_at else 'maintenance'
+    print((state / (name + '.json')).read_text())
+elif sys.argv[1] == 'wait-for':
+    time.sleep(max(0, ready_at - time.time()))
+elif sys.argv[1] == 'debug-log':
+    time.sleep(max(0, ready_at - time.time()))
+    print('unit-app0-0: INFO juju.worker.uniter.operation ran "config-changed" hook', flush=True)
+    time.sleep(60)
+"""
+
+
+def main():
+    """Print the latency and number of CLI calls for each way of waiting."""
+    with tempfile.TemporaryDirectory() as tmp:
+        state = pathlib.Path(tmp)
+        active = _synthetic.status_dict(apps=5, units_per_app=3)
+        maintenance = json.loads(json.dumps(active).replace('"active"', '"maintenance"'))
+        (state / 'active.json').write_text(json.dumps(active))
+        (state / 'maintenance.json').write_text(json.dumps(maintenance))
+        juju_path = state / 'juju'
+        juju_path.write_text(FAKE_JUJU.format(python=sys.executable))
+        juju_path.chmod(0o755)
+        os.environ['FAKE_JUJU_STATE'] = tmp
+
+        juju = jubilant.Juju(cli_binary=juju_path, cli_version='2.9.52')
+        print(f'Model becomes active {ACTIVE_AFTER}s after the wait starts:')
+        modes: list[tuple[str, dict[str, Any]]] = [
+            ('polling', {}),
+            ('server_side=True', {'server_side': True}),
+            ('activity_delay=0.1', {'activity_delay': 0.1, 'delay': 10}),
+        ]
+        for label, kwargs in modes:
+            (state / 'calls').write_text('')
+            ready_at = time.time() + ACTIVE_AFTER
+            (state / 'ready_at').write_text(str(ready_at))
+            juju.wait(jubilant.all_active, successes=1, **kwargs)
+            latency = time.time() - ready_at
+            calls = (state / 'calls').read_text().split()
+            print(
+                f'  {label + ":":20} {latency:5.2f}s latency, '
+                f'{calls.count("status")} status calls, {len(calls)} CLI calls in all'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""Compare the poll period of ``wait`` with and without ``pipeline=True``, on a slow fake CLI.
+
+Run from the repository root with ``uv run python benchmarks/wait_pipeline.py``.
+
+The fake ``juju status`` takes CLI_TIME seconds and returns a large status whose unit messages
+change on every call, so each poll is parsed, diffed, and checked in full. ``wait`` runs until
+*ready* has been called POLLS times; the mean poll period it logs is compared with *delay*.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import pathlib
+import sys
+import tempfile
+import time
+
+import _synthetic
+
+import jubilant_backports as jubilant
+
+CLI_TIME = 0.5
+POLLS = 8
+
+FAKE_JUJU = """\
+#!{python}
+import os, pathlib, sys, time
+
+state = pathlib.Path(os.environ['FAKE_JUJU_STATE'])
+time.sleep({cli_time})
+counter = state / 'counter'
+n = int(counter.read_text()) + 1
+counter.write_text(str(n))
+print((state / 'status.json').read_text().replace('MESSAGE', 'step ' + str(n)))
+"""
+
+
+class _Stats(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.message = ''
+
+    def emit(self, record: logging.LogRecord) -> None:
+        message = record.getMessage()
+        if 'status calls' in message:
+            self.message = message
+
+
+def main():
+    """Print the poll period for each delay, serial and pipelined."""
+    with tempfile.TemporaryDirectory() as tmp:
+        state = pathlib.Path(tmp)
+        status = _synthetic.status_dict(apps=20, units_per_app=40)
+        for app in status['applications'].values():
+            for unit in app['units'].values():
+                unit['workload-status']['message'] = 'MESSAGE'
+        (state / 'status.json').write_text(json.dumps(status))
+        juju_path = state / 'juju'
+        juju_path.write_text(FAKE_JUJU.format(python=sys.executable, cli_time=CLI_TIME))
+        juju_path.chmod(0o755)
+        os.environ['FAKE_JUJU_STATE'] = tmp
+
+        logger = logging.getLogger('jubilant.wait')
+        logger.setLevel(logging.DEBUG)
+        logger.propagate = False
+        handler = _Stats()
+        logger.addHandler(handler)
+
+        juju = jubilant.Juju(cli_binary=juju_path, cli_version='2.9.52')
+        print(f'{POLLS} polls of an 800-unit status; each status call takes {CLI_TIME}s:')
+        for delay in (0.0, 0.5, 1.0):
+            for pipeline in (False, True):
+                (state / 'counter').write_text('0')
+                calls = 0
+
+                def ready(status: object) -> bool:
+                    nonlocal calls
+                    calls += 1
+                    return calls >= POLLS
+
+                t0 = time.perf_counter()
+                juju.wait(ready, delay=delay, successes=1, pipeline=pipeline)
+                elapsed = time.perf_counter() - t0
+                label = f'delay={delay}, pipeline={pipeline}:'
+                print(f'  {label:30} {elapsed:5.2f}s total; {handler.message[6:]}')
+
+
+if __name__ == '__main__':
+    main()
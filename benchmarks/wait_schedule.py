@@ -0,0 +1,102 @@
+"""Compare the poll schedules for ``wait`` on a simulated deployment, with a virtual clock.
+
+Run from the repository root with ``uv run python benchmarks/wait_schedule.py``.
+
+The simulated model churns (a unit's workload message changes every few seconds) while it
+deploys, then sits unchanged in "waiting" until a relation settles, then becomes "active".
+Each ``juju status`` call costs a fixed amount of (virtual) time. For each schedule, this
+reports how many status calls ``wait`` made and how long after the model became active it
+returned.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from typing import Any
+
+import _synthetic
+
+import jubilant_backports as jubilant
+
+CHURN_UNTIL = 30.0  # the message changes every CHURN_EVERY seconds until then
+CHURN_EVERY = 2.0
+ACTIVE_AT = 87.0  # unchanged in "waiting" from CHURN_UNTIL until then
+CLI_TIME = 0.3
+
+
+class _Clock:
+    """Virtual replacement for time.monotonic and time.sleep."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class _SimulatedJuju(jubilant.Juju):
+    """Juju whose ``status`` reports the simulated model at the clock's current time."""
+
+    def __init__(self, clock: _Clock):
+        super().__init__(cli_version='2.9.52')
+        self.clock = clock
+        self.status_calls = 0
+        self._status = _synthetic.status_dict(apps=3, units_per_app=3)
+
+    def _cli(
+        self,
+        *args: str,
+        include_model: bool = True,
+        stdin: str | None = None,
+        log: bool = True,
+    ) -> tuple[str, str]:
+        assert args[0] == 'status'
+        self.status_calls += 1
+        self.clock.sleep(CLI_TIME)
+        t = self.clock.now
+        if t >= ACTIVE_AT:
+            current, message = 'active', ''
+        elif t >= CHURN_UNTIL:
+            current, message = 'waiting', 'waiting for relation'
+        else:
+            current, message = 'maintenance', f'step {int(t // CHURN_EVERY)}'
+        status: dict[str, Any] = json.loads(json.dumps(self._status))
+        for app in status['applications'].values():
+            app['application-status'] = {'current': current, 'message': message}
+            for unit in app['units'].values():
+                unit['workload-status'] = {'current': current, 'message': message}
+        return json.dumps(status), ''
+
+
+def main():
+    """Print the status calls and latency for each schedule."""
+    schedules: list[jubilant.Schedule] = [
+        jubilant.FixedSchedule(1.0),
+        jubilant.FixedSchedule(5.0),
+        jubilant.BackoffSchedule(0.5, 10.0),
+        jubilant.AdaptiveSchedule(0.5, 5.0),
+    ]
+    print(
+        f'Model churns for {CHURN_UNTIL:.0f}s, is unchanged until {ACTIVE_AT:.0f}s, '
+        f'then active; each status call takes {CLI_TIME}s:'
+    )
+    real_monotonic, real_sleep = time.monotonic, time.sleep
+    clock = _Clock()
+    time.monotonic, time.sleep = clock.monotonic, clock.sleep
+    try:
+        for schedule in schedules:
+            clock.now = 0.0
+            juju = _SimulatedJuju(clock)
+            juju.wait(jubilant.all_active, successes=1, timeout=600, schedule=schedule)
+            latency = clock.now - ACTIVE_AT
+            print(f'  {schedule!r:58} {juju.status_calls:3} status calls, {latency:5.2f}s latency')
+    finally:
+        time.monotonic, time.sleep = real_monotonic, real_sleep
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""Measure the CPU time ``wait`` spends per poll on a large model that isn't changing.
+
+Run from the repository root with ``uv run python benchmarks/wait_steady.py``.
+
+``wait`` is run against a fake ``juju status`` (no subprocess) that returns the same large
+status on each call, apart from the controller timestamp and "since" times, which tick. For
+comparison, a second run changes one unit's message on every call, so each poll is decoded,
+diffed, and checked in full.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import time
+
+import _synthetic
+
+import jubilant_backports as jubilant
+
+POLLS = 30
+
+
+class _EnoughPollsError(Exception):
+    pass
+
+
+class _FakeJuju(jubilant.Juju):
+    def __init__(self, text: str, *, churn: bool):
+        super().__init__(cli_version='2.9.52')
+        self.text = text
+        self.churn = churn
+        self.calls = 0
+
+    def _cli(
+        self,
+        *args: str,
+        include_model: bool = True,
+        stdin: str | None = None,
+        log: bool = True,
+    ) -> tuple[str, str]:
+        if self.calls == POLLS:
+            raise _EnoughPollsError
+        self.calls += 1
+        tick = f'{self.calls % 60:02d}'
+        text = self.text.replace('22:21:35', f'22:21:{tick}').replace('22:25:16', f'22:25:{tick}')
+        if self.churn:
+            text = text.replace('"message":"STEP"', f'"message":"step {self.calls}"', 1)
+        return text, ''
+
+
+def main():
+    """Print the CPU time per poll for a steady and a churning model of each size."""
+    print(f'CPU time per poll over {POLLS} polls of wait(all_active):')
+    for apps, units_per_app in [(10, 40), (20, 100)]:
+        status = _synthetic.status_dict(apps=apps, units_per_app=units_per_app)
+        for app in status['applications'].values():
+            for unit in app['units'].values():
+                unit['workload-status']['current'] = 'maintenance'
+                unit['workload-status']['message'] = 'STEP'
+        text = json.dumps(status, separators=(',', ':'))
+        for churn in (False, True):
+            juju = _FakeJuju(text, churn=churn)
+            t0 = time.process_time()
+            with contextlib.suppress(_EnoughPollsError):
+                juju.wait(jubilant.all_active, delay=0)
+            elapsed = time.process_time() - t0
+            label = f'{apps * units_per_app} units, {"churning" if churn else "steady"}:'
+            print(f'  {label:24} {elapsed / juju.calls * 1000:7.2f} ms ({len(text) // 1024} KiB)')
+
+
+if __name__ == '__main__':
+    main()
@@ -23,22 +23,57 @@ from ._all_any import (
     any_maintenance,
     any_waiting,
 )
+from ._async import AsyncJuju29 as AsyncJuju  # Note that this is not present in Jubilant.
+from ._batch import Batch  # Note that this is not present in Jubilant.
+from ._broker import StatusBroker  # Note that this is not present in Jubilant.
+from ._cache import CLICache  # Note that this is not present in Jubilant.
+from ._handle import TaskHandle  # Note that this is not present in Jubilant.
 from ._juju import Juju29 as Juju
+from ._predicates import Predicate  # Note that this is not present in Jubilant.
+from ._schedule import (  # Note that these are not present in Jubilant.
+    AdaptiveSchedule,
+    BackoffSchedule,
+    FixedSchedule,
+    Schedule,
+)
 from ._task import ExecTask29 as ExecTask  # Note that this is not present in Jubilant.
+from ._task import MultiTaskError  # Note that this is not present in Jubilant.
 from ._task import Task29 as Task
 from ._task import TaskError29 as TaskError
-from ._test_helpers import temp_model
+from ._test_helpers import (
+    async_temp_model,  # Note that this is not present in Jubilant.
+    temp_model,
+)
+from ._transport import (  # Note that these are not present in Jubilant.
+    APITransport,
+    CLITransport,
+    Transport,
+)
 from .statustypes import Status
 
 __all__ = [
+    'APITransport',
+    'AdaptiveSchedule',
+    'AsyncJuju',
+    'BackoffSchedule',
+    'Batch',
+    'CLICache',
     'CLIError',
+    'CLITransport',
     'ConfigValue',
     'ExecTask',
+    'FixedSchedule',
     'Juju',
+    'MultiTaskError',
+    'Predicate',
+    'Schedule',
     'SecretURI',
     'Status',
+    'StatusBroker',
     'Task',
     'TaskError',
+    'TaskHandle',
+    'Transport',
     'WaitError',
     'all_active',
     'all_agents_idle',
@@ -51,6 +86,7 @@ __all__ = [
     'any_error',
     'any_maintenance',
     'any_waiting',
+    'async_temp_model',
     'statustypes',
     'temp_model',
 ]
@@ -172,6 +172,8 @@ def all_agents_idle(status: Status | jubilant.Status, *apps: str) -> bool:
 def _all_statuses_are(
     expected: str, status: Status | jubilant.Status, apps: Iterable[str]
 ) -> bool:
+    if isinstance(status, Status):
+        return status._table.all_statuses_are(expected, apps)
     if not apps:
         apps = status.apps
 
@@ -188,6 +190,8 @@ def _all_statuses_are(
 
 
 def _any_status_is(expected: str, status: Status | jubilant.Status, apps: Iterable[str]) -> bool:
+    if isinstance(status, Status):
+        return status._table.any_status_is(expected, apps)
     if not apps:
         apps = status.apps
 
@@ -206,6 +210,8 @@ def _any_status_is(expected: str, status: Status | jubilant.Status, apps: Iterab
 def _all_agent_statuses_are(
     expected: str, status: Status | jubilant.Status, apps: Iterable[str]
 ) -> bool:
+    if isinstance(status, Status):
+        return status._table.all_agent_statuses_are(expected, apps)
     if not apps:
         apps = status.apps
 
@@ -0,0 +1,532 @@
+"""Talk to the Juju controller's websocket API, and present the results like the Juju CLI does.
+
+The conversion functions here turn API results into the ``--format json`` output of the
+equivalent CLI commands, so that the rest of the package parses them the same way whether
+they came from the CLI or the API.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+import re
+import ssl
+import threading
+import time
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from jubilant import _yaml
+
+from ._commands import host_name
+from ._websocket import WebSocket
+
+# Facade versions we can speak, most preferred first.
+_FACADE_VERSIONS = {'Action': (7, 6), 'Client': (8, 7, 6), 'Pinger': (1,), 'Storage': (6,)}
+
+# Juju's controller certificates always include this name.
+_CERT_HOSTNAME = 'juju-apiserver'
+
+_CHARM_ORIGINS = {'ch': 'charmhub', 'cs': 'charmstore', 'local': 'local'}
+
+
+class APIError(Exception):
+    """Raised when a Juju API call returns an error."""
+
+    def __init__(self, message: str, code: str = ''):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+
+
+class Connection:
+    """A logged-in connection to the Juju API for one model.
+
+    Calls may be made from several threads; they take turns on the connection.
+
+    Args:
+        addresses: Controller API addresses, as ``host:port``; the first that accepts a
+            connection is used.
+        model_uuid: UUID of the model.
+        username: User to log in as.
+        password: The user's password.
+        ca_cert: PEM-encoded CA certificate of the controller, if it isn't publicly trusted.
+        tls: Whether to use TLS; only disable this to talk to a local fake API server.
+        client_version: Juju version to report to the controller.
+        timeout: Timeout in seconds for connecting and for each API call.
+    """
+
+    def __init__(
+        self,
+        addresses: Iterable[str],
+        model_uuid: str,
+        username: str,
+        password: str,
+        *,
+        ca_cert: str | None = None,
+        tls: bool = True,
+        client_version: str = '',
+        timeout: float | None = None,
+    ):
+        ssl_context = None
+        server_hostname = None
+        if tls:
+            ssl_context = ssl.create_default_context(cadata=ca_cert)
+            if ca_cert is not None:
+                server_hostname = _CERT_HOSTNAME
+
+        errors: list[str] = []
+        for address in addresses:
+            host, _, port = address.rpartition(':')
+            try:
+                self._ws = WebSocket(
+                    host.strip('[]'),
+                    int(port),
+                    f'/model/{model_uuid}/api',
+                    ssl_context=ssl_context,
+                    server_hostname=server_hostname,
+                    timeout=timeout,
+                )
+                break
+            except (OSError, ValueError) as exc:
+                errors.append(f'{address}: {exc}')
+        else:
+            raise ConnectionError(f'cannot connect to controller: {"; ".join(errors)}')
+
+        self._lock = threading.Lock()
+        self._request_id = 0
+        self.last_used = time.monotonic()
+        self._versions = {'Admin': 3}
+        try:
+            result = self.call(
+                'Admin',
+                'Login',
+                {
+                    'auth-tag': f'user-{username}',
+                    'credentials': password,
+                    'nonce': '',
+                    'macaroons': [],
+                    'client-version': client_version,
+                },
+            )
+        except BaseException:
+            self._ws.close()
+            raise
+        if 'discharge-required' in result or 'redirect-info' in result:
+            self._ws.close()
+            raise APIError(
+                'login needs macaroons or a redirect, which are not supported', 'not supported'
+            )
+        facades: list[dict[str, Any]] = result.get('facades') or []
+        available = {f['name']: f['versions'] for f in facades}
+        for facade, versions in _FACADE_VERSIONS.items():
+            version = next((v for v in versions if v in available.get(facade, ())), None)
+            if version is not None:
+                self._versions[facade] = version
+
+    def call(self, facade: str, method: str, params: Mapping[str, Any] | None = None) -> Any:
+        """Call *method* on *facade*, and return its response.
+
+        Raises:
+            APIError: if the facade isn't available or the call returned an error.
+            ConnectionError: if the connection failed.
+        """
+        if facade not in self._versions:
+            raise APIError(f'facade {facade} not available')
+        with self._lock:
+            self._request_id += 1
+            request_id = self._request_id
+            request = {
+                'request-id': request_id,
+                'type': facade,
+                'version': self._versions[facade],
+                'request': method,
+                'params': dict(params or {}),
+            }
+            self._ws.send(json.dumps(request))
+            while True:
+                message = json.loads(self._ws.recv())
+                if message.get('request-id') == request_id:
+                    break
+            self.last_used = time.monotonic()
+        if message.get('error'):
+            raise APIError(message['error'], message.get('error-code') or '')
+        return message.get('response') or {}
+
+    def close(self) -> None:
+        """Close the connection."""
+        self._ws.close()
+
+
+def juju_data_dir() -> pathlib.Path:
+    """Return the Juju client's data directory, ``$JUJU_DATA`` or ``~/.local/share/juju``."""
+    juju_data = os.environ.get('JUJU_DATA')
+    if not juju_data:
+        xdg_data = os.environ.get('XDG_DATA_HOME') or os.path.expanduser('~/.local/share')
+        juju_data = os.path.join(xdg_data, 'juju')
+    return pathlib.Path(juju_data)
+
+
+def client_details(juju_data: pathlib.Path, model: str | None) -> dict[str, Any]:
+    """Look up how to connect to *model* (or the current model) in the Juju client's files.
+
+    Returns:
+        A dict with the controller's name, API addresses, and CA certificate, the model's UUID,
+        and the user's name and password.
+
+    Raises:
+        LookupError: if the model, or the credentials to connect to it, can't be found.
+    """
+    controller_name, controller, account, details = _find_model(juju_data, model)
+    if not account.get('password'):
+        raise LookupError(f'no password for controller {controller_name!r}')
+    return {
+        'controller': controller_name,
+        'addresses': controller['api-endpoints'],
+        'ca_cert': controller.get('ca-cert'),
+        'model_uuid': details['uuid'],
+        'username': account['user'],
+        'password': account['password'],
+    }
+
+
+def model_uuids(juju_data: pathlib.Path, model: str | None) -> tuple[str, str]:
+    """Return the controller's UUID and the model's UUID for *model* (or the current model).
+
+    Raises:
+        LookupError: if the model can't be found.
+    """
+    controller_name, controller, _, details = _find_model(juju_data, model)
+    return controller.get('uuid') or controller_name, details['uuid']
+
+
+def _find_model(
+    juju_data: pathlib.Path, model: str | None
+) -> tuple[str, dict[str, Any], dict[str, Any], dict[str, Any]]:
+    """Return the controller name and the controller, account, and model details for *model*."""
+    controllers = _load_yaml(juju_data / 'controllers.yaml')
+    models = _load_yaml(juju_data / 'models.yaml')
+    accounts = _load_yaml(juju_data / 'accounts.yaml')
+
+    controller_name: str | None = None
+    model_name = model
+    if model is not None and ':' in model:
+        controller_name, model_name = model.split(':', 1)
+    if controller_name is None:
+        controller_name = controllers.get('current-controller')
+    if controller_name is None:
+        raise LookupError('no current controller')
+    all_controllers: dict[str, Any] = controllers.get('controllers') or {}
+    controller: dict[str, Any] | None = all_controllers.get(controller_name)
+    if controller is None:
+        raise LookupError(f'controller {controller_name!r} not found')
+    all_accounts: dict[str, Any] = accounts.get('controllers') or {}
+    account: dict[str, Any] = all_accounts.get(controller_name) or {}
+    if not account.get('user'):
+        raise LookupError(f'no account for controller {controller_name!r}')
+
+    all_models: dict[str, Any] = models.get('controllers') or {}
+    controller_models: dict[str, Any] = all_models.get(controller_name) or {}
+    if model_name is None:
+        model_name = controller_models.get('current-model')
+        if model_name is None:
+            raise LookupError(f'no current model on controller {controller_name!r}')
+    if '/' not in model_name:
+        model_name = f'{account["user"]}/{model_name}'
+    model_details: dict[str, Any] = controller_models.get('models') or {}
+    details: dict[str, Any] | None = model_details.get(model_name)
+    if details is None:
+        raise LookupError(f'model {model_name!r} not found on controller {controller_name!r}')
+    return controller_name, controller, account, details
+
+
+def status_json(full_status: Mapping[str, Any], controller: str) -> dict[str, Any]:
+    """Convert the result of ``Client.FullStatus`` to the output of ``juju status``.
+
+    The result has the model, machines, applications (with their units and relations),
+    remote applications, and offers, but not storage, which needs more API calls.
+    """
+    model: dict[str, Any] = full_status.get('model') or {}
+    version = model.get('version') or ''
+    legacy = version.startswith('2')
+    model_json: dict[str, Any] = {
+        'name': model.get('name') or '',
+        'type': model.get('type') or '',
+        'controller': controller,
+        'cloud': (model.get('cloud-tag') or '').replace('cloud-', '', 1),
+        'region': model.get('region') or '',
+        'version': version,
+    }
+    if model.get('available-version'):
+        model_json['upgrade-available'] = model['available-version']
+    if model.get('model-status'):
+        model_json['model-status'] = _status_info(model['model-status'])
+    model_json['sla'] = model.get('sla') or ''
+
+    machines: dict[str, Any] = full_status.get('machines') or {}
+    apps: dict[str, Any] = full_status.get('applications') or {}
+    relations = _app_relations(full_status.get('relations') or [], legacy=legacy)
+    result: dict[str, Any] = {
+        'model': model_json,
+        'machines': {k: _machine_json(v, legacy=legacy) for k, v in machines.items()},
+        'applications': {
+            k: _app_json(v, relations.get(k, {}), model_json['type'], legacy=legacy)
+            for k, v in apps.items()
+        },
+    }
+    remote_apps: dict[str, Any] = full_status.get('remote-applications') or {}
+    if remote_apps:
+        result['application-endpoints'] = {k: _remote_app_json(v) for k, v in remote_apps.items()}
+    offers: dict[str, Any] = full_status.get('offers') or {}
+    if offers:
+        result['offers'] = {k: _offer_json(v) for k, v in offers.items()}
+    timestamp = _time_parts(full_status.get('controller-timestamp'))
+    if timestamp is not None:
+        result['controller'] = {'timestamp': f'{timestamp[1]}{timestamp[2]}'}
+    return result
+
+
+def task_json(result: Mapping[str, Any]) -> dict[str, Any]:
+    """Convert an ``ActionResult`` to a task in the output of ``juju run`` or ``juju exec``."""
+    action: dict[str, Any] = result.get('action') or {}
+    output: dict[str, Any] = dict(result.get('output') or {})
+    # Controllers before Juju 3 report the exit code and output with these keys.
+    for old, new in [('Code', 'return-code'), ('Stdout', 'stdout'), ('Stderr', 'stderr')]:
+        if old in output:
+            output[new] = output.pop(old)
+    if 'return-code' in output:
+        output['return-code'] = int(output['return-code'])
+
+    task: dict[str, Any] = {
+        'id': action.get('tag', '').replace('action-', '', 1),
+        'status': result.get('status') or '',
+        'results': output,
+    }
+    if result.get('message'):
+        task['message'] = result['message']
+    entries: list[dict[str, Any]] = result.get('log') or []
+    log = [f'{entry["timestamp"]} {entry["message"]}' for entry in entries]
+    if log:
+        task['log'] = log
+    receiver = action.get('receiver') or ''
+    task['unit' if receiver.startswith('unit-') else 'machine'] = host_name(receiver)
+    return task
+
+
+def _load_yaml(path: pathlib.Path) -> dict[str, Any]:
+    try:
+        with path.open() as f:
+            data = _yaml.safe_load(f)
+    except FileNotFoundError:
+        return {}
+    return data if isinstance(data, dict) else {}  # type: ignore
+
+
+def _time_parts(value: str | None) -> tuple[str, str, str] | None:
+    """Split an RFC 3339 time into its date, time of day, and UTC offset ("Z" for UTC)."""
+    if not value:
+        return None
+    match = re.match(r'^(\d{4}-\d\d-\d\d)T(\d\d:\d\d:\d\d)(?:\.\d+)?(Z|[+-]\d\d:\d\d)$', value)
+    # The zero time means "not set".
+    if match is None or match.group(1) == '0001-01-01':
+        return None
+    date, time_of_day, offset = match.groups()
+    return date, time_of_day, 'Z' if offset in ('+00:00', '-00:00') else offset
+
+
+def _since(value: str | None) -> str | None:
+    """Format an RFC 3339 time like the CLI does, for example '24 Feb 2025 12:03:17+13:00'."""
+    parts = _time_parts(value)
+    if parts is None:
+        return None
+    year, month, day = parts[0].split('-')
+    months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+    return f'{day} {months[int(month) - 1]} {year} {parts[1]}{parts[2]}'
+
+
+def _status_info(detailed: Mapping[str, Any]) -> dict[str, Any]:
+    info: dict[str, Any] = {'current': detailed.get('status') or ''}
+    if detailed.get('info'):
+        info['message'] = detailed['info']
+    since = _since(detailed.get('since'))
+    if since is not None:
+        info['since'] = since
+    if detailed.get('version'):
+        info['version'] = detailed['version']
+    return info
+
+
+def _set_base(result: dict[str, Any], d: Mapping[str, Any], *, legacy: bool) -> None:
+    """Set the "base" (or, before Juju 3, "series" and "os") of an app or machine."""
+    if legacy:
+        series = d.get('series') or ''
+        result['series'] = series
+        result['os'] = 'kubernetes' if series == 'kubernetes' else 'ubuntu'
+    elif d.get('base'):
+        channel: str = d['base'].get('channel') or ''
+        result['base'] = {'name': d['base'].get('name') or '', 'channel': channel}
+        if channel.endswith('/stable'):
+            result['base']['channel'] = channel[: -len('/stable')]
+
+
+def _machine_json(machine: Mapping[str, Any], *, legacy: bool) -> dict[str, Any]:
+    result: dict[str, Any] = {}
+    if machine.get('agent-status'):
+        result['juju-status'] = _status_info(machine['agent-status'])
+    for key in ['hostname', 'dns-name', 'ip-addresses', 'instance-id', 'display-name']:
+        if machine.get(key):
+            result[key] = machine[key]
+    if machine.get('instance-status'):
+        result['machine-status'] = _status_info(machine['instance-status'])
+    if machine.get('modification-status'):
+        result['modification-status'] = _status_info(machine['modification-status'])
+    _set_base(result, machine, legacy=legacy)
+    if machine.get('network-interfaces'):
+        result['network-interfaces'] = machine['network-interfaces']
+    if machine.get('containers'):
+        result['containers'] = {
+            k: _machine_json(v, legacy=legacy) for k, v in machine['containers'].items()
+        }
+    for key in ['constraints', 'hardware']:
+        if machine.get(key):
+            result[key] = machine[key]
+    if 'JobManageModel' in (machine.get('jobs') or []):
+        has_vote, wants_vote = machine.get('has-vote'), machine.get('wants-vote')
+        if has_vote:
+            result['controller-member-status'] = 'has-vote' if wants_vote else 'removing-vote'
+        else:
+            result['controller-member-status'] = 'adding-vote' if wants_vote else 'no-vote'
+    if machine.get('primary-controller-machine'):
+        result['ha-primary'] = True
+    if machine.get('lxd-profiles'):
+        result['lxd-profiles'] = machine['lxd-profiles']
+    return result
+
+
+def _charm_fields(url: str) -> dict[str, Any]:
+    """Return the charm fields for a charm URL, like ``ch:amd64/jammy/mysql-k8s-99``."""
+    schema, _, path = url.partition(':')
+    name, _, revision = path.rsplit('/', 1)[-1].rpartition('-')
+    if not revision.isdigit():
+        name, revision = path.rsplit('/', 1)[-1], '-1'
+    origin = _CHARM_ORIGINS.get(schema, schema)
+    return {
+        'charm': name if origin == 'charmhub' else url,
+        'charm-origin': origin,
+        'charm-name': name,
+        'charm-rev': int(revision),
+    }
+
+
+def _app_relations(
+    relations: Iterable[Mapping[str, Any]], *, legacy: bool
+) -> dict[str, dict[str, list[Any]]]:
+    """Return each app's relations, by endpoint, as ``juju status`` shows them."""
+    by_app: dict[str, dict[str, list[Any]]] = {}
+    for relation in relations:
+        endpoints: list[dict[str, Any]] = relation.get('endpoints') or []
+        for endpoint in endpoints:
+            # A peer relation's only endpoint is related to its own application.
+            others = [e for e in endpoints if e is not endpoint] or [endpoint]
+            related = by_app.setdefault(endpoint['application'], {}).setdefault(
+                endpoint['name'], []
+            )
+            for other in others:
+                if legacy:
+                    item: Any = other['application']
+                else:
+                    item = {
+                        'related-application': other['application'],
+                        'interface': relation.get('interface') or '',
+                        'scope': relation.get('scope') or '',
+                    }
+                if item not in related:
+                    related.append(item)
+    return by_app
+
+
+def _unit_json(unit: Mapping[str, Any]) -> dict[str, Any]:
+    result: dict[str, Any] = {}
+    if unit.get('workload-status'):
+        result['workload-status'] = _status_info(unit['workload-status'])
+    if unit.get('agent-status'):
+        result['juju-status'] = _status_info(unit['agent-status'])
+    if unit.get('leader'):
+        result['leader'] = True
+    if unit.get('machine'):
+        result['machine'] = unit['machine']
+    if unit.get('opened-ports'):
+        result['open-ports'] = unit['opened-ports']
+    for key in ['public-address', 'address', 'provider-id']:
+        if unit.get(key):
+            result[key] = unit[key]
+    if unit.get('subordinates'):
+        result['subordinates'] = {k: _unit_json(v) for k, v in unit['subordinates'].items()}
+    return result
+
+
+def _app_json(
+    app: Mapping[str, Any],
+    relations: dict[str, list[Any]],
+    model_type: str,
+    *,
+    legacy: bool,
+) -> dict[str, Any]:
+    result = _charm_fields(app.get('charm') or '')
+    _set_base(result, app, legacy=legacy)
+    for key in ['charm-channel', 'charm-version', 'charm-profile', 'can-upgrade-to']:
+        if app.get(key):
+            result[key] = app[key]
+    if model_type == 'caas':
+        result['scale'] = app.get('int') or 0
+    if app.get('provider-id'):
+        result['provider-id'] = app['provider-id']
+    if app.get('public-address'):
+        result['address'] = app['public-address']
+    result['exposed'] = bool(app.get('exposed'))
+    if app.get('life') and app['life'] != 'alive':
+        result['life'] = app['life']
+    if app.get('status'):
+        result['application-status'] = _status_info(app['status'])
+    if relations:
+        result['relations'] = relations
+    if app.get('subordinate-to'):
+        result['subordinate-to'] = app['subordinate-to']
+    if app.get('units'):
+        result['units'] = {k: _unit_json(v) for k, v in app['units'].items()}
+    if app.get('workload-version'):
+        result['version'] = app['workload-version']
+    if app.get('endpoint-bindings'):
+        result['endpoint-bindings'] = app['endpoint-bindings']
+    return result
+
+
+def _remote_app_json(app: Mapping[str, Any]) -> dict[str, Any]:
+    endpoints: list[dict[str, Any]] = app.get('endpoints') or []
+    result: dict[str, Any] = {
+        'url': app.get('offer-url') or '',
+        'endpoints': {
+            e['name']: {'interface': e['interface'], 'role': e['role']} for e in endpoints
+        },
+    }
+    if app.get('life') and app['life'] != 'alive':
+        result['life'] = app['life']
+    if app.get('status'):
+        result['application-status'] = _status_info(app['status'])
+    if app.get('relations'):
+        result['relations'] = app['relations']
+    return result
+
+
+def _offer_json(offer: Mapping[str, Any]) -> dict[str, Any]:
+    endpoints: dict[str, Any] = offer.get('endpoints') or {}
+    return {
+        'application': offer.get('application-name') or '',
+        'charm': _charm_fields(offer.get('charm') or '')['charm-name'],
+        'endpoints': {
+            k: {'interface': v['interface'], 'role': v['role']} for k, v in endpoints.items()
+        },
+        'total-connected-count': offer.get('total-connected-count') or 0,
+        'active-connected-count': offer.get('active-connected-count') or 0,
+    }
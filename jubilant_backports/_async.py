@@ -0,0 +1,456 @@
+"""Run Juju commands from asyncio code, without blocking the event loop."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import json
+import logging
+import os
+import pathlib
+import shlex
+import shutil
+import tempfile
+import time
+from collections.abc import Iterable, Mapping
+from typing import Any, Callable, Literal
+
+import jubilant
+from jubilant import _yaml
+from jubilant._juju import _format_config
+
+from . import _cli_info, _commands
+from ._juju import _parse_status, _WaitPolls
+from ._schedule import FixedSchedule, Schedule
+from ._status_json import loads_sections
+from ._task import ExecTask29, Task29
+from .statustypes import Status
+
+logger = logging.getLogger('jubilant')
+
+
+class AsyncJuju29:
+    """Instantiate this class to run Juju commands from asyncio code.
+
+    This is the asyncio counterpart of :class:`Juju`: each method is a coroutine that runs the
+    Juju CLI with :func:`asyncio.create_subprocess_exec`, and :meth:`wait` sleeps with
+    :func:`asyncio.sleep`, so many models can be deployed to and waited on concurrently from
+    a single thread. As with :class:`Juju`, the commands and options used are adjusted for the
+    version of the Juju CLI (2.9 or 3.x).
+
+    Example::
+
+        async def deploy_all(models):
+            jujus = [jubilant.AsyncJuju(model=model) for model in models]
+            await asyncio.gather(*(juju.deploy('snappass-test') for juju in jujus))
+            await asyncio.gather(*(juju.wait(jubilant.all_active) for juju in jujus))
+
+    Args:
+        model: If specified, operate on this Juju model, otherwise use the current Juju model.
+        wait_timeout: The default timeout for :meth:`wait` (in seconds) if that method's *timeout*
+            parameter is not specified.
+        cli_binary: Path to the Juju CLI binary. If not specified, uses ``juju`` and assumes it is
+            in the PATH.
+        cli_version: The version of the Juju CLI binary, for example ``2.9.52``. If not
+            specified, it's fetched with ``juju version`` before the first command that needs
+            it.
+    """
+
+    model: str | None
+    """If not None, operate on this Juju model, otherwise use the current Juju model."""
+
+    wait_timeout: float
+    """The default timeout for :meth:`wait` (in seconds) if that method's *timeout* parameter is
+    not specified.
+    """
+
+    cli_binary: str
+    """Path to the Juju CLI binary. If None, uses ``juju`` and assumes it is in the PATH."""
+
+    cli_version: str | None
+    """The version of the Juju CLI binary, or None if it hasn't been fetched yet."""
+
+    def __init__(
+        self,
+        *,
+        model: str | None = None,
+        wait_timeout: float = 3 * 60.0,
+        cli_binary: str | pathlib.Path | None = None,
+        cli_version: str | None = None,
+    ):
+        self.model = model
+        self.wait_timeout = wait_timeout
+        self.cli_binary = str(cli_binary or 'juju')
+        self.cli_version = cli_version
+
+    def __repr__(self) -> str:
+        args = [
+            f'model={self.model!r}',
+            f'wait_timeout={self.wait_timeout}',
+            f'cli_binary={self.cli_binary!r}',
+            f'cli_version={self.cli_version!r}',
+        ]
+        return f'AsyncJuju({", ".join(args)})'
+
+    async def _cli_major_version(self) -> int:
+        if self.cli_version is None:
+            # Look up (and save) the remembered version in a thread, as it reads (and writes)
+            # files, which would block the event loop.
+            loop = asyncio.get_running_loop()
+            key = await loop.run_in_executor(None, _cli_info.binary_key, self.cli_binary)
+            info = await loop.run_in_executor(None, _cli_info.load, key)
+            self.cli_version = info.get('version')
+            if self.cli_version is None:
+                stdout = await self.cli('version', '--format', 'json', include_model=False)
+                self.cli_version = json.loads(stdout)
+                update = functools.partial(_cli_info.update, key, version=self.cli_version)
+                await loop.run_in_executor(None, update)
+        assert self.cli_version is not None
+        return int(self.cli_version.split('.', 1)[0])
+
+    # Keep the public methods in alphabetical order, so we don't have to think
+    # about where to put each new method.
+
+    async def add_model(
+        self,
+        model: str,
+        cloud: str | None = None,
+        *,
+        controller: str | None = None,
+        config: Mapping[str, jubilant.ConfigValue] | None = None,
+        credential: str | None = None,
+    ) -> None:
+        """Add a named model and set this instance's model to it.
+
+        See :meth:`Juju.add_model` for details.
+        """
+        args = ['add-model', '--no-switch', model]
+        if cloud is not None:
+            args.append(cloud)
+        if controller is not None:
+            args.extend(['--controller', controller])
+        if config is not None:
+            for k, v in config.items():
+                args.extend(['--config', _format_config(k, v)])
+        if credential is not None:
+            args.extend(['--credential', credential])
+
+        await self.cli(*args, include_model=False)
+        self.model = model
+
+    async def cli(self, *args: str, include_model: bool = True, stdin: str | None = None) -> str:
+        """Run a Juju CLI command and return its standard output.
+
+        See :meth:`Juju.cli` for details.
+        """
+        stdout, _ = await self._cli(*args, include_model=include_model, stdin=stdin)
+        return stdout
+
+    async def _cli(
+        self, *args: str, include_model: bool = True, stdin: str | None = None, log: bool = True
+    ) -> tuple[str, str]:
+        """Run a Juju CLI command and return its standard output and standard error."""
+        if include_model and self.model is not None:
+            args = (args[0], '--model', self.model) + args[1:]
+        if log:
+            logger.info('cli: juju %s', shlex.join(args))
+        process = await asyncio.create_subprocess_exec(
+            self.cli_binary,
+            *args,
+            stdin=None if stdin is None else asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            out, err = await process.communicate(None if stdin is None else stdin.encode())
+        except asyncio.CancelledError:
+            # Don't leave the command running if the caller has given up on it.
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            raise
+        stdout = out.decode('utf-8')
+        stderr = err.decode('utf-8')
+        if process.returncode:
+            cmd = [self.cli_binary, *args]
+            raise jubilant.CLIError(process.returncode, cmd, stdout, stderr)
+        return stdout, stderr
+
+    async def deploy(
+        self,
+        charm: str | pathlib.Path,
+        app: str | None = None,
+        *,
+        attach_storage: str | Iterable[str] | None = None,
+        base: str | None = None,
+        bind: Mapping[str, str] | str | None = None,
+        channel: str | None = None,
+        config: Mapping[str, jubilant.ConfigValue] | None = None,
+        constraints: Mapping[str, str] | None = None,
+        force: bool = False,
+        num_units: int = 1,
+        resources: Mapping[str, str] | None = None,
+        revision: int | None = None,
+        storage: Mapping[str, str] | None = None,
+        to: str | Iterable[str] | None = None,
+        trust: bool = False,
+    ) -> None:
+        """Deploy an application or bundle.
+
+        See :meth:`Juju.deploy` for details.
+        """
+        args = _commands.deploy_args(
+            await self._cli_major_version(),
+            charm,
+            app,
+            attach_storage=attach_storage,
+            base=base,
+            bind=bind,
+            channel=channel,
+            config=config,
+            constraints=constraints,
+            force=force,
+            num_units=num_units,
+            resources=resources,
+            revision=revision,
+            storage=storage,
+            to=to,
+            trust=trust,
+        )
+        await self.cli(*args)
+
+    async def destroy_model(
+        self,
+        model: str,
+        *,
+        destroy_storage: bool = False,
+        force: bool = False,
+    ) -> None:
+        """Terminate all machines (or containers) and resources for a model.
+
+        See :meth:`Juju.destroy_model` for details.
+        """
+        args = ['destroy-model', model, '--no-prompt']
+        if destroy_storage:
+            args.append('--destroy-storage')
+        if force:
+            args.append('--force')
+        await self.cli(*args, include_model=False)
+        if model == self.model:
+            self.model = None
+
+    async def exec(
+        self,
+        command: str,
+        *args: str,
+        machine: int | None = None,
+        unit: str | None = None,
+        wait: float | None = None,
+    ) -> ExecTask29 | jubilant.Task:
+        """Run the command on the remote target specified.
+
+        See :meth:`Juju.exec` for details.
+        """
+        major = await self._cli_major_version()
+        cli_args = _commands.exec_args(
+            major, command, *args, machine=machine, unit=unit, wait=wait
+        )
+        try:
+            stdout, stderr = await self._cli(*cli_args)
+        except jubilant.CLIError as exc:
+            stdout, stderr = _commands.exec_output(major, exc, machine=machine, unit=unit)
+        return _commands.exec_task(major, stdout, stderr, machine=machine, unit=unit)
+
+    async def exec_multiple(
+        self,
+        command: str,
+        *args: str,
+        machines: int | Iterable[int] | None = None,
+        units: str | Iterable[str] | None = None,
+        apps: str | Iterable[str] | None = None,
+        wait: float | None = None,
+    ) -> dict[str, ExecTask29 | jubilant.Task]:
+        """Run the command on all the remote targets specified, with a single ``juju exec``.
+
+        See :meth:`Juju.exec_multiple` for details.
+        """
+        if machines is not None and not isinstance(machines, int):
+            machines = list(machines)
+        if units is not None and not isinstance(units, str):
+            units = list(units)
+
+        major = await self._cli_major_version()
+        cli_args = _commands.exec_multiple_args(
+            major, command, *args, machines=machines, units=units, apps=apps, wait=wait
+        )
+        try:
+            stdout, stderr = await self._cli(*cli_args)
+        except jubilant.CLIError as exc:
+            stdout, stderr = _commands.exec_multiple_output(exc)
+        return _commands.exec_tasks(major, stdout, stderr, machines=machines, units=units)
+
+    async def integrate(
+        self, app1: str, app2: str, *, via: str | Iterable[str] | None = None
+    ) -> None:
+        """Integrate two applications, creating a relation between them.
+
+        See :meth:`Juju.integrate` for details.
+        """
+        major = await self._cli_major_version()
+        await self.cli(*_commands.integrate_args(major, app1, app2, via=via))
+
+    async def refresh(
+        self,
+        app: str,
+        *,
+        base: str | None = None,
+        channel: str | None = None,
+        config: Mapping[str, jubilant.ConfigValue] | None = None,
+        force: bool = False,
+        path: str | pathlib.Path | None = None,
+        resources: Mapping[str, str] | None = None,
+        revision: int | None = None,
+        storage: Mapping[str, str] | None = None,
+        trust: bool = False,
+    ) -> None:
+        """Refresh (upgrade) an application's charm.
+
+        See :meth:`Juju.refresh` for details.
+        """
+        major = await self._cli_major_version()
+        kwargs: dict[str, Any] = dict(
+            base=base,
+            channel=channel,
+            force=force,
+            path=path,
+            resources=resources,
+            revision=revision,
+            storage=storage,
+            trust=trust,
+        )
+        if major >= 3 or config is None:
+            await self.cli(*_commands.refresh_args(major, app, config=config, **kwargs))
+        else:
+            with tempfile.NamedTemporaryFile(
+                'w+', delete=False, dir=self._temp_dir
+            ) as config_file:
+                _yaml.safe_dump(config, config_file)
+            try:
+                args = _commands.refresh_args(major, app, config_file=config_file.name, **kwargs)
+                await self.cli(*args)
+            finally:
+                os.remove(config_file.name)
+        if major < 3 and trust:
+            await self.trust(app)
+
+    async def run(
+        self,
+        unit: str,
+        action: str,
+        params: Mapping[str, Any] | None = None,
+        *,
+        wait: float | None = None,
+    ) -> Task29 | jubilant.Task:
+        """Run an action on the given unit and wait for the result.
+
+        See :meth:`Juju.run` for details.
+        """
+        major = await self._cli_major_version()
+        params_file = None
+        if params is not None:
+            with tempfile.NamedTemporaryFile(
+                'w+', delete=False, dir=self._temp_dir
+            ) as params_file:
+                _yaml.safe_dump(params, params_file)
+
+        args = _commands.run_args(
+            major,
+            unit,
+            action,
+            wait=wait,
+            params_file=None if params_file is None else params_file.name,
+        )
+        try:
+            try:
+                stdout, stderr = await self._cli(*args)
+            except jubilant.CLIError as exc:
+                stdout, stderr = _commands.run_output(exc)
+            return _commands.run_task(major, unit, action, stdout, stderr)
+        finally:
+            if params_file is not None:
+                os.remove(params_file.name)
+
+    async def status(self, *, apps: str | Iterable[str] | None = None) -> Status | jubilant.Status:
+        """Fetch the status of the current model, including its applications and units.
+
+        See :meth:`Juju.status` for details.
+        """
+        stdout = await self.cli(*_commands.status_args(apps))
+        return _parse_status(loads_sections(stdout))
+
+    async def trust(
+        self, app: str, *, remove: bool = False, scope: Literal['cluster'] | None = None
+    ) -> None:
+        """Set the trust status of a deployed application.
+
+        See :meth:`Juju.trust` for details.
+        """
+        args = ['trust', app]
+        if remove:
+            args.append('--remove')
+        if scope is not None:
+            args.extend(['--scope', scope])
+        await self.cli(*args)
+
+    async def wait(
+        self,
+        ready: Callable[[Status], bool],
+        *,
+        error: Callable[[Status], bool] | None = None,
+        delay: float = 1.0,
+        timeout: float | None = None,
+        successes: int = 3,
+        apps: str | Iterable[str] | None = None,
+        schedule: Schedule | None = None,
+        stable_for: float | None = None,
+    ) -> Status | jubilant.Status:
+        """Wait until ``ready(status)`` returns true.
+
+        This works like :meth:`Juju.wait`, but sleeps with :func:`asyncio.sleep`, so other
+        tasks run while it waits. The *apps*, *schedule*, and *stable_for* arguments are
+        supported; *server_side*, *activity_delay*, and *pipeline* aren't, as running many
+        concurrent waits is the asyncio way to make the most of the time between polls.
+        """
+        if timeout is None:
+            timeout = self.wait_timeout
+        if schedule is None:
+            schedule = FixedSchedule(delay)
+        polls = _WaitPolls(
+            ready, error, schedule=schedule, successes=successes, stable_for=stable_for
+        )
+        deadline = time.monotonic() + timeout
+
+        while time.monotonic() < deadline:
+            poll_start = time.monotonic()
+            stdout, _ = await self._cli(*_commands.status_args(apps), log=False)
+            next_poll = polls.update(stdout, poll_start)
+            status = polls.check()
+            if status is not None:
+                return status
+
+            # Count the time the status call took, and don't wait past the timeout.
+            pause = min(next_poll, deadline) - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+
+        raise polls.timeout_error(timeout)
+
+    @functools.cached_property
+    def _temp_dir(self) -> str:
+        which = shutil.which(self.cli_binary)
+        if which is not None and '/snap/' in which:
+            # If Juju is running as a snap, we can't use /tmp, so put temp files here instead.
+            temp_dir = os.path.expanduser('~/snap/juju/common')
+            os.makedirs(temp_dir, exist_ok=True)
+            return temp_dir
+        return tempfile.gettempdir()
@@ -0,0 +1,153 @@
+"""Run independent Juju commands concurrently, on a bounded pool of threads."""
+
+from __future__ import annotations
+
+import concurrent.futures
+import logging
+import threading
+from collections.abc import Iterable
+from types import TracebackType
+from typing import Any, Callable, TypeVar
+
+logger = logging.getLogger('jubilant')
+
+_T = TypeVar('_T')
+
+
+class Batch:
+    """Run commands concurrently, with optional ordering between them.
+
+    Create one with :meth:`Juju.batch <jubilant_backports.Juju.batch>`, which waits for all the
+    commands when its context exits. Each command is a separate ``juju`` process (with its own
+    controller round trip), so running independent commands at the same time saves most of
+    the wall-clock time of running them one after another.
+
+    Example::
+
+        with juju.batch() as batch:
+            db = batch.submit(juju.deploy, 'postgresql')
+            app = batch.submit(juju.deploy, 'discourse')
+            batch.submit(juju.integrate, 'postgresql', 'discourse', after=[db, app])
+
+    Each call to :meth:`submit` returns a :class:`concurrent.futures.Future` for the command's
+    result (or exception). A command that's given *after* futures only starts once they've all
+    succeeded; if any of them fails, the command isn't run, and its future is cancelled.
+
+    When the context exits, if any command failed, the exception from the first one to fail
+    (in the order they were submitted), such as a :class:`CLIError`, is raised; the others are
+    logged.
+
+    Args:
+        max_workers: Maximum number of commands to run at once.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='juju-batch'
+        )
+        self._lock = threading.Lock()
+        self._futures: list[concurrent.futures.Future[Any]] = []
+        self._submitted: set[concurrent.futures.Future[Any]] = set()
+        self._cancelled: set[concurrent.futures.Future[Any]] = set()
+
+    def submit(
+        self,
+        func: Callable[..., _T],
+        *args: Any,
+        after: Iterable[concurrent.futures.Future[Any]] = (),
+        **kwargs: Any,
+    ) -> concurrent.futures.Future[_T]:
+        """Run ``func(*args, **kwargs)`` once the *after* futures have all succeeded.
+
+        Return a future for its result.
+        """
+        future: concurrent.futures.Future[_T] = concurrent.futures.Future()
+        with self._lock:
+            self._futures.append(future)
+        deps = list(after)
+        remaining = [len(deps)]
+
+        def dep_done(dep: concurrent.futures.Future[Any]):
+            if dep.cancelled() or dep.exception() is not None:
+                self._cancel(future)
+                return
+            with self._lock:
+                remaining[0] -= 1
+                ready = remaining[0] == 0
+            if ready:
+                self._start(future, func, args, kwargs)
+
+        if not deps:
+            self._start(future, func, args, kwargs)
+        for dep in deps:
+            dep.add_done_callback(dep_done)
+        return future
+
+    def __enter__(self) -> Batch:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self._finish(cancel=exc_type is not None)
+
+    def _start(
+        self,
+        future: concurrent.futures.Future[_T],
+        func: Callable[..., _T],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+    ) -> None:
+        with self._lock:
+            if future in self._cancelled:
+                return
+            self._submitted.add(future)
+        self._executor.submit(_run, future, func, args, kwargs)
+
+    def _cancel(self, future: concurrent.futures.Future[Any]) -> None:
+        with self._lock:
+            if future in self._submitted:
+                # If it hasn't started, the worker sees it's cancelled and skips it.
+                future.cancel()
+            elif future not in self._cancelled:
+                future.cancel()
+                future.set_running_or_notify_cancel()
+                self._cancelled.add(future)
+
+    def _finish(self, cancel: bool) -> None:
+        """Wait for all the commands, and raise the first command's exception, if any."""
+        if cancel:
+            for future in self._futures:
+                self._cancel(future)
+        concurrent.futures.wait(self._futures)
+        self._executor.shutdown()
+        if cancel:
+            return
+        errors = [
+            exc
+            for future in self._futures
+            if not future.cancelled() and (exc := future.exception()) is not None
+        ]
+        for exc in errors[1:]:
+            logger.error('batch: command also failed: %s', exc)
+        if errors:
+            raise errors[0]
+
+
+def _run(
+    future: concurrent.futures.Future[_T],
+    func: Callable[..., _T],
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> None:
+    if not future.set_running_or_notify_cancel():
+        return
+    try:
+        result = func(*args, **kwargs)
+    except BaseException as exc:
+        future.set_exception(exc)
+    else:
+        future.set_result(result)
@@ -0,0 +1,217 @@
+"""Share ``juju status`` calls for a model between threads."""
+
+from __future__ import annotations
+
+import concurrent.futures
+import logging
+import threading
+from typing import Any, Callable, Hashable
+
+import jubilant
+
+from ._status_json import fingerprint
+from .statustypes import Status
+
+logger = logging.getLogger('jubilant')
+
+_brokers: dict[Hashable, StatusBroker] = {}
+_brokers_lock = threading.Lock()
+
+
+class StatusBroker:
+    """Fetch and parse the status of a model once for any number of callers and subscribers.
+
+    Get one with :meth:`Juju.status_broker <jubilant_backports.Juju.status_broker>`. While it's
+    running, a background thread fetches the status every *interval* seconds, and every
+    :meth:`Juju.status <jubilant_backports.Juju.status>` and :meth:`Juju.wait
+    <jubilant_backports.Juju.wait>` call on the model (without *apps*), from any :class:`Juju`
+    instance, goes through the broker. Concurrent calls share a single ``juju status``: a call
+    made while a fetch is in flight waits for that fetch rather than starting another. Each
+    status is parsed once, only if it has changed, and pushed to the subscribers.
+
+    Example::
+
+        with juju.status_broker() as broker:
+            broker.subscribe(lambda status: logger.info('status: %s', status))
+            ...  # Fixtures and threads call juju.status() and juju.wait() as usual.
+
+    Args:
+        fetch: Function that runs ``juju status --format json`` and returns its output.
+        parse: Function that parses the output, given the previous status, if any.
+        interval: Seconds between fetches by the background thread.
+        on_close: Function to call when the broker is closed.
+    """
+
+    fetches: int
+    """Number of ``juju status`` calls the broker has made."""
+
+    coalesced: int
+    """Number of requests for the status that shared an in-flight fetch."""
+
+    def __init__(
+        self,
+        fetch: Callable[[], str],
+        parse: Callable[[str, Status | jubilant.Status | None], Status | jubilant.Status],
+        *,
+        interval: float = 1.0,
+        on_close: Callable[[], Any] | None = None,
+    ):
+        self._fetch = fetch
+        self._on_close = on_close
+        self._parse = parse
+        self.interval = interval
+        self.fetches = 0
+        self.coalesced = 0
+        self._lock = threading.Lock()
+        self._inflight: concurrent.futures.Future[tuple[str, Status | jubilant.Status]] | None = (
+            None
+        )
+        self._published = 0
+        self._fingerprint: str | None = None
+        self._status: Status | jubilant.Status | None = None
+        self._subscribers: list[Callable[[Status | jubilant.Status], Any]] = []
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._key: Hashable = None
+
+    def __enter__(self) -> StatusBroker:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def start(self) -> None:
+        """Start the background thread, if it isn't running."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._poll, name='juju-status-broker')
+            self._thread.daemon = True
+            self._thread.start()
+
+    def close(self) -> None:
+        """Stop the background thread, and stop routing status calls through the broker."""
+        with _brokers_lock:
+            if _brokers.get(self._key) is self:
+                del _brokers[self._key]
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        if self._on_close is not None:
+            self._on_close()
+            self._on_close = None
+
+    def fetch_raw(self) -> str:
+        """Fetch the status, or wait for the fetch in flight, and return the raw output."""
+        return self.fetch_and_parse()[0]
+
+    def status(self) -> Status | jubilant.Status:
+        """Fetch the status, or wait for the fetch in flight, and return the parsed status."""
+        return self.fetch_and_parse()[1]
+
+    def subscribe(self, callback: Callable[[Status | jubilant.Status], Any]) -> Callable[[], None]:
+        """Call *callback* with each new status, starting with the latest one, if any.
+
+        Callbacks are called in the thread that fetched the status, and should return quickly.
+
+        Returns:
+            A function to call to unsubscribe.
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+            status = self._status
+        if status is not None:
+            callback(status)
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    def fetch_and_parse(self) -> tuple[str, Status | jubilant.Status]:
+        """Fetch the status, or wait for the fetch in flight, and return the raw and parsed status.
+
+        If only the timestamps have changed since the last fetch, the parsed status is the last
+        one, so its ``since`` times and controller timestamp may be older than the raw output's.
+        """
+        seq = 0
+        with self._lock:
+            future = self._inflight
+            if future is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                future = self._inflight = concurrent.futures.Future()
+                self.fetches += 1
+                seq = self.fetches
+                leader = True
+        if not leader:
+            return future.result()
+
+        # Settle the future whatever happens, so the callers waiting on it never hang.
+        try:
+            stdout = self._fetch()
+            status, subscribers = self._publish(seq, stdout)
+            future.set_result((stdout, status))
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        finally:
+            with self._lock:
+                self._inflight = None
+        for callback in subscribers:
+            _notify(callback, status)
+        return stdout, status
+
+    def _publish(
+        self, seq: int, stdout: str
+    ) -> tuple[Status | jubilant.Status, list[Callable[[Status | jubilant.Status], Any]]]:
+        """Parse the status if it has changed, and return it and the subscribers to notify."""
+        raw = fingerprint(stdout)
+        with self._lock:
+            if raw == self._fingerprint and self._status is not None:
+                return self._status, []
+            previous = self._status
+        # Parse outside the lock, so the other callers aren't held up by it.
+        status = self._parse(stdout, previous)
+        with self._lock:
+            # A later fetch may have finished first; don't go back to an older status.
+            if seq < self._published and self._status is not None:
+                return self._status, []
+            self._published = seq
+            self._fingerprint = raw
+            self._status = status
+            return status, list(self._subscribers)
+
+    def _poll(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.fetch_raw()
+            except jubilant.CLIError as exc:
+                logger.warning('status broker: status failed: %s', exc)
+            except Exception:
+                logger.exception('status broker: status failed')
+            self._stop.wait(self.interval)
+
+
+def _notify(callback: Callable[[Status | jubilant.Status], Any], status: Any) -> None:
+    try:
+        callback(status)
+    except Exception:
+        logger.exception('status broker: subscriber %r failed', callback)
+
+
+def get(key: Hashable) -> StatusBroker | None:
+    """Return the running broker for *key*, if any."""
+    return _brokers.get(key)
+
+
+def get_or_start(key: Hashable, create: Callable[[], StatusBroker]) -> StatusBroker:
+    """Return the running broker for *key*, creating and starting one if needed."""
+    with _brokers_lock:
+        broker = _brokers.get(key)
+        if broker is None:
+            broker = _brokers[key] = create()
+            broker._key = key
+    broker.start()
+    return broker
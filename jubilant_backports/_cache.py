@@ -0,0 +1,154 @@
+"""Cache the output of read-only Juju CLI commands."""
+
+from __future__ import annotations
+
+import collections
+import threading
+import time
+from typing import Optional, Tuple
+
+# Key for a cached command: the CLI binary, the model (or None), and the arguments.
+_Key = Tuple[str, Optional[str], Tuple[str, ...]]
+
+# Commands whose output is cached.
+_QUERIES = frozenset(['config', 'show-unit', 'status', 'version'])
+
+# Commands that don't change anything, so don't invalidate the cache, besides _QUERIES.
+_READ_ONLY = frozenset(
+    ['controllers', 'debug-log', 'help', 'models', 'operations', 'show-operation', 'wait-for']
+)
+
+# Commands that only affect the application given as their first argument.
+_APP_COMMANDS = frozenset(['config', 'refresh', 'trust', 'upgrade-charm'])
+
+
+class CLICache:
+    """Least-recently-used cache of the output of read-only Juju CLI commands.
+
+    Pass one to :class:`Juju <jubilant_backports.Juju>` to have :meth:`Juju.cli
+    <jubilant_backports.Juju.cli>`, and the methods that use it, such as
+    :meth:`Juju.status <jubilant_backports.Juju.status>` and :meth:`Juju.config
+    <jubilant_backports.Juju.config>`, return the output of ``juju status``,
+    ``juju config <app>``, ``juju show-unit``, and ``juju version`` from the cache for up to
+    *max_age* seconds, rather than running the command again. :meth:`Juju.wait
+    <jubilant_backports.Juju.wait>` always fetches a fresh status.
+
+    Commands that change the model invalidate the entries they may affect: setting config,
+    refreshing, or trusting an app invalidates the model's status and ``show-unit`` entries and
+    that app's config; other commands, such as ``deploy``, ``integrate``, and ``remove-*``,
+    invalidate all the model's entries.
+
+    A cache may be shared by several :class:`Juju` instances; entries are keyed by CLI binary,
+    model, and arguments.
+
+    Example::
+
+        cache = jubilant.CLICache(max_age=2)
+        juju = jubilant.Juju(model='test', cache=cache)
+        ...
+        print(f'{cache.hits} hits, {cache.misses} misses')
+
+    Args:
+        max_age: Maximum age in seconds of a cached output.
+        max_size: Maximum number of entries; the least recently used entry is evicted when
+            another is added.
+    """
+
+    hits: int
+    """Number of commands answered from the cache."""
+
+    misses: int
+    """Number of cacheable commands that had to be run."""
+
+    def __init__(self, *, max_age: float = 5.0, max_size: int = 256):
+        self.max_age = max_age
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: collections.OrderedDict[_Key, tuple[float, str]] = collections.OrderedDict()
+        self._generation = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f'CLICache(max_age={self.max_age}, max_size={self.max_size})'
+
+    def clear(self) -> None:
+        """Remove all the entries."""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def _get(self, key: _Key) -> tuple[str | None, int]:
+        """Return the cached output for *key*, if any, and the generation to pass to _put."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] <= self.max_age:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1], self._generation
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None, self._generation
+
+    def _put(self, key: _Key, stdout: str, generation: int) -> None:
+        """Cache *stdout* for *key*, unless there's been an invalidation since *generation*."""
+        with self._lock:
+            # The command may have run before a change that invalidated the cache.
+            if generation != self._generation:
+                return
+            self._entries[key] = (time.monotonic(), stdout)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def _invalidate(self, cli_binary: str, model: str | None, args: tuple[str, ...]) -> None:
+        """Remove the entries that running the mutating command *args* may have affected."""
+        app = _first_positional(args) if args[0] in _APP_COMMANDS else None
+        with self._lock:
+            self._generation += 1
+            for key in list(self._entries):
+                binary, key_model, key_args = key
+                if binary != cli_binary or key_args[0] == 'version':
+                    continue
+                if model is not None and key_model != model:
+                    continue
+                # A change to one app's config (or charm) doesn't affect other apps' config.
+                if (
+                    app is not None
+                    and key_args[0] == 'config'
+                    and _first_positional(key_args) != app
+                ):
+                    continue
+                del self._entries[key]
+
+
+def is_query(args: tuple[str, ...]) -> bool:
+    """Report whether the command *args* is a read-only query whose output may be cached."""
+    if not args or args[0] not in _QUERIES:
+        return False
+    # "juju config app key=value" and "juju config app --reset key" set config.
+    return not any('=' in arg or arg in ('--reset', '--file') for arg in args[1:])
+
+
+def is_mutating(args: tuple[str, ...]) -> bool:
+    """Report whether the command *args* may change the model."""
+    if not args or args[0] in _READ_ONLY or args[0].startswith('show-'):
+        return False
+    return not is_query(args)
+
+
+def _first_positional(args: tuple[str, ...]) -> str | None:
+    """Return the first argument after the command that isn't an option or option value."""
+    skip = False
+    for arg in args[1:]:
+        if skip:
+            skip = False
+        elif arg in ('--format', '--model', '-m'):
+            skip = True
+        elif not arg.startswith('-'):
+            return arg
+    return None
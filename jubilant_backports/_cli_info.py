@@ -0,0 +1,74 @@
+"""Remember facts about Juju CLI binaries between runs, such as their version.
+
+The facts are stored in a JSON file in the user's cache directory (or in
+``$JUBILANT_CACHE_DIR``, if set), keyed by the binary's real path, modification time, and size,
+so that upgrading or replacing the binary invalidates them.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import pathlib
+import shutil
+from typing import Any
+
+
+def cache_file() -> pathlib.Path:
+    """Return the path of the cache file."""
+    cache_dir = os.environ.get('JUBILANT_CACHE_DIR')
+    if not cache_dir:
+        xdg_cache = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+        cache_dir = os.path.join(xdg_cache, 'jubilant-backports')
+    return pathlib.Path(cache_dir) / 'cli-info.json'
+
+
+def binary_key(cli_binary: str | pathlib.Path) -> str | None:
+    """Return the cache key for *cli_binary*, or None if it can't be found."""
+    path = shutil.which(cli_binary)
+    if path is None:
+        return None
+    real = os.path.realpath(path)
+    if os.path.basename(real) == 'snap':
+        # Snap commands are symlinks to the snap binary, which doesn't change when the Juju
+        # snap is refreshed, so use the Juju snap's current revision.
+        real = os.path.realpath(f'/snap/{os.path.basename(path)}/current')
+    try:
+        stat = os.stat(real)
+    except OSError:
+        return None
+    return f'{real}:{stat.st_mtime_ns}:{stat.st_size}'
+
+
+def load(key: str | None) -> dict[str, Any]:
+    """Return the facts cached for *key*, or an empty dict if there are none."""
+    if key is None:
+        return {}
+    return _read().get(key, {})
+
+
+def update(key: str | None, **facts: Any) -> None:
+    """Add *facts* to the cache for *key*, if the cache file can be written."""
+    if key is None:
+        return
+    path = cache_file()
+    entries = _read()
+    # Drop the facts about previous versions of the same binary.
+    real = key.rsplit(':', 2)[0]
+    entries = {k: v for k, v in entries.items() if k == key or k.rsplit(':', 2)[0] != real}
+    entries.setdefault(key, {}).update(facts)
+    # Write to a temporary file and rename it, so readers never see a partial file.
+    temp = path.with_name(f'{path.name}.{os.getpid()}')
+    with contextlib.suppress(OSError):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp.write_text(json.dumps(entries, indent=1))
+        os.replace(temp, path)
+
+
+def _read() -> dict[str, dict[str, Any]]:
+    try:
+        entries: Any = json.loads(cache_file().read_text())
+    except (OSError, ValueError):
+        return {}
+    return entries if isinstance(entries, dict) else {}  # type: ignore
@@ -0,0 +1,508 @@
+"""Build the CLI arguments for commands, and parse their output, for each major Juju version.
+
+These have no I/O, so the same code serves :class:`Juju29 <jubilant_backports.Juju>`, which
+runs the commands with :mod:`subprocess`, and :class:`AsyncJuju29
+<jubilant_backports.AsyncJuju>`, which runs them with :mod:`asyncio`.
+"""
+
+from __future__ import annotations
+
+import json
+import pathlib
+import re
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+import jubilant
+from jubilant._juju import _format_config
+
+from ._task import ExecTask29, Task29
+
+
+def deploy_args(
+    major: int,
+    charm: str | pathlib.Path,
+    app: str | None = None,
+    *,
+    attach_storage: str | Iterable[str] | None = None,
+    base: str | None = None,
+    bind: Mapping[str, str] | str | None = None,
+    channel: str | None = None,
+    config: Mapping[str, jubilant.ConfigValue] | None = None,
+    constraints: Mapping[str, str] | None = None,
+    force: bool = False,
+    num_units: int = 1,
+    resources: Mapping[str, str] | None = None,
+    revision: int | None = None,
+    storage: Mapping[str, str] | None = None,
+    to: str | Iterable[str] | None = None,
+    trust: bool = False,
+) -> list[str]:
+    """Return the arguments for ``juju deploy``."""
+    args = ['deploy', str(charm)]
+    if app is not None:
+        args.append(app)
+
+    if attach_storage:
+        if isinstance(attach_storage, str):
+            args.extend(['--attach-storage', attach_storage])
+        else:
+            args.extend(['--attach-storage', ','.join(attach_storage)])
+    if base is not None:
+        if major < 3:
+            args.extend(['--series', base_to_series(base)])
+        else:
+            args.extend(['--base', base])
+    if bind is not None:
+        if not isinstance(bind, str):
+            bind = ' '.join(f'{k}={v}' for k, v in bind.items())
+        args.extend(['--bind', bind])
+    if channel is not None:
+        args.extend(['--channel', channel])
+    if config is not None:
+        for k, v in config.items():
+            args.extend(['--config', _format_config(k, v)])
+    if constraints is not None:
+        for k, v in constraints.items():
+            args.extend(['--constraints', f'{k}={v}'])
+    if force:
+        args.append('--force')
+    if num_units != 1:
+        args.extend(['--num-units', str(num_units)])
+    if resources is not None:
+        for k, v in resources.items():
+            args.extend(['--resource', f'{k}={v}'])
+    if revision is not None:
+        args.extend(['--revision', str(revision)])
+    if storage is not None:
+        for k, v in storage.items():
+            args.extend(['--storage', f'{k}={v}'])
+    if to:
+        if isinstance(to, str):
+            args.extend(['--to', to])
+        else:
+            args.extend(['--to', ','.join(to)])
+    if trust:
+        args.append('--trust')
+    return args
+
+
+def exec_args(
+    major: int,
+    command: str,
+    *args: str,
+    machine: int | None = None,
+    unit: str | None = None,
+    wait: float | None = None,
+    background: bool = False,
+) -> list[str]:
+    """Return the arguments for ``juju exec``."""
+    if (machine is not None and unit is not None) or (machine is None and unit is None):
+        raise TypeError('must specify "machine" or "unit", but not both')
+
+    cli_args = ['exec', '--format', 'json']
+    if machine is not None:
+        cli_args.extend(['--machine', str(machine)])
+    else:
+        assert unit is not None
+        cli_args.extend(['--unit', unit])
+    if background:
+        cli_args.append('--background')
+    if wait is not None:
+        cli_args.extend(['--timeout' if major < 3 else '--wait', f'{wait}s'])
+    cli_args.append('--')
+    cli_args.append(command)
+    cli_args.extend(args)
+    return cli_args
+
+
+def exec_output(
+    major: int, exc: jubilant.CLIError, *, machine: int | None = None, unit: str | None = None
+) -> tuple[str, str]:
+    """Return the output of a failed ``juju exec``, if the command ran but failed.
+
+    Raise the appropriate exception if the ``juju exec`` itself failed.
+    """
+    if 'timed out' in exc.stderr:
+        msg = f'timed out waiting for command, stderr:\n{exc.stderr}'
+        raise TimeoutError(msg) from None
+    if major < 3 and 'not found' in exc.stderr:
+        if machine is not None:
+            raise ValueError(f'machine {machine!r} not found, stderr:\n{exc.stderr}') from None
+        raise ValueError(f'unit {unit!r} not found, stderr:\n{exc.stderr}') from None
+    # The "juju exec" CLI command itself fails if the exec'd command fails.
+    if 'task failed' not in exc.stderr:
+        raise exc
+    return exc.stdout, exc.stderr
+
+
+def exec_task(
+    major: int,
+    stdout: str,
+    stderr: str,
+    *,
+    machine: int | None = None,
+    unit: str | None = None,
+) -> ExecTask29 | jubilant.Task:
+    """Parse the output of ``juju exec``, and raise TaskError if the command failed."""
+    if major >= 3:
+        results_by_target: dict[str, Any] = json.loads(stdout) if stdout.strip() else {}
+        target = str(machine) if machine is not None else unit
+        if target not in results_by_target:
+            kind = 'machine' if machine is not None else 'unit'
+            value = machine if machine is not None else unit
+            raise ValueError(f'{kind} {value!r} not found, stderr:\n{stderr}')
+        task = jubilant.Task._from_dict(results_by_target[target])
+        task.raise_on_failure()
+        return task
+
+    # Command doesn't return any stdout if no units exist.
+    results: list[dict[str, Any]] = json.loads(stdout) if stdout.strip() else []
+    if machine is not None:
+        for result in results:
+            if 'machine' in result and result['machine'] == str(machine):
+                break
+        else:
+            raise ValueError(f'machine {machine!r} not found, stderr:\n{stderr}')
+    else:
+        for result in results:
+            if 'unit' in result and result['unit'] == unit:
+                break
+        else:
+            raise ValueError(f'unit {unit!r} not found, stderr:\n{stderr}')
+    exec_task = ExecTask29._from_dict(result)
+    exec_task.raise_on_failure()
+    return exec_task
+
+
+def exec_multiple_args(
+    major: int,
+    command: str,
+    *args: str,
+    machines: int | Iterable[int] | None = None,
+    units: str | Iterable[str] | None = None,
+    apps: str | Iterable[str] | None = None,
+    wait: float | None = None,
+) -> list[str]:
+    """Return the arguments for a single ``juju exec`` on all the targets given."""
+    cli_args = ['exec', '--format', 'json']
+    if machines is not None:
+        machines = [machines] if isinstance(machines, int) else machines
+        if machines:
+            cli_args.extend(['--machine', ','.join(str(m) for m in machines)])
+    for flag, targets in [('--unit', units), ('--application', apps)]:
+        if targets:
+            cli_args.extend([flag, targets if isinstance(targets, str) else ','.join(targets)])
+    if len(cli_args) == 3:
+        raise TypeError('must specify at least one of "machines", "units", or "apps"')
+    if wait is not None:
+        cli_args.extend(['--timeout' if major < 3 else '--wait', f'{wait}s'])
+    cli_args.append('--')
+    cli_args.append(command)
+    cli_args.extend(args)
+    return cli_args
+
+
+def exec_multiple_output(exc: jubilant.CLIError) -> tuple[str, str]:
+    """Return the output of a ``juju exec`` on several targets, if the command failed on some.
+
+    Raise the appropriate exception if the ``juju exec`` itself failed.
+    """
+    if 'timed out' in exc.stderr:
+        msg = f'timed out waiting for command, stderr:\n{exc.stderr}'
+        raise TimeoutError(msg) from None
+    # Like "juju exec" on one target, the CLI command fails if the command fails on any target.
+    if 'task failed' not in exc.stderr:
+        if 'not found' in exc.stderr:
+            raise ValueError(f'target not found, stderr:\n{exc.stderr}') from None
+        raise exc
+    return exc.stdout, exc.stderr
+
+
+def exec_tasks(
+    major: int,
+    stdout: str,
+    stderr: str,
+    *,
+    machines: int | Iterable[int] | None = None,
+    units: str | Iterable[str] | None = None,
+) -> dict[str, ExecTask29 | jubilant.Task]:
+    """Parse the output of ``juju exec`` on several targets into a task for each target.
+
+    Unlike :func:`exec_task`, don't raise TaskError for failed commands, so that the caller
+    gets the results from the targets where the command succeeded. Raise ValueError if any
+    of the *machines* or *units* are missing from the results.
+    """
+    tasks: dict[str, ExecTask29 | jubilant.Task] = {}
+    if major >= 3:
+        results_by_target: dict[str, Any] = json.loads(stdout) if stdout.strip() else {}
+        for target, result in results_by_target.items():
+            tasks[target] = jubilant.Task._from_dict(result)
+    else:
+        # Command doesn't return any stdout if no units exist.
+        results: list[dict[str, Any]] = json.loads(stdout) if stdout.strip() else []
+        for result in results:
+            target = result['unit'] if 'unit' in result else result['machine']
+            tasks[target] = ExecTask29._from_dict(result)
+
+    wanted: list[str] = []
+    if machines is not None:
+        wanted.extend([str(machines)] if isinstance(machines, int) else map(str, machines))
+    if units is not None:
+        wanted.extend([units] if isinstance(units, str) else units)
+    # A "<app>/leader" target is reported under the leader's actual unit name.
+    missing = [t for t in wanted if t not in tasks and not t.endswith('/leader')]
+    if missing:
+        raise ValueError(f'{", ".join(repr(t) for t in missing)} not found, stderr:\n{stderr}')
+    return tasks
+
+
+def help_commands(stdout: str) -> list[str]:
+    """Parse the output of ``juju help commands`` into the command names."""
+    # Each line is a command name followed by its summary.
+    return [line.split()[0] for line in stdout.splitlines() if line and not line[0].isspace()]
+
+
+def help_flags(stdout: str) -> list[str]:
+    """Parse the output of ``juju <command> --help`` into the command's long flags."""
+    return sorted(set(re.findall(r'(?<![\w-])--[a-z0-9][a-z0-9-]*', stdout)))
+
+
+def host_name(tag: str) -> str:
+    """Return the unit name or machine ID for a unit or machine tag.
+
+    For example, ``unit-mysql-k8s-0`` is ``mysql-k8s/0``, and ``machine-0-lxd-1`` is
+    ``0/lxd/1``.
+    """
+    if tag.startswith('unit-'):
+        app, _, num = tag[len('unit-') :].rpartition('-')
+        return f'{app}/{num}'
+    if tag.startswith('machine-'):
+        return tag[len('machine-') :].replace('-', '/')
+    return tag
+
+
+def integrate_args(
+    major: int, app1: str, app2: str, *, via: str | Iterable[str] | None = None
+) -> list[str]:
+    """Return the arguments for ``juju integrate`` (``juju relate`` on Juju 2.9)."""
+    args = ['relate' if major < 3 else 'integrate', app1, app2]
+    if via:
+        if isinstance(via, str):
+            args.extend(['--via', via])
+        else:
+            args.extend(['--via', ','.join(via)])
+    return args
+
+
+def refresh_args(
+    major: int,
+    app: str,
+    *,
+    base: str | None = None,
+    channel: str | None = None,
+    config: Mapping[str, jubilant.ConfigValue] | None = None,
+    config_file: str | None = None,
+    force: bool = False,
+    path: str | pathlib.Path | None = None,
+    resources: Mapping[str, str] | None = None,
+    revision: int | None = None,
+    storage: Mapping[str, str] | None = None,
+    trust: bool = False,
+) -> list[str]:
+    """Return the arguments for ``juju refresh``.
+
+    On Juju 2.9, *config* must be written to a YAML file, passed as *config_file*, and
+    *trust* needs a separate ``juju trust`` command, so both are ignored here.
+    """
+    args = ['refresh', app]
+    if base is not None:
+        if major < 3:
+            args.extend(['--series', base_to_series(base)])
+        else:
+            args.extend(['--base', base])
+    if channel is not None:
+        args.extend(['--channel', channel])
+    if config is not None and major >= 3:
+        for k, v in config.items():
+            args.extend(['--config', _format_config(k, v)])
+    if force:
+        args.extend(['--force', '--force-base', '--force-units'])
+    if path is not None:
+        args.extend(['--path', str(path)])
+    if resources is not None:
+        for k, v in resources.items():
+            args.extend(['--resource', f'{k}={v}'])
+    if revision is not None:
+        args.extend(['--revision', str(revision)])
+    if storage is not None:
+        for k, v in storage.items():
+            args.extend(['--storage', f'{k}={v}'])
+    if major >= 3:
+        if trust:
+            args.append('--trust')
+    elif config_file is not None:
+        args.extend(['--config', config_file])
+    return args
+
+
+def run_args(
+    major: int,
+    unit: str,
+    action: str,
+    *,
+    wait: float | None = None,
+    params_file: str | None = None,
+) -> list[str]:
+    """Return the arguments for ``juju run`` (``juju run-action`` on Juju 2.9)."""
+    if major < 3:
+        args = ['run-action', '--format', 'json', unit, action]
+        args.append('--wait' if wait is None else f'--wait={wait}s')
+    else:
+        args = ['run', '--format', 'json', unit, action]
+        if wait is not None:
+            args.extend(['--wait', f'{wait}s'])
+    if params_file is not None:
+        args.extend(['--params', params_file])
+    return args
+
+
+def run_output(exc: jubilant.CLIError) -> tuple[str, str]:
+    """Return the output of a failed ``juju run``, if the action ran but failed.
+
+    Raise the appropriate exception if the ``juju run`` itself failed.
+    """
+    if 'timed out' in exc.stderr or 'timeout reached' in exc.stderr:
+        msg = f'timed out waiting for action, stderr:\n{exc.stderr}'
+        raise TimeoutError(msg) from None
+    # The "juju run" CLI command fails if the action has an uncaught exception.
+    if 'task failed' not in exc.stderr:
+        raise exc
+    return exc.stdout, exc.stderr
+
+
+def run_task(
+    major: int, unit: str, action: str, stdout: str, stderr: str
+) -> Task29 | jubilant.Task:
+    """Parse the output of ``juju run``, and raise TaskError if the action failed."""
+    # Command doesn't return any stdout if no units exist.
+    all_tasks: dict[str, Any] = json.loads(stdout) if stdout.strip() else {}
+    key = unit if major >= 3 else f'unit-{unit.replace("/", "-")}'
+    if key not in all_tasks:
+        raise ValueError(
+            f'action {action!r} not defined or unit {unit!r} not found, stderr:\n{stderr}'
+        )
+    task_cls = jubilant.Task if major >= 3 else Task29
+    task = task_cls._from_dict(all_tasks[key])
+    task.raise_on_failure()
+    return task
+
+
+def run_multiple_args(
+    major: int, units: Iterable[str], action: str, *, params_file: str | None = None
+) -> list[str]:
+    """Return the arguments to queue an action on all *units*, without waiting for it."""
+    # Without --wait, "juju run-action" doesn't wait for the tasks to finish.
+    args = ['run-action'] if major < 3 else ['run', '--background']
+    args.extend([*units, action])
+    if params_file is not None:
+        args.extend(['--params', params_file])
+    return args
+
+
+def queued_operation(stdout: str, stderr: str) -> str:
+    """Return the ID of the operation scheduled by a background ``juju run``."""
+    # For example, "Scheduled operation 3 with 2 tasks".
+    match = re.search(r'^Scheduled operation (\d+)', stdout + stderr, re.MULTILINE)
+    if match is None:
+        raise ValueError(f'operation ID not found in output, stderr:\n{stderr}')
+    return match.group(1)
+
+
+def queued_task(stdout: str, stderr: str) -> tuple[str, str]:
+    """Return the IDs of the operation and first task scheduled by a background command."""
+    # For example, "Scheduled operation 3 with task 4", or "Scheduled operation 3 with 2
+    # tasks", followed by lines like "  - task 4 on unit-mysql-0".
+    operation = queued_operation(stdout, stderr)
+    task = re.search(r'\btask (\d+)', stdout + stderr)
+    if task is None:
+        raise ValueError(f'task ID not found in output, stderr:\n{stderr}')
+    return operation, task.group(1)
+
+
+def operation_task_dicts(stdout: str) -> dict[str, dict[str, Any]]:
+    """Parse the output of ``juju show-operation`` into each task's raw dict, keyed by task ID.
+
+    Each dict's "host" is the unit name or machine ID the task ran on, rather than its tag.
+    """
+    operation: dict[str, Any] = json.loads(stdout)
+    tasks: dict[str, dict[str, Any]] = {}
+    for task_id, task in operation.get('tasks', {}).items():
+        tasks[task_id] = {**task, 'id': task_id, 'host': host_name(task['host'])}
+    return tasks
+
+
+def task_finished(task: dict[str, Any]) -> bool:
+    """Report whether a raw task from ``juju show-operation`` has finished."""
+    return task['status'] not in ('pending', 'running', 'aborting')
+
+
+def action_task(major: int, task: dict[str, Any]) -> Task29 | jubilant.Task:
+    """Return the Task for a finished action, from its raw ``juju show-operation`` dict."""
+    task_cls = jubilant.Task if major >= 3 else Task29
+    return task_cls._from_dict(task)
+
+
+def exec_operation_task(major: int, task: dict[str, Any]) -> ExecTask29 | jubilant.Task:
+    """Return the task for a finished exec command, from its raw ``juju show-operation`` dict."""
+    if major >= 3:
+        return jubilant.Task._from_dict(task)
+    results: dict[str, Any] = dict(task.get('results') or {})
+    # Juju 2.9 reports the exit code and output with these keys.
+    for old, new in [('Code', 'return-code'), ('Stdout', 'stdout'), ('Stderr', 'stderr')]:
+        if old in results:
+            results[new] = results.pop(old)
+    results['return-code'] = int(results.get('return-code') or 0)
+    return ExecTask29._from_dict(results)
+
+
+def operation_tasks(major: int, stdout: str) -> dict[str, Task29 | jubilant.Task | None]:
+    """Parse the output of ``juju show-operation``, returning each unit's action task.
+
+    A unit's task is None if it hasn't finished yet.
+    """
+    return {
+        task['host']: action_task(major, task) if task_finished(task) else None
+        for task in operation_task_dicts(stdout).values()
+    }
+
+
+def status_args(apps: str | Iterable[str] | None) -> list[str]:
+    """Return the CLI arguments to fetch the status, filtered to *apps* if provided."""
+    args = ['status', '--format', 'json']
+    if apps is None:
+        return args
+    # Need this check because str is also an iterable of str.
+    if isinstance(apps, str):
+        args.append(apps)
+    else:
+        args.extend(apps)
+    return args
+
+
+def base_to_series(base: str) -> str:
+    """Convert a base to a series name."""
+    name, cycle = base.split('@', 1)
+    if name != 'ubuntu':
+        raise ValueError(f'base must be an Ubuntu base, not {name!r}')
+    return {
+        '14.04': 'trusty',
+        '16.04': 'xenial',
+        '18.04': 'bionic',
+        '20.04': 'focal',
+        '22.04': 'jammy',
+        '24.04': 'noble',
+        '24.10': 'oracular',
+        '25.04': 'plucky',
+        '25.10': 'questing',
+    }[cycle]
@@ -0,0 +1,70 @@
+"""Follow ``juju debug-log`` to notice when hooks run or statuses are set."""
+
+from __future__ import annotations
+
+import re
+import subprocess
+import threading
+import time
+
+# Log lines for a hook starting or finishing ('running operation run install hook', 'ran
+# "install" hook') or a charm setting a status ('running hook tool "status-set"').
+_ACTIVITY = re.compile(r'\bhook\b|status-set')
+
+
+class LogActivity:
+    """Run ``juju debug-log`` in the background and record when there's hook activity.
+
+    A thread reads the log as it's written and sets a flag when a line matches; :meth:`wait`
+    waits for the flag and :meth:`clear` resets it. If the command fails or exits, the flag is
+    just never set, so waiting for activity falls back to waiting for the timeout.
+
+    Args:
+        args: The ``juju debug-log`` command line.
+        settle: After activity, :meth:`wait` waits this many more seconds before returning, to
+            give the hook (and any hooks it triggers) a moment to finish.
+    """
+
+    def __init__(self, args: list[str], *, settle: float = 0.0):
+        self._settle = settle
+        self._event = threading.Event()
+        self._process = subprocess.Popen(
+            args,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            encoding='utf-8',
+            errors='replace',
+        )
+        self._thread = threading.Thread(target=self._read, name='juju-debug-log', daemon=True)
+        self._thread.start()
+
+    def _read(self) -> None:
+        assert self._process.stdout is not None
+        for line in self._process.stdout:
+            if _ACTIVITY.search(line):
+                self._event.set()
+
+    def clear(self) -> None:
+        """Forget any activity seen so far."""
+        self._event.clear()
+
+    def wait(self, timeout: float) -> bool:
+        """Wait up to *timeout* seconds for activity; return true if there was any.
+
+        The settle time after activity is cut short so the whole wait stays within *timeout*.
+        """
+        deadline = time.monotonic() + timeout
+        if not self._event.wait(timeout):
+            return False
+        time.sleep(max(0.0, min(self._settle, deadline - time.monotonic())))
+        return True
+
+    def close(self) -> None:
+        """Stop the ``juju debug-log`` process and the thread reading it."""
+        self._process.terminate()
+        try:
+            self._process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+            self._process.wait()
+        self._thread.join(timeout=5)
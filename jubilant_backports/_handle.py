@@ -0,0 +1,125 @@
+"""Handles to actions and exec commands running in the background."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, Any
+
+import jubilant
+
+from . import _commands
+from ._task import ExecTask29, Task29
+
+if TYPE_CHECKING:
+    from ._juju import Juju29
+
+
+class TaskHandle:
+    """Handle to an action or ``exec`` command running in the background.
+
+    Create one with :meth:`Juju.run_async <jubilant_backports.Juju.run_async>` or
+    :meth:`Juju.exec_async <jubilant_backports.Juju.exec_async>`. No CLI process runs while
+    the task does: each refresh is a single, quick ``juju show-operation``, and
+    :meth:`Juju.poll_tasks <jubilant_backports.Juju.poll_tasks>` refreshes many handles at
+    once, with one call for each operation.
+
+    Example::
+
+        backup = juju.run_async('mysql/0', 'create-backup')
+        ...  # Do other work.
+        for message in backup.logs():
+            print(message)
+        task = backup.result(timeout=600)
+    """
+
+    operation: str
+    """ID of the Juju operation that the task is part of."""
+
+    id: str
+    """ID of the task."""
+
+    def __init__(self, juju: Juju29, operation: str, task_id: str, *, exec: bool = False):
+        self._juju = juju
+        self.operation = operation
+        self.id = task_id
+        self._exec = exec
+        self._raw: dict[str, Any] | None = None
+
+    def __repr__(self) -> str:
+        return f'TaskHandle(operation={self.operation!r}, id={self.id!r}, status={self.status!r})'
+
+    @property
+    def status(self) -> str:
+        """Status of the task when it was last refreshed, for example "running"."""
+        return 'pending' if self._raw is None else self._raw['status']
+
+    @property
+    def log(self) -> list[str]:
+        """Messages logged by the task, as of when it was last refreshed."""
+        return [] if self._raw is None else list(self._raw.get('log') or [])
+
+    def done(self) -> bool:
+        """Report whether the task has finished, refreshing it if it hadn't last time."""
+        if not self._finished():
+            self._juju.poll_tasks([self])
+        return self._finished()
+
+    def result(
+        self, timeout: float | None = None, *, delay: float = 1.0
+    ) -> Task29 | ExecTask29 | jubilant.Task:
+        """Wait for the task to finish, and return it.
+
+        Args:
+            timeout: Maximum time to wait, in seconds. Default is to wait indefinitely.
+            delay: Delay in seconds between refreshes.
+
+        Raises:
+            TaskError: if the action or command failed.
+            TimeoutError: if *timeout* was specified and the task didn't finish in time.
+        """
+        start = time.monotonic()
+        while not self.done():
+            if timeout is not None and time.monotonic() - start > timeout:
+                raise TimeoutError(f'timed out waiting for task {self.id}, status {self.status!r}')
+            time.sleep(delay)
+        assert self._raw is not None
+        major = self._juju.cli_major_version
+        if self._exec:
+            task = _commands.exec_operation_task(major, self._raw)
+        else:
+            task = _commands.action_task(major, self._raw)
+        task.raise_on_failure()
+        return task
+
+    def cancel(self) -> bool:
+        """Cancel the task, if it hasn't finished.
+
+        Return True if a cancellation was requested, False if the task had already finished.
+        """
+        if self.done():
+            return False
+        self._juju.cli('cancel-task', self.id)
+        return True
+
+    def logs(self, *, delay: float = 1.0) -> Iterator[str]:
+        """Yield messages logged by the task as they appear, until it finishes.
+
+        Args:
+            delay: Delay in seconds between refreshes.
+        """
+        seen = 0
+        while True:
+            done = self.done()
+            log = self.log
+            yield from log[seen:]
+            seen = len(log)
+            if done:
+                return
+            time.sleep(delay)
+
+    def _finished(self) -> bool:
+        return self._raw is not None and _commands.task_finished(self._raw)
+
+    def _update(self, raw: dict[str, Any]) -> None:
+        self._raw = raw
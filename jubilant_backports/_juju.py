@@ -1,24 +1,44 @@
 from __future__ import annotations
 
+import concurrent.futures
 import contextlib
+import dataclasses
+import datetime
 import functools
+import hashlib
 import json
 import logging
+import math
 import os
 import pathlib
+import shlex
 import tempfile
 import time
-from collections.abc import Iterable, Mapping
+from collections.abc import Generator, Iterable, Mapping
 from typing import Any, Callable, overload
 
 import jubilant
 from jubilant import _pretty, _yaml
-from jubilant._juju import _format_config
 
+from . import _api, _broker, _cache, _cli_info, _commands
+from ._batch import Batch
+from ._broker import StatusBroker
+from ._cache import CLICache
+from ._commands import status_args
+from ._debug_log import LogActivity
+from ._handle import TaskHandle
+from ._predicates import _wait_for_query
+from ._prefetch import PollStats, StatusPrefetcher
+from ._schedule import FixedSchedule, Schedule
+from ._shared_status import SharedStatusFile
+from ._status_json import controller_timestamp, fingerprint, loads_sections
 from ._task import ExecTask29 as ExecTask
+from ._task import MultiTaskError
 from ._task import Task29 as Task
-from .statustypes import Status
+from ._transport import CLITransport, Transport
+from .statustypes import Status, _same_content
 
+logger = logging.getLogger('jubilant')
 logger_wait = logging.getLogger('jubilant.wait')
 
 
@@ -42,11 +62,22 @@ class Juju29(jubilant.Juju):
             parameter is not specified.
         cli_binary: Path to the Juju CLI binary. If not specified, uses ``juju`` and assumes it is
             in the PATH.
+        cache: If specified, cache the output of read-only commands such as ``juju status``
+            in this :class:`CLICache`.
+        transport: How to run the commands. Default is a :class:`CLITransport`, which runs
+            each as a ``juju`` process; an :class:`APITransport` runs the most frequent ones
+            over a persistent connection to the controller instead.
     """
 
     cli_version: str
     """The version of the Juju CLI binary, for example ``3.6.8``."""
 
+    cache: CLICache | None
+    """Cache for the output of read-only commands, if any."""
+
+    transport: Transport
+    """Transport that runs the commands."""
+
     def __init__(
         self,
         *,
@@ -54,14 +85,23 @@ class Juju29(jubilant.Juju):
         wait_timeout: float = 3 * 60.0,
         cli_binary: str | pathlib.Path | None = None,
         cli_version: str | None = None,
+        cache: CLICache | None = None,
+        transport: Transport | None = None,
     ):
         super().__init__(model=model, wait_timeout=wait_timeout, cli_binary=cli_binary)
-        if cli_version is None:
+        self.cache = cache
+        self.transport = transport if transport is not None else CLITransport()
+        if cli_version is not None:
+            self.cli_version = cli_version
+        elif 'version' in self._cli_info:
+            # The version is remembered on disk, so "juju version" only runs once for each
+            # installed binary.
+            self.cli_version = self._cli_info['version']
+        else:
             self.cli_version = json.loads(
                 self.cli('version', '--format', 'json', include_model=False)
             )
-        else:
-            self.cli_version = cli_version
+            self._update_cli_info(version=self.cli_version)
 
     @functools.cached_property
     def cli_major_version(self):
@@ -98,6 +138,58 @@ class Juju29(jubilant.Juju):
             raise NotImplementedError('Juju secrets requires Juju 3.')
         return super().add_secret(name, content, info=info)
 
+    def batch(self, *, max_workers: int = 4) -> Batch:
+        """Return a context manager to run independent commands concurrently.
+
+        Commands submitted to the :class:`Batch` run on a pool of up to *max_workers* threads,
+        each as its own ``juju`` process, in any order unless given *after* futures to wait
+        for. When the context exits, this waits for all the commands to finish, and if any
+        failed, raises the first one's exception.
+
+        Example::
+
+            with juju.batch() as batch:
+                mysql = batch.submit(juju.deploy, 'mysql')
+                wordpress = batch.submit(juju.deploy, 'wordpress')
+                batch.submit(juju.integrate, 'mysql', 'wordpress', after=[mysql, wordpress])
+                batch.submit(juju.config, 'wordpress', {'blog-title': 'Hi'}, after=[wordpress])
+
+        If the body of the ``with`` raises, commands that haven't started are cancelled, and
+        the exception propagates once the running ones have finished.
+
+        Args:
+            max_workers: Maximum number of commands to run at once.
+        """
+        return Batch(max_workers)
+
+    def cli(self, *args: str, include_model: bool = True, stdin: str | None = None) -> str:
+        """Run a Juju CLI command and return its standard output.
+
+        If the instance has a :attr:`cache`, the output of read-only commands is returned from
+        the cache while it's fresh, and commands that may change the model invalidate the
+        entries they affect.
+
+        Args:
+            args: Command-line arguments (excluding ``juju``).
+            include_model: If true and :attr:`model` is set, insert the ``--model`` argument
+                after the first argument in *args*.
+            stdin: Standard input to send to the process, if any.
+        """
+        cache = self.cache
+        if cache is None:
+            return super().cli(*args, include_model=include_model, stdin=stdin)
+
+        model = self.model if include_model else None
+        if stdin is None and _cache.is_query(args):
+            key = (str(self.cli_binary), model, args)
+            stdout, generation = cache._get(key)
+            if stdout is None:
+                stdout = super().cli(*args, include_model=include_model)
+                cache._put(key, stdout, generation)
+            return stdout
+
+        return super().cli(*args, include_model=include_model, stdin=stdin)
+
     def deploy(
         self,
         charm: str | pathlib.Path,
@@ -169,51 +261,26 @@ class Juju29(jubilant.Juju):
         if isinstance(overlays, str):
             raise TypeError('overlays must be an iterable of str or pathlib.Path, not str')
 
-        args = ['deploy', str(charm)]
-        if app is not None:
-            args.append(app)
-
-        if attach_storage:
-            if isinstance(attach_storage, str):
-                args.extend(['--attach-storage', attach_storage])
-            else:
-                args.extend(['--attach-storage', ','.join(attach_storage)])
-        if base is not None:
-            args.extend(['--series', _base_to_series(base)])
-        if bind is not None:
-            if not isinstance(bind, str):
-                bind = ' '.join(f'{k}={v}' for k, v in bind.items())
-            args.extend(['--bind', bind])
-        if channel is not None:
-            args.extend(['--channel', channel])
-        if config is not None:
-            for k, v in config.items():
-                args.extend(['--config', _format_config(k, v)])
-        if constraints is not None:
-            for k, v in constraints.items():
-                args.extend(['--constraints', f'{k}={v}'])
-        if force:
-            args.append('--force')
-        if num_units != 1:
-            args.extend(['--num-units', str(num_units)])
+        args = _commands.deploy_args(
+            self.cli_major_version,
+            charm,
+            app,
+            attach_storage=attach_storage,
+            base=base,
+            bind=bind,
+            channel=channel,
+            config=config,
+            constraints=constraints,
+            force=force,
+            num_units=num_units,
+            resources=resources,
+            revision=revision,
+            storage=storage,
+            to=to,
+            trust=trust,
+        )
         #        for overlay in overlays:
         #            args.extend(['--overlay', str(overlay)])
-        if resources is not None:
-            for k, v in resources.items():
-                args.extend(['--resource', f'{k}={v}'])
-        if revision is not None:
-            args.extend(['--revision', str(revision)])
-        if storage is not None:
-            for k, v in storage.items():
-                args.extend(['--storage', f'{k}={v}'])
-        if to:
-            if isinstance(to, str):
-                args.extend(['--to', to])
-            else:
-                args.extend(['--to', ','.join(to)])
-        if trust:
-            args.append('--trust')
-
         self.cli(*args)
 
     @overload
@@ -236,9 +303,7 @@ class Juju29(jubilant.Juju):
 
         You must specify either *machine* or *unit*, but not both.
 
-        Note: this method does not support running a command on multiple units
-        at once. If you need that, let us know, and we'll consider adding it
-        with a new ``exec_multiple`` method or similar.
+        To run a command on multiple units or machines at once, use :meth:`exec_multiple`.
 
         Args:
             command: Command to run. Because the command is executed using the shell,
@@ -261,57 +326,99 @@ class Juju29(jubilant.Juju):
         if self.cli_major_version >= 3:
             return super().exec(command, *args, machine=machine, unit=unit, wait=wait)  # type: ignore
 
-        if (machine is not None and unit is not None) or (machine is None and unit is None):
-            raise TypeError('must specify "machine" or "unit", but not both')
+        major = self.cli_major_version
+        cli_args = _commands.exec_args(
+            major, command, *args, machine=machine, unit=unit, wait=wait
+        )
+        try:
+            stdout, stderr = self._cli(*cli_args)
+        except jubilant.CLIError as exc:
+            stdout, stderr = _commands.exec_output(major, exc, machine=machine, unit=unit)
+        return _commands.exec_task(major, stdout, stderr, machine=machine, unit=unit)  # type: ignore
 
-        cli_args = ['exec', '--format', 'json']
-        if machine is not None:
-            cli_args.extend(['--machine', str(machine)])
-        else:
-            assert unit is not None
-            cli_args.extend(['--unit', unit])
-        if wait is not None:
-            cli_args.extend(['--timeout', f'{wait}s'])
-        cli_args.append('--')
-        cli_args.append(command)
-        cli_args.extend(args)
+    def exec_async(
+        self,
+        command: str,
+        *args: str,
+        machine: int | None = None,
+        unit: str | None = None,
+    ) -> TaskHandle:
+        """Start running the command on the remote target specified, and return immediately.
+
+        This is like :meth:`exec`, but runs the command in the background (``juju exec
+        --background``). Use the handle returned to follow the command and get its result.
+
+        Args:
+            command: Command to run; see :meth:`exec`.
+            args: Arguments of the command.
+            machine: ID of machine to run the command on.
+            unit: Name of unit to run the command on, for example ``mysql/0`` or ``mysql/leader``.
+        """
+        cli_args = _commands.exec_args(
+            self.cli_major_version, command, *args, machine=machine, unit=unit, background=True
+        )
+        stdout, stderr = self._cli(*cli_args)
+        operation, task_id = _commands.queued_task(stdout, stderr)
+        return TaskHandle(self, operation, task_id, exec=True)
+
+    def exec_multiple(
+        self,
+        command: str,
+        *args: str,
+        machines: int | Iterable[int] | None = None,
+        units: str | Iterable[str] | None = None,
+        apps: str | Iterable[str] | None = None,
+        wait: float | None = None,
+    ) -> dict[str, ExecTask]:
+        """Run the command on all the remote targets specified, with a single ``juju exec``.
+
+        You must specify at least one of *machines*, *units*, or *apps*, and may combine
+        them. This takes one round trip to the controller, rather than one for each target
+        with :meth:`exec`.
+
+        Unlike :meth:`exec`, this doesn't raise :class:`TaskError` if the command fails on
+        some of the targets: check each task's ``success`` attribute (or call its
+        ``raise_on_failure`` method).
+
+        Example::
+
+            tasks = juju.exec_multiple('cat /etc/hostname', apps='mysql')
+            hostnames = {unit: task.stdout.strip() for unit, task in tasks.items()}
+
+        Args:
+            command: Command to run. Because the command is executed using the shell,
+                arguments may also be included here as a single string, for example
+                ``juju.exec_multiple('echo foo', ...)``.
+            args: Arguments of the command.
+            machines: ID or IDs of machines to run the command on.
+            units: Name or names of units to run the command on, for example ``mysql/0``.
+            apps: Name or names of applications to run the command on all units of.
+            wait: Maximum time to wait for command to finish; :class:`TimeoutError` is raised if
+                this is reached. Default is to wait indefinitely.
+
+        Returns:
+            A dict of the task that ran the command on each target, keyed by unit name (for
+            *units* and *apps*) or machine ID (for *machines*).
 
+        Raises:
+            ValueError: if any of the machines or units don't exist.
+            TimeoutError: if *wait* was specified and the wait time was reached.
+        """
+        # Both the arguments and the checks on the results iterate over these.
+        if machines is not None and not isinstance(machines, int):
+            machines = list(machines)
+        if units is not None and not isinstance(units, str):
+            units = list(units)
+
+        major = self.cli_major_version
+        cli_args = _commands.exec_multiple_args(
+            major, command, *args, machines=machines, units=units, apps=apps, wait=wait
+        )
         try:
             stdout, stderr = self._cli(*cli_args)
         except jubilant.CLIError as exc:
-            if 'timed out' in exc.stderr:
-                msg = f'timed out waiting for command, stderr:\n{exc.stderr}'
-                raise TimeoutError(msg) from None
-            if 'not found' in exc.stderr:
-                if machine is not None:
-                    raise ValueError(
-                        f'machine {machine!r} not found, stderr:\n{exc.stderr}'
-                    ) from None
-                else:
-                    raise ValueError(f'unit {unit!r} not found, stderr:\n{exc.stderr}') from None
-            # The "juju exec" CLI command itself fails if the exec'd command fails.
-            if 'task failed' not in exc.stderr:
-                raise
-            stdout = exc.stdout
-            stderr = exc.stderr
-
-        # Command doesn't return any stdout if no units exist.
-        results: list[dict[str, Any]] = json.loads(stdout) if stdout.strip() else []
-        if machine is not None:
-            for result in results:
-                if 'machine' in result and result['machine'] == str(machine):
-                    break
-            else:
-                raise ValueError(f'machine {machine!r} not found, stderr:\n{stderr}')
-        else:
-            for result in results:
-                if 'unit' in result and result['unit'] == unit:
-                    break
-            else:
-                raise ValueError(f'unit {unit!r} not found, stderr:\n{stderr}')
-        task = ExecTask._from_dict(result)
-        task.raise_on_failure()
-        return task
+            stdout, stderr = _commands.exec_multiple_output(exc)
+        return _commands.exec_tasks(major, stdout, stderr, machines=machines, units=units)  # type: ignore
 
     def integrate(self, app1: str, app2: str, *, via: str | Iterable[str] | None = None) -> None:
         """Integrate two applications, creating a relation between them.
@@ -336,13 +443,43 @@ class Juju29(jubilant.Juju):
         if self.cli_major_version >= 3:
             return super().integrate(app1, app2, via=via)
 
-        args = ['relate', app1, app2]
-        if via:
-            if isinstance(via, str):
-                args.extend(['--via', via])
-            else:
-                args.extend(['--via', ','.join(via)])
-        self.cli(*args)
+        self.cli(*_commands.integrate_args(self.cli_major_version, app1, app2, via=via))
+
+    def poll_tasks(self, handles: Iterable[TaskHandle], *, max_workers: int = 4) -> None:
+        """Refresh background task handles in one sweep.
+
+        This runs a single ``juju show-operation`` for each operation that has unfinished
+        handles, concurrently on up to *max_workers* threads, rather than one for each handle.
+        Handles for tasks that have already finished aren't refreshed.
+
+        Example::
+
+            handles = [juju.run_async(unit, 'create-backup') for unit in units]
+            while not all(h.done() for h in handles):
+                time.sleep(5)
+                juju.poll_tasks(handles)
+
+        Args:
+            handles: Handles returned by :meth:`run_async` or :meth:`exec_async`.
+            max_workers: Maximum number of ``juju show-operation`` commands to run at once.
+        """
+        by_operation: dict[str, list[TaskHandle]] = {}
+        for handle in handles:
+            if not handle._finished():
+                by_operation.setdefault(handle.operation, []).append(handle)
+        if not by_operation:
+            return
+
+        def show(operation: str) -> dict[str, dict[str, Any]]:
+            stdout, _ = self._cli('show-operation', operation, '--format', 'json', log=False)
+            return _commands.operation_task_dicts(stdout)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(show, by_operation)
+            for operation_handles, tasks in zip(by_operation.values(), results):
+                for handle in operation_handles:
+                    if handle.id in tasks:
+                        handle._update(tasks[handle.id])
 
     def refresh(
         self,
@@ -387,32 +524,24 @@ class Juju29(jubilant.Juju):
                 trust=trust,
             )
 
-        args = ['refresh', app]
-
-        if base is not None:
-            args.extend(['--series', _base_to_series(base)])
-        if channel is not None:
-            args.extend(['--channel', channel])
-        if force:
-            args.extend(['--force', '--force-base', '--force-units'])
-        if path is not None:
-            args.extend(['--path', str(path)])
-        if resources is not None:
-            for k, v in resources.items():
-                args.extend(['--resource', f'{k}={v}'])
-        if revision is not None:
-            args.extend(['--revision', str(revision)])
-        if storage is not None:
-            for k, v in storage.items():
-                args.extend(['--storage', f'{k}={v}'])
-
         mgr = contextlib.nullcontext() if config is None else tempfile.TemporaryFile('w')  # noqa: SIM115
         with mgr as config_file:
             if config is not None:
                 assert config_file is not None
                 _yaml.safe_dump(config, config_file)
                 config_file.flush()
-                args.extend(['--config', config_file.name])
+            args = _commands.refresh_args(
+                self.cli_major_version,
+                app,
+                base=base,
+                channel=channel,
+                config_file=None if config_file is None else config_file.name,
+                force=force,
+                path=path,
+                resources=resources,
+                revision=revision,
+                storage=storage,
+            )
             self.cli(*args)
 
         if trust:
@@ -428,9 +557,7 @@ class Juju29(jubilant.Juju):
     ) -> Task | jubilant.Task:
         """Run an action on the given unit and wait for the result.
 
-        Note: this method does not support running an action on multiple units
-        at once. If you need that, let us know, and we'll consider adding it
-        with a new ``run_multiple`` method or similar.
+        To run an action on multiple units at once, use :meth:`run_multiple`.
 
         Example::
 
@@ -457,56 +584,251 @@ class Juju29(jubilant.Juju):
         if self.cli_major_version >= 3:
             return super().run(unit, action, params, wait=wait)
 
-        args = ['run-action', '--format', 'json', unit, action]
-        if wait is None:
-            args.append('--wait')
-        else:
-            args.append(f'--wait={wait}s')
+        major = self.cli_major_version
+        params_file = None
+        if params is not None:
+            with tempfile.NamedTemporaryFile(
+                'w+', delete=False, dir=self._temp_dir
+            ) as params_file:
+                _yaml.safe_dump(params, params_file)
+
+        args = _commands.run_args(
+            major,
+            unit,
+            action,
+            wait=wait,
+            params_file=None if params_file is None else params_file.name,
+        )
+        try:
+            try:
+                stdout, stderr = self._cli(*args)
+            except jubilant.CLIError as exc:
+                stdout, stderr = _commands.run_output(exc)
+            return _commands.run_task(major, unit, action, stdout, stderr)
+        finally:
+            if params_file is not None:
+                os.remove(params_file.name)
+
+    def run_async(
+        self,
+        unit: str,
+        action: str,
+        params: Mapping[str, Any] | None = None,
+    ) -> TaskHandle:
+        """Start running an action on the given unit, and return immediately.
+
+        This is like :meth:`run`, but queues the action without waiting for it. Use the handle
+        returned to follow the action's log messages, cancel it, or wait for its result.
+
+        Args:
+            unit: Name of unit to run the action on, for example ``mysql/0`` or
+                ``mysql/leader``.
+            action: Name of action to run.
+            params: Optional named parameters to pass to the action.
+        """
+        params_file = None
+        if params is not None:
+            with tempfile.NamedTemporaryFile(
+                'w+', delete=False, dir=self._temp_dir
+            ) as params_file:
+                _yaml.safe_dump(params, params_file)
+
+        args = _commands.run_multiple_args(
+            self.cli_major_version,
+            [unit],
+            action,
+            params_file=None if params_file is None else params_file.name,
+        )
+        try:
+            stdout, stderr = self._cli(*args)
+        finally:
+            if params_file is not None:
+                os.remove(params_file.name)
+        operation, task_id = _commands.queued_task(stdout, stderr)
+        return TaskHandle(self, operation, task_id)
+
+    def run_multiple(
+        self,
+        units: Iterable[str],
+        action: str,
+        params: Mapping[str, Any] | None = None,
+        *,
+        wait: float | None = None,
+        delay: float = 1.0,
+    ) -> dict[str, Task | jubilant.Task]:
+        """Run an action on all the given units concurrently, and wait for the results.
+
+        This queues the action on every unit with a single ``juju run-action`` (``juju run``
+        on Juju 3), then polls the operation's tasks with ``juju show-operation``, which
+        reports on all the units in one call. The action takes about as long on N units as on
+        one, rather than N times as long as with :meth:`run`.
+
+        Example::
+
+            tasks = juju.run_multiple(['mysql/0', 'mysql/1', 'mysql/2'], 'backup')
+            paths = {unit: task.results['path'] for unit, task in tasks.items()}
+
+        Args:
+            units: Names of units to run the action on, for example ``['mysql/0', 'mysql/1']``.
+            action: Name of action to run.
+            params: Optional named parameters to pass to the action.
+            wait: Maximum time to wait for the action to finish on all the units;
+                :class:`TimeoutError` is raised if this is reached. Default is to wait
+                indefinitely.
+            delay: Delay in seconds between polls of the operation's tasks.
+
+        Returns:
+            The task created to run the action on each unit, keyed by unit name.
+
+        Raises:
+            ValueError: if the action or any of the units doesn't exist.
+            MultiTaskError: if the action failed on any of the units, once it has finished on
+                all of them.
+            TimeoutError: if *wait* was specified and the wait time was reached.
+        """
+        units = list(units)
+        if not units:
+            raise TypeError('must specify at least one unit')
 
+        major = self.cli_major_version
         params_file = None
         if params is not None:
             with tempfile.NamedTemporaryFile(
                 'w+', delete=False, dir=self._temp_dir
             ) as params_file:
                 _yaml.safe_dump(params, params_file)
-            args.extend(['--params', params_file.name])
 
+        args = _commands.run_multiple_args(
+            major, units, action, params_file=None if params_file is None else params_file.name
+        )
         try:
             try:
                 stdout, stderr = self._cli(*args)
             except jubilant.CLIError as exc:
-                if 'timed out' in exc.stderr or 'timeout reached' in exc.stderr:
-                    msg = f'timed out waiting for action, stderr:\n{exc.stderr}'
-                    raise TimeoutError(msg) from None
-                # The "juju run" CLI command fails if the action has an uncaught exception.
-                if 'task failed' not in exc.stderr:
-                    raise
-                stdout = exc.stdout
-                stderr = exc.stderr
-
-            # Command doesn't return any stdout if no units exist.
-            all_tasks: dict[str, Any] = json.loads(stdout) if stdout.strip() else {}
-            full_unit_name = f'unit-{unit.replace("/", "-")}'
-            if full_unit_name not in all_tasks:
-                raise ValueError(
-                    f'action {action!r} not defined or unit {unit!r} not found, stderr:\n{stderr}'
-                )
-            task = Task._from_dict(all_tasks[full_unit_name])
-            task.raise_on_failure()
-            return task
+                if 'not found' in exc.stderr or 'not defined' in exc.stderr:
+                    msg = f'action {action!r} not defined or unit not found, stderr:\n{exc.stderr}'
+                    raise ValueError(msg) from None
+                raise
         finally:
             if params_file is not None:
                 os.remove(params_file.name)
+        operation = _commands.queued_operation(stdout, stderr)
+
+        start = time.monotonic()
+        while True:
+            stdout, _ = self._cli('show-operation', operation, '--format', 'json', log=False)
+            tasks = _commands.operation_tasks(major, stdout)
+            if tasks and all(task is not None for task in tasks.values()):
+                break
+            if wait is not None and time.monotonic() - start > wait:
+                pending = sorted(unit for unit, task in tasks.items() if task is None)
+                raise TimeoutError(f'timed out waiting for action {action!r} on {pending}')
+            time.sleep(delay)
+
+        done = {unit: task for unit, task in tasks.items() if task is not None}
+        missing = [u for u in units if u not in done and not u.endswith('/leader')]
+        if missing:
+            raise ValueError(f'units {missing} not found in operation {operation}')
+        if not all(task.success for task in done.values()):
+            raise MultiTaskError(done)
+        return done
+
+    def status(  # type: ignore
+        self, *, apps: str | Iterable[str] | None = None
+    ) -> Status | jubilant.Status:
+        """Fetch the status of the current model, including its applications and units.
+
+        Args:
+            apps: If provided, only fetch the status of these applications, filtered by the
+                Juju controller. Each item may also be a unit or machine, or a pattern, such
+                as ``mysql/0`` or ``mysql*``; see ``juju status --help`` for details. Machines
+                and subordinates related to the selected applications are also included.
+        """
+        if apps is None:
+            broker = _broker.get(self._broker_key())
+            if broker is not None:
+                return broker.status()
+        stdout = self.cli(*status_args(apps))
+        return _parse_status(loads_sections(stdout))
+
+    def status_broker(self, *, interval: float = 1.0, shared: bool = False) -> StatusBroker:
+        """Return the status broker for this model, starting it if it isn't running.
+
+        While the broker is running, a background thread fetches the model's status every
+        *interval* seconds, and :meth:`status` and :meth:`wait` calls without *apps*, from
+        this or any other :class:`Juju` instance for the same model and CLI binary, share its
+        ``juju status`` calls: concurrent calls wait for the fetch in flight instead of each
+        running ``juju status``. Subscribe to the broker to have each new status pushed to a
+        callback. Close the broker (or use it as a context manager) to stop it.
+
+        With *shared* true, processes on the same machine also share the status: for example,
+        pytest-xdist workers testing one model. One process runs ``juju status`` and publishes
+        its output to a file in a directory for the model under the temporary directory (named
+        after the controller and model UUIDs, from the Juju client's files), and the others
+        read it from there, without running ``juju``. If the polling process exits, another
+        takes over.
+
+        Args:
+            interval: Seconds between fetches by the background thread. Only used when the
+                broker is started.
+            shared: Whether to share the status with other processes. Only used when the
+                broker is started.
+        """
 
-    def status(self) -> Status | jubilant.Status:  # type: ignore
-        """Fetch the status of the current model, including its applications and units."""
-        stdout = self.cli('status', '--format', 'json')
-        result = json.loads(stdout)
-        # The status we get back depends on the Juju controller version, not the
-        # CLI version.
-        if result['model']['version'].startswith('2'):
-            return Status._from_dict(result)
-        return jubilant.Status._from_dict(result)
+        def create() -> StatusBroker:
+            def fetch() -> str:
+                return self._cli(*status_args(None), log=False)[0]
+
+            on_close = None
+            if shared:
+                digest = hashlib.sha256(repr(self._shared_status_key()).encode()).hexdigest()
+                digest = digest[:16]
+                path = os.path.join(self._temp_dir, f'jubilant-status-{digest}')
+                shared_file = SharedStatusFile(path, fetch, takeover_after=interval)
+                fetch = shared_file.fetch
+                on_close = shared_file.close
+            return StatusBroker(
+                fetch,
+                lambda stdout, previous: _parse_status(loads_sections(stdout), previous=previous),
+                interval=interval,
+                on_close=on_close,
+            )
+
+        return _broker.get_or_start(self._broker_key(), create)
+
+    def supports(self, command: str, flag: str | None = None) -> bool:
+        """Report whether the Juju CLI has *command*, and *flag* for that command if given.
+
+        The first time a binary is asked about, this runs ``juju help commands`` (and
+        ``juju <command> --help`` for a flag); the answers are remembered on disk, keyed by
+        the binary, so later instances don't run them again.
+
+        Example::
+
+            if juju.supports('deploy', '--overlay'):
+                ...
+
+        Args:
+            command: Name of the command, for example ``wait-for``.
+            flag: Name of a flag for the command, including the dashes, for example
+                ``--application``.
+        """
+        commands: list[str] | None = self._cli_info.get('commands')
+        if commands is None:
+            stdout, _ = self._cli('help', 'commands', include_model=False, log=False)
+            commands = _commands.help_commands(stdout)
+            self._update_cli_info(commands=commands)
+        if command not in commands:
+            return False
+        if flag is None:
+            return True
+
+        flags: dict[str, list[str]] = self._cli_info.get('flags', {})
+        if command not in flags:
+            stdout, _ = self._cli(command, '--help', include_model=False, log=False)
+            flags = {**flags, command: _commands.help_flags(stdout)}
+            self._update_cli_info(flags=flags)
+        return flag in flags[command]
 
     def wait(  # type: ignore
         self,
@@ -516,6 +838,12 @@ class Juju29(jubilant.Juju):
         delay: float = 1.0,
         timeout: float | None = None,
         successes: int = 3,
+        apps: str | Iterable[str] | None = None,
+        server_side: bool = False,
+        activity_delay: float | None = None,
+        schedule: Schedule | None = None,
+        stable_for: float | None = None,
+        pipeline: bool = False,
     ) -> Status | jubilant.Status:
         """Wait until ``ready(status)`` returns true.
 
@@ -544,11 +872,49 @@ class Juju29(jubilant.Juju):
                 should be considered ready. It needs to return true *successes* times in a row
                 before ``wait`` returns.
             error: Callable that takes a :class:`Status` object and returns true when ``wait``
-                should raise an error (:class:`WaitError`).
+                should raise an error (:class:`WaitError`). If *ready* and *error* are
+                :class:`Predicate` objects that share parts, each shared part is evaluated once
+                per status.
             delay: Delay in seconds between status calls.
             timeout: Overall timeout; :class:`TimeoutError` is raised if this is reached.
                 If not specified, uses the *wait_timeout* specified when the instance was created.
             successes: Number of times *ready* must return true for the wait to succeed.
+            apps: If provided, only fetch the status of these applications (or units, machines,
+                or patterns), as for :meth:`status`. The *ready* and *error* callables only see
+                the filtered status, so for example :func:`all_active` with no arguments checks
+                just these applications. This reduces the load on the controller and the size
+                of the status output for large models.
+            server_side: If true, and *ready* is one of the ``all_*`` helpers (or a
+                :class:`Predicate` combining them with ``&`` and ``|``), wait between status
+                calls with ``juju wait-for``, which returns as soon as the controller sees the
+                equivalent query become true, rather than sleeping for *delay*. Once a
+                ``wait-for`` has returned, a single status for which *ready* returns true is
+                enough, rather than *successes* in a row. If *error* is provided, each
+                ``wait-for`` is limited to ``10 * delay`` seconds so that errors are still
+                noticed. For other *ready* callables, or if ``wait-for`` fails, this polls
+                as usual.
+            schedule: If provided, decides the delay between status calls, instead of the
+                fixed *delay*; for example, :class:`BackoffSchedule` or
+                :class:`AdaptiveSchedule`. The time each status call took is subtracted from
+                the delay, and ``wait`` never sleeps past the timeout.
+            activity_delay: If provided, follow ``juju debug-log`` during the wait, and fetch
+                the status *activity_delay* seconds after a hook starts or finishes or a
+                charm sets its status, rather than waiting for *delay*. If there's no activity,
+                the status is still fetched every *delay* seconds, so with this set, *delay*
+                can be much longer (for example, ``delay=10, activity_delay=0.1``), which gives
+                quicker updates with fewer status calls.
+            stable_for: If provided, return as soon as *ready* returns true for a status in
+                which all unit agents are idle and no app status, or unit workload or agent
+                status, has changed for at least this many seconds, according to the ``since``
+                times in the status and the controller's timestamp. This proves the model has
+                settled without waiting for *successes* polls in a row, so a wait on a model
+                that's already settled takes a single status call. If the model hasn't been
+                stable for long enough, *successes* still applies.
+            pipeline: If true, start each status call in a background thread as soon as the
+                previous one has returned (at the time the schedule says), so that parsing,
+                diffing, and checking a status overlaps with fetching the next one. On a busy
+                controller, where ``juju status`` takes seconds, this keeps the poll period
+                close to *delay*. Can't be combined with *server_side* or *activity_delay*.
 
         Raises:
             TimeoutError: If the *timeout* is reached. A string representation
@@ -556,7 +922,16 @@ class Juju29(jubilant.Juju):
             WaitError: If the *error* callable returns True. A string representation
                 of the last status is added as an exception note.
         """
-        if self.cli_major_version >= 3:
+        if (
+            self.cli_major_version >= 3
+            and apps is None
+            and not server_side
+            and activity_delay is None
+            and schedule is None
+            and stable_for is None
+            and not pipeline
+            and _broker.get(self._broker_key()) is None
+        ):
             return super().wait(
                 ready,  # type: ignore
                 error=error,  # type: ignore
@@ -564,54 +939,403 @@ class Juju29(jubilant.Juju):
                 timeout=timeout,
                 successes=successes,
             )
+        if pipeline and (server_side or activity_delay is not None):
+            raise TypeError("pipeline can't be combined with server_side or activity_delay")
         if timeout is None:
             timeout = self.wait_timeout
 
-        status = None
-        success_count = 0
+        if schedule is None:
+            schedule = FixedSchedule(delay)
+        polls = _WaitPolls(
+            ready, error, schedule=schedule, successes=successes, stable_for=stable_for
+        )
+        start = time.monotonic()
+        query = _wait_for_query(ready) if server_side else None
+        waited_for = False
+        stats = PollStats()
+
+        with contextlib.ExitStack() as stack:
+            activity = stack.enter_context(self._log_activity(activity_delay))
+            prefetch = stack.enter_context(self._prefetch_status(pipeline, apps))
+            stack.callback(lambda: logger_wait.debug('wait: %s, %r', stats.summary(), schedule))
+            while time.monotonic() - start < timeout:
+                if activity is not None:
+                    activity.clear()
+                if prefetch is None:
+                    poll_start = time.monotonic()
+                    stdout, parsed = self._fetch_status(apps)
+                else:
+                    poll_start, (stdout, parsed) = prefetch.result()
+                stats.record(poll_start, time.monotonic())
+
+                next_poll = polls.update(stdout, poll_start, parsed)
+                deadline = start + timeout
+                if prefetch is not None and next_poll < deadline:
+                    # Fetch the next status while this one is diffed and checked.
+                    prefetch.start(next_poll)
+                status = polls.check(waited_for=bool(waited_for))
+                if status is not None:
+                    return status
+
+                if query is not None and not polls.success_count and not waited_for:
+                    remaining = deadline - time.monotonic()
+                    if error is not None:
+                        remaining = min(remaining, 10 * delay)
+                    assert polls.status is not None
+                    waited_for = self._wait_for(query, polls.status.model.name, remaining)
+                    if waited_for is None:
+                        logger_wait.info('wait: wait-for failed, falling back to polling')
+                        query = None
+                    else:
+                        continue
+                # If a wait-for returned but ready is still false, sleep before the next one.
+                waited_for = False
+
+                if prefetch is not None and prefetch.pending:
+                    continue
+                # Count the time the status call took, and don't wait past the timeout.
+                pause = min(next_poll, deadline) - time.monotonic()
+                if pause <= 0:
+                    continue
+                if activity is None:
+                    time.sleep(pause)
+                else:
+                    activity.wait(pause)
+
+        raise polls.timeout_error(timeout)
+
+    def _cli(
+        self, *args: str, include_model: bool = True, stdin: str | None = None, log: bool = True
+    ) -> tuple[str, str]:
+        """Run a Juju CLI command with the transport and return its standard output and error.
+
+        Every command goes through here, so this is where commands that may change the model,
+        such as ``exec`` and ``run``, invalidate the cache entries they affect.
+        """
+        model = self.model if include_model else None
+        cli_args = args if model is None else (args[0], '--model', model, *args[1:])
+        if log:
+            logger.info('cli: juju %s', shlex.join(cli_args))
+        try:
+            return self.transport.run(self, cli_args, stdin=stdin)
+        finally:
+            if self.cache is not None and _cache.is_mutating(args):
+                self.cache._invalidate(str(self.cli_binary), model, args)
+
+    @functools.cached_property
+    def _cli_info(self) -> dict[str, Any]:
+        """Facts about the CLI binary remembered from previous runs."""
+        return _cli_info.load(self._cli_info_key)
+
+    @functools.cached_property
+    def _cli_info_key(self) -> str | None:
+        return _cli_info.binary_key(self.cli_binary)
+
+    def _update_cli_info(self, **facts: Any) -> None:
+        """Remember *facts* about the CLI binary, in this instance and on disk."""
+        self._cli_info.update(facts)
+        _cli_info.update(self._cli_info_key, **facts)
+
+    def _broker_key(self) -> tuple[str, str | None]:
+        """Return the key that identifies this model's status broker."""
+        return str(self.cli_binary), self.model
+
+    def _shared_status_key(self) -> tuple[str | None, ...]:
+        """Return the key that identifies this model across processes.
+
+        That's the controller and model UUIDs from the Juju client's files, so the current
+        model, or models with the same name on different controllers, aren't confused. If the
+        model can't be found there, it's the client data directory, CLI binary, and model name.
+        """
+        juju_data = _api.juju_data_dir()
+        try:
+            return _api.model_uuids(juju_data, self.model)
+        except (LookupError, OSError, ValueError):
+            return str(juju_data.absolute()), str(self.cli_binary), self.model
+
+    def _fetch_status(
+        self, apps: str | Iterable[str] | None
+    ) -> tuple[str, Status | jubilant.Status | None]:
+        """Return the status output, through the model's status broker if it's running.
+
+        With a broker, this also returns the status the broker parsed, so that it isn't parsed
+        again; otherwise the status is None.
+        """
+        broker = _broker.get(self._broker_key()) if apps is None else None
+        if broker is not None:
+            return broker.fetch_and_parse()
+        stdout, _ = self._cli(*status_args(apps), log=False)
+        return stdout, None
+
+    @contextlib.contextmanager
+    def _log_activity(self, settle: float | None) -> Generator[LogActivity | None]:
+        """Follow the model's debug log for the duration of the context, if *settle* is set."""
+        if settle is None:
+            yield None
+            return
+        args = [self.cli_binary, 'debug-log']
+        if self.model is not None:
+            args.extend(['--model', self.model])
+        # Without --lines 0, the replayed backlog would look like fresh activity.
+        args.extend(['--tail', '--lines', '0'])
+        activity = LogActivity(args, settle=settle)
+        try:
+            yield activity
+        finally:
+            activity.close()
+
+    @contextlib.contextmanager
+    def _prefetch_status(
+        self, pipeline: bool, apps: str | Iterable[str] | None
+    ) -> Generator[StatusPrefetcher[tuple[str, Status | jubilant.Status | None]] | None]:
+        """Fetch statuses in the background for the duration of the context, if *pipeline*."""
+        if not pipeline:
+            yield None
+            return
+        # Fetch like an unpipelined poll, so a status broker or shared file is used the same way.
+        prefetch = StatusPrefetcher(lambda: self._fetch_status(apps))
+        try:
+            yield prefetch
+        finally:
+            prefetch.close()
+
+    def _wait_for(self, query: str, model: str, timeout: float) -> bool | None:
+        """Run ``juju wait-for model`` until *query* is true or *timeout* seconds have passed.
+
+        Returns True if the query became true, False if it timed out, or None if the command
+        failed for another reason (for example, a Juju version that can't handle the query).
+        """
+        timeout = math.ceil(timeout)
         start = time.monotonic()
+        try:
+            self._cli(
+                'wait-for',
+                'model',
+                self.model or model,
+                '--query',
+                query,
+                '--timeout',
+                f'{timeout}s',
+                include_model=False,
+                log=False,
+            )
+        except jubilant.CLIError as e:
+            if time.monotonic() - start >= timeout:
+                return False
+            logger_wait.debug('wait: wait-for failed: %s', e.stderr)
+            return None
+        return True
 
-        while time.monotonic() - start < timeout:
-            prev_status = status
 
-            stdout, _ = self._cli('status', '--format', 'json', log=False)
-            result = json.loads(stdout)
-            status = Status._from_dict(result)
+class _WaitPolls:
+    """What ``wait`` decides on each poll, shared by :class:`Juju` and :class:`AsyncJuju`.
 
-            if status != prev_status:
-                diff = _status_diff(prev_status, status)
-                if diff:
-                    logger_wait.info('wait: status changed:\n%s', diff)
+    The callers fetch the status and sleep (each in their own way); this parses each status
+    output, logs what changed, and checks it with the *ready* and *error* callables, counting
+    the successes in a row.
+    """
 
-            if error is not None and error(status):
-                raise jubilant.WaitError(
-                    f'error function {error.__qualname__} returned true\n{status}'
-                )
+    def __init__(
+        self,
+        ready: Callable[[Status], bool],
+        error: Callable[[Status], bool] | None,
+        *,
+        schedule: Schedule,
+        successes: int,
+        stable_for: float | None,
+    ):
+        self._ready = ready
+        self._error = error
+        self._schedule = schedule
+        self._successes = successes
+        self._stable_for = stable_for
+        self.status: Status | jubilant.Status | None = None
+        self.success_count = 0
+        self._stdout = ''
+        self._prev_status: Status | jubilant.Status | None = None
+        self._prev_raw = ''
+        self._unchanged = False
+        self._changed = False
+        self._is_ready = False
+        schedule.reset()
+
+    def update(
+        self, stdout: str, poll_start: float, parsed: Status | jubilant.Status | None = None
+    ) -> float:
+        """Take the status output of a poll that started at *poll_start*.
+
+        If *parsed* is given, it's the status already parsed from the output (by a status
+        broker), and is used instead of parsing it again. It's not used with *stable_for*,
+        because the broker's status may have older ``since`` times than the output.
 
-            if ready(status):
-                success_count += 1
-                if success_count >= successes:
-                    return status
-            else:
-                success_count = 0
+        Returns:
+            The time of the next poll, from the schedule.
+        """
+        self._prev_status = self.status
+        self._stdout = stdout
+        # If only the timestamps have changed, skip decoding, diffing, and checking the
+        # status, and reuse the last one and the result of checking it.
+        raw = fingerprint(stdout, since=self._stable_for is None)
+        self._unchanged = self.status is not None and raw == self._prev_raw
+        self._prev_raw = raw
+        if not self._unchanged:
+            if parsed is None or self._stable_for is not None:
+                parsed = _parse_status(loads_sections(stdout), previous=self._prev_status)
+            self.status = parsed
+        self._changed = not self._unchanged and self.status != self._prev_status
+        return poll_start + self._schedule.next_delay(changed=self._changed)
+
+    def check(self, *, waited_for: bool = False) -> Status | jubilant.Status | None:
+        """Check the latest status, and return it if the wait is over, or None if it isn't.
 
-            time.sleep(delay)
+        Args:
+            waited_for: Whether a ``juju wait-for`` returned before this poll, in which case
+                one ready status is enough.
+
+        Raises:
+            WaitError: if the *error* callable returns true.
+        """
+        status = self.status
+        assert status is not None
+        if self._changed:
+            diff = _status_diff(self._prev_status, status)
+            if diff:
+                logger_wait.info('wait: status changed:\n%s', diff)
+
+        if not self._unchanged:
+            if self._error is not None and self._error(status):  # type: ignore
+                raise jubilant.WaitError(
+                    f'error function {self._error.__qualname__} returned true\n{status}'
+                )
+            self._is_ready = self._ready(status)  # type: ignore
+
+        if not self._is_ready:
+            self.success_count = 0
+            return None
+        self.success_count += 1
+        if self.success_count >= self._successes or waited_for:
+            return status
+        if self._stable_for is not None:
+            timestamp = controller_timestamp(self._stdout) if self._unchanged else None
+            settled = _settled_for(status, timestamp)
+            if settled is not None and settled >= self._stable_for:
+                return status
+        return None
+
+    def timeout_error(self, timeout: float) -> TimeoutError:
+        """Return the error to raise when the wait times out, with the last status, if any."""
+        if self.status is None:
+            return TimeoutError(f'wait timed out after {timeout}s')
+        return TimeoutError(f'wait timed out after {timeout}s\n{self.status}')
+
+
+def _parse_status(
+    result: Mapping[str, Any], *, previous: Status | jubilant.Status | None = None
+) -> Status | jubilant.Status:
+    """Parse the decoded status JSON with the status types for the controller's Juju version.
+
+    The status we get back depends on the Juju controller version, not the CLI version.
+    """
+    if result['model']['version'].startswith('2'):
+        return Status._from_dict(
+            result, lazy=True, previous=previous if isinstance(previous, Status) else None
+        )
+    return jubilant.Status._from_dict(dict(result))
 
-        if status is None:
-            raise TimeoutError(f'wait timed out after {timeout}s')
-        raise TimeoutError(f'wait timed out after {timeout}s\n{status}')
 
+def _settled_for(status: Status | jubilant.Status, timestamp: str | None = None) -> float | None:
+    """Return how many seconds the app and unit statuses have been unchanged, if known.
 
-def _status_diff(old: Status | None, new: Status) -> str:
+    This is the time from the latest ``since`` of the app statuses and the unit workload and
+    agent statuses to the controller's timestamp (or *timestamp*, if given). Return None if
+    any unit agent isn't idle, or if the times can't be parsed.
+    """
+    since: list[str] = []
+    for app, app_info in status.apps.items():
+        since.append(app_info.app_status.since)
+        for unit in status.get_units(app).values():
+            if unit.juju_status.current != 'idle':
+                return None
+            since.append(unit.workload_status.since)
+            since.append(unit.juju_status.since)
+    now = _controller_now(timestamp or status.controller.timestamp)
+    if not since or now is None:
+        return None
+    try:
+        latest = max(_parse_since(s) for s in since)
+        return (now - latest).total_seconds()
+    except (ValueError, TypeError):  # TypeError if a time has no UTC offset
+        return None
+
+
+def _parse_since(since: str) -> datetime.datetime:
+    """Parse a status ``since`` time, like '15 Jul 2025 21:18:37+12:00' or '...Z'."""
+    since = since.strip()
+    if since.endswith('Z'):
+        since = since[:-1] + '+00:00'
+    try:
+        return datetime.datetime.strptime(since, '%d %b %Y %H:%M:%S%z')
+    except ValueError:
+        # "juju status --utc" and newer controllers may use ISO 8601.
+        return datetime.datetime.fromisoformat(since)
+
+
+def _controller_now(timestamp: str) -> datetime.datetime | None:
+    """Return the controller's current time, from the status's ``controller.timestamp``.
+
+    The timestamp is just a time of day (like '21:24:58+12:00'), so take the date from the
+    local clock, picking the day that puts the result closest to the local time. This way the
+    result only depends on the controller's clock (as the ``since`` times do) unless the two
+    clocks are out by more than 12 hours.
+    """
+    timestamp = timestamp.strip()
+    if timestamp.endswith('Z'):
+        timestamp = timestamp[:-1] + '+00:00'
+    try:
+        time_of_day = datetime.datetime.strptime(timestamp, '%H:%M:%S%z')
+    except ValueError:
+        return None
+    tz = time_of_day.tzinfo
+    local = datetime.datetime.now(tz)
+    now = datetime.datetime.combine(local.date(), time_of_day.timetz())
+    half_day = datetime.timedelta(hours=12)
+    if now - local > half_day:
+        now -= datetime.timedelta(days=1)
+    elif local - now > half_day:
+        now += datetime.timedelta(days=1)
+    return now
+
+
+def _status_diff(old: Status | jubilant.Status | None, new: Status | jubilant.Status) -> str:
     """Return a line-based diff of two status objects."""
     if old is None:
         old_lines = []
     else:
-        old_lines = [line for line in _pretty.gron(old) if _status_line_ok(line)]
-    new_lines = [line for line in _pretty.gron(new) if _status_line_ok(line)]
+        old_lines = [line for line in _gron_changed(old, new) if _status_line_ok(line)]
+    new_lines = [line for line in _gron_changed(new, old) if _status_line_ok(line)]
     return '\n'.join(_pretty.diff(old_lines, new_lines))
 
 
+def _gron_changed(
+    status: Status | jubilant.Status, other: Status | jubilant.Status | None
+) -> Generator[str]:
+    """Yield gron-style lines for *status*, skipping apps and machines unchanged from *other*.
+
+    Apps and machines whose content fingerprints match are skipped without descending into
+    them, as they would only add identical lines to both sides of the diff.
+    """
+    for field in dataclasses.fields(status):
+        value = getattr(status, field.name)
+        if other is None or field.name not in ('apps', 'machines'):
+            yield from _pretty.gron(value, f'.{field.name}')
+            continue
+        other_value = getattr(other, field.name)
+        for k, v in sorted(value.items()):
+            if _same_content(v, other_value.get(k)):
+                continue
+            yield from _pretty.gron(v, f'.{field.name}[{k!r}]')
+
+
 def _status_line_ok(line: str) -> bool:
     """Return whether the status line should be included in the diff."""
     # Exclude controller timestamp as it changes every update and is just noise.
@@ -623,21 +1347,3 @@ def _status_line_ok(line: str) -> bool:
     if field.endswith('.since'):
         return False
     return True
-
-
-def _base_to_series(base: str) -> str:
-    """Convert a base to a series name."""
-    name, cycle = base.split('@', 1)
-    if name != 'ubuntu':
-        raise ValueError(f'base must be an Ubuntu base, not {name!r}')
-    return {
-        '14.04': 'trusty',
-        '16.04': 'xenial',
-        '18.04': 'bionic',
-        '20.04': 'focal',
-        '22.04': 'jammy',
-        '24.04': 'noble',
-        '24.10': 'oracular',
-        '25.04': 'plucky',
-        '25.10': 'questing',
-    }[cycle]
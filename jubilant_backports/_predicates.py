@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Union
+
+import jubilant
+
+from ._all_any import (
+    all_active,
+    all_agents_idle,
+    all_blocked,
+    all_error,
+    all_maintenance,
+    all_waiting,
+)
+from .statustypes import Status
+
+_AnyStatus = Union[Status, jubilant.Status]
+
+
+class Predicate:
+    """A status predicate that can be combined with ``&`` (and), ``|`` (or), and ``~`` (not).
+
+    Wrap an ``all_*`` or ``any_*`` helper, with the apps to pass to it, or any other callable
+    that takes a status and returns a bool. The combined predicate is a callable that can be
+    passed to :meth:`Juju.wait <jubilant_backports.Juju.wait>` as *ready* or *error*.
+
+    Example::
+
+        ready = Predicate(jubilant.all_active, 'blog', 'mysql') & ~Predicate(
+            jubilant.any_blocked, 'nginx'
+        )
+        juju.wait(ready, error=Predicate(jubilant.any_error))
+
+    Each predicate remembers its result for the last status it was called with, so a
+    predicate that appears more than once (for example, in both *ready* and *error*) is only
+    evaluated once per status. On a Juju 2.9 status, the ``all_*`` and ``any_*`` helpers share
+    per-app summaries of the status, so however many are combined, each app's units are
+    walked at most once per kind of status (workload or agent).
+    """
+
+    def __init__(self, func: Callable[..., bool], *apps: str):
+        self._func = func
+        self._apps = apps
+        self._last: tuple[_AnyStatus, bool] | None = None
+        # Juju.wait uses the error callable's __qualname__ in the WaitError message.
+        self.__qualname__ = repr(self)
+
+    def __call__(self, status: _AnyStatus) -> bool:
+        """Report whether the predicate is true for *status*."""
+        last = self._last
+        if last is not None and last[0] is status:
+            return last[1]
+        result = self._evaluate(status)
+        self._last = (status, result)
+        return result
+
+    def _evaluate(self, status: _AnyStatus) -> bool:
+        return self._func(status, *self._apps)
+
+    def __and__(self, other: Callable[[Any], bool]) -> Predicate:
+        return _And(self, _wrap(other))
+
+    def __rand__(self, other: Callable[[Any], bool]) -> Predicate:
+        return _And(_wrap(other), self)
+
+    def __or__(self, other: Callable[[Any], bool]) -> Predicate:
+        return _Or(self, _wrap(other))
+
+    def __ror__(self, other: Callable[[Any], bool]) -> Predicate:
+        return _Or(_wrap(other), self)
+
+    def __invert__(self) -> Predicate:
+        return _Not(self)
+
+    def __repr__(self) -> str:
+        name = getattr(self._func, '__name__', repr(self._func))
+        return f'{name}({", ".join(repr(app) for app in self._apps)})'
+
+
+class _Combined(Predicate):
+    def __init__(self, *operands: Predicate):
+        self._operands = operands
+        self._last = None
+        self.__qualname__ = repr(self)
+
+
+class _And(_Combined):
+    def _evaluate(self, status: _AnyStatus) -> bool:
+        left, right = self._operands
+        return left(status) and right(status)
+
+    def __repr__(self) -> str:
+        left, right = self._operands
+        return f'({left!r} & {right!r})'
+
+
+class _Or(_Combined):
+    def _evaluate(self, status: _AnyStatus) -> bool:
+        left, right = self._operands
+        return left(status) or right(status)
+
+    def __repr__(self) -> str:
+        left, right = self._operands
+        return f'({left!r} | {right!r})'
+
+
+class _Not(_Combined):
+    def _evaluate(self, status: _AnyStatus) -> bool:
+        return not self._operands[0](status)
+
+    def __repr__(self) -> str:
+        return f'~{self._operands[0]!r}'
+
+
+def _wrap(func: Callable[[Any], bool]) -> Predicate:
+    return func if isinstance(func, Predicate) else Predicate(func)
+
+
+# The "all_*" helpers, the unit field each one checks, and the status it checks for.
+_ALL_HELPERS: dict[Callable[..., bool], tuple[str, str]] = {
+    all_active: ('workload-status', 'active'),
+    all_blocked: ('workload-status', 'blocked'),
+    all_error: ('workload-status', 'error'),
+    all_maintenance: ('workload-status', 'maintenance'),
+    all_waiting: ('workload-status', 'waiting'),
+    all_agents_idle: ('agent-status', 'idle'),
+}
+
+
+def _wait_for_query(predicate: Callable[..., bool]) -> str | None:
+    """Translate *predicate* to a ``juju wait-for model --query`` expression, if possible.
+
+    Only the ``all_*`` helpers (called directly or wrapped in a :class:`Predicate`), and ``&``
+    and ``|`` combinations of them, can be translated; this returns None for anything else.
+    The query is only a hint for when to check again: ``wait`` always confirms the result with
+    the predicate itself, so a query that's satisfied too early only costs an extra poll.
+    """
+    if isinstance(predicate, (_And, _Or)):
+        left, right = (_wait_for_query(operand) for operand in predicate._operands)
+        if left is None or right is None:
+            return None
+        op = '&&' if isinstance(predicate, _And) else '||'
+        return f'({left}) {op} ({right})'
+    if isinstance(predicate, _Combined):
+        return None
+    func, apps = (
+        (predicate._func, predicate._apps)
+        if isinstance(predicate, Predicate)
+        else (
+            predicate,
+            (),
+        )
+    )
+    if func not in _ALL_HELPERS:
+        return None
+    field, state = _ALL_HELPERS[func]
+    units = _for_each('units', 'unit', 'application', apps, f'{field} == "{state}"')
+    if field == 'agent-status':
+        return units
+    apps_query = _for_each('applications', 'app', 'name', apps, f'status == "{state}"')
+    return f'{apps_query} && {units}'
+
+
+def _for_each(collection: str, var: str, name_field: str, apps: tuple[str, ...], cond: str) -> str:
+    """Return a query that *cond* holds for each item in *collection* that's one of *apps*."""
+    if not apps:
+        return f'forEach({collection}, {var} => {var}.{cond})'
+    others = ' && '.join(f'{var}.{name_field} != "{app}"' for app in apps)
+    return f'forEach({collection}, {var} => ({others}) || {var}.{cond})'
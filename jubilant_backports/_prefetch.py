@@ -0,0 +1,106 @@
+"""Fetch the next status in the background while ``wait`` checks the last one."""
+
+from __future__ import annotations
+
+import concurrent.futures
+import threading
+import time
+from typing import Callable, Generic, TypeVar
+
+_T = TypeVar('_T')
+
+
+class StatusPrefetcher(Generic[_T]):
+    """Run a status fetch in a background thread, at a given time.
+
+    :meth:`start` schedules the next fetch and returns immediately, so that the caller can
+    parse and check the previous status while the fetch waits for its start time and runs.
+    :meth:`result` waits for it. At most one fetch is pending at a time.
+
+    Args:
+        fetch: Function that fetches the status and returns the result.
+    """
+
+    def __init__(self, fetch: Callable[[], _T]):
+        self._fetch = fetch
+        self._stop = threading.Event()
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix='juju-status'
+        )
+        self._future: concurrent.futures.Future[tuple[float, _T] | None] | None = None
+
+    @property
+    def pending(self) -> bool:
+        """Whether a fetch has been started and its result not yet collected."""
+        return self._future is not None
+
+    def start(self, at: float) -> None:
+        """Start a fetch at *at* (a :func:`time.monotonic` time), in the background."""
+        assert self._future is None, 'previous fetch not collected'
+        self._future = self._executor.submit(self._fetch_at, at)
+
+    def result(self) -> tuple[float, _T]:
+        """Wait for the pending fetch, or fetch now if none is pending.
+
+        Return the time the fetch started and the result. If the fetch raised an exception,
+        this raises it.
+        """
+        future, self._future = self._future, None
+        if future is None:
+            fetch_start = time.monotonic()
+            return fetch_start, self._fetch()
+        result = future.result()
+        assert result is not None
+        return result
+
+    def close(self) -> None:
+        """Abandon any pending fetch that hasn't started yet, and stop the thread.
+
+        This doesn't wait for a fetch that's already running, whose result is discarded.
+        """
+        self._stop.set()
+        self._executor.shutdown(wait=False)
+
+    def _fetch_at(self, at: float) -> tuple[float, _T] | None:
+        pause = at - time.monotonic()
+        if pause > 0 and self._stop.wait(pause):
+            return None
+        if self._stop.is_set():
+            return None
+        fetch_start = time.monotonic()
+        return fetch_start, self._fetch()
+
+
+class PollStats:
+    """Timing of the status calls in a ``wait``, to compare the poll period with the delay."""
+
+    def __init__(self):
+        self.calls = 0
+        self.call_time = 0.0
+        self._first_start: float | None = None
+        self._last_start = 0.0
+
+    def record(self, start: float, end: float) -> None:
+        """Record a status call that ran from *start* to *end*."""
+        if self._first_start is None:
+            self._first_start = start
+        self._last_start = start
+        self.calls += 1
+        self.call_time += end - start
+
+    @property
+    def period(self) -> float | None:
+        """The mean time from the start of one status call to the next, if there were two."""
+        if self._first_start is None or self.calls < 2:
+            return None
+        return (self._last_start - self._first_start) / (self.calls - 1)
+
+    def summary(self) -> str:
+        """Describe the number of calls, the mean poll period, and the mean call time."""
+        if not self.calls:
+            return 'no status calls'
+        text = f'{self.calls} status calls, mean call time {self.call_time / self.calls:.2f}s'
+        period = self.period
+        if period is not None:
+            text += f', mean poll period {period:.2f}s'
+        return text
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import abc
+import random
+
+
+class Schedule(abc.ABC):
+    """Decides how long :meth:`Juju.wait <jubilant_backports.Juju.wait>` waits between polls.
+
+    Subclass this and override :meth:`next_delay` (and :meth:`reset`, if the schedule has
+    state) for a custom schedule. ``wait`` subtracts the time the status call took from the
+    delay, and never waits past its timeout.
+    """
+
+    def reset(self) -> None:  # noqa: B027
+        """Reset any state, at the start of each ``wait``."""
+
+    @abc.abstractmethod
+    def next_delay(self, *, changed: bool) -> float:
+        """Return the delay before the next poll, in seconds.
+
+        Args:
+            changed: True if the status from the last poll was different from the one
+                before it (or if it was the first poll).
+        """
+
+
+class FixedSchedule(Schedule):
+    """Wait the same *delay* between every poll (the default, with ``wait``'s *delay*)."""
+
+    def __init__(self, delay: float = 1.0):
+        self.delay = delay
+
+    def next_delay(self, *, changed: bool) -> float:
+        """Return the fixed delay."""
+        return self.delay
+
+    def __repr__(self) -> str:
+        return f'FixedSchedule({self.delay})'
+
+
+class BackoffSchedule(Schedule):
+    """Wait exponentially longer between polls, from *initial* up to *maximum* seconds.
+
+    A change in the status resets the delay to *initial*. Each delay is randomly adjusted by
+    up to *jitter* (a fraction of the delay), so that many waits don't poll in lockstep.
+    """
+
+    def __init__(
+        self,
+        initial: float = 0.5,
+        maximum: float = 10.0,
+        *,
+        factor: float = 2.0,
+        jitter: float = 0.1,
+    ):
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+        self.jitter = jitter
+        self._delay = initial
+
+    def reset(self) -> None:
+        """Start again from the initial delay."""
+        self._delay = self.initial
+
+    def next_delay(self, *, changed: bool) -> float:
+        """Return the next delay, growing it unless the status changed."""
+        if changed:
+            self._delay = self.initial
+        delay = self._delay
+        self._delay = min(self._delay * self.factor, self.maximum)
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)  # noqa: S311
+
+    def __repr__(self) -> str:
+        args = f'{self.initial}, {self.maximum}, factor={self.factor}, jitter={self.jitter}'
+        return f'BackoffSchedule({args})'
+
+
+class AdaptiveSchedule(Schedule):
+    """Poll every *fast* seconds while the status is changing, and every *slow* when it isn't.
+
+    The schedule switches to *slow* once the status hasn't changed for *patience* polls in a
+    row, and back to *fast* as soon as it changes.
+    """
+
+    def __init__(self, fast: float = 0.5, slow: float = 5.0, *, patience: int = 3):
+        self.fast = fast
+        self.slow = slow
+        self.patience = patience
+        self._unchanged = 0
+
+    def reset(self) -> None:
+        """Start again in fast mode."""
+        self._unchanged = 0
+
+    def next_delay(self, *, changed: bool) -> float:
+        """Return *fast* or *slow*, depending on how long the status has been unchanged."""
+        self._unchanged = 0 if changed else self._unchanged + 1
+        return self.slow if self._unchanged >= self.patience else self.fast
+
+    def __repr__(self) -> str:
+        return f'AdaptiveSchedule({self.fast}, {self.slow}, patience={self.patience})'
@@ -0,0 +1,106 @@
+"""Share ``juju status`` output between processes, such as pytest-xdist workers."""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import pathlib
+import time
+from typing import Callable
+
+
+class SharedStatusFile:
+    """Fetch the status in one process, and share it with the others through a file.
+
+    The first process to fetch takes an exclusive lock on ``leader.lock`` in *path*, and
+    becomes the poller: it runs ``juju status`` and publishes each output, with a sequence
+    number, to ``status`` in *path*. Other processes read that file, without running ``juju``;
+    each fetch waits for a snapshot newer than the last one it returned. If no new snapshot
+    appears for *takeover_after* seconds, for example because the poller has exited (which
+    releases its lock), the next process to get the lock becomes the poller.
+
+    Snapshots are written to a temporary file that's renamed over ``status``, so readers
+    always see a complete snapshot without locking.
+
+    Args:
+        path: Directory for the lock and snapshot files, shared by all the processes.
+        fetch: Function that runs ``juju status --format json`` and returns its output.
+        takeover_after: Seconds to wait for a new snapshot before trying to become the poller.
+        poll_interval: Seconds between checks for a new snapshot.
+    """
+
+    def __init__(
+        self,
+        path: str | pathlib.Path,
+        fetch: Callable[[], str],
+        *,
+        takeover_after: float = 10.0,
+        poll_interval: float = 0.05,
+    ):
+        # Imported here rather than at the top, as it's only available on POSIX systems.
+        import fcntl
+
+        self._fcntl = fcntl
+        self.path = pathlib.Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._fetch = fetch
+        self.takeover_after = takeover_after
+        self.poll_interval = poll_interval
+        self._lock_file = open(self.path / 'leader.lock', 'a')  # noqa: SIM115
+        self._leader = False
+        self._seen = 0
+
+    @property
+    def leader(self) -> bool:
+        """Whether this process is the one running ``juju status``."""
+        return self._leader
+
+    def fetch(self) -> str:
+        """Return the next status output, fetching it if this process is the poller."""
+        if not self._leader:
+            self._try_lead()
+        if self._leader:
+            stdout = self._fetch()
+            self._publish(stdout)
+            return stdout
+
+        deadline = time.monotonic() + self.takeover_after
+        while True:
+            snapshot = self._read()
+            if snapshot is not None and snapshot[0] > self._seen:
+                self._seen = snapshot[0]
+                return snapshot[1]
+            if time.monotonic() >= deadline:
+                self._try_lead()
+                if self._leader:
+                    return self.fetch()
+                deadline = time.monotonic() + self.takeover_after
+            time.sleep(self.poll_interval)
+
+    def close(self) -> None:
+        """Give up being the poller, if this process is, and close the lock file."""
+        if self._leader:
+            self._fcntl.flock(self._lock_file, self._fcntl.LOCK_UN)
+            self._leader = False
+        self._lock_file.close()
+
+    def _try_lead(self) -> None:
+        with contextlib.suppress(BlockingIOError):
+            self._fcntl.flock(self._lock_file, self._fcntl.LOCK_EX | self._fcntl.LOCK_NB)
+            self._leader = True
+
+    def _read(self) -> tuple[int, str] | None:
+        try:
+            text = (self.path / 'status').read_text()
+        except FileNotFoundError:
+            return None
+        seq, _, stdout = text.partition('\n')
+        return int(seq), stdout
+
+    def _publish(self, stdout: str) -> None:
+        snapshot = self._read()
+        seq = max(self._seen, 0 if snapshot is None else snapshot[0]) + 1
+        temp = self.path / f'status.{os.getpid()}'
+        temp.write_text(f'{seq}\n{stdout}')
+        os.replace(temp, self.path / 'status')
+        self._seen = seq
@@ -0,0 +1,83 @@
+"""Per-app summaries of the states in a status, for the ``all_*`` and ``any_*`` helpers."""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .statustypes import Status
+
+
+class StatusTable:
+    """Per-app summaries of a status, so predicates on it don't walk the units repeatedly.
+
+    The first time a predicate asks about an app, the app's states are reduced to a bitmask
+    with one bit per distinct state. After that, the ``all_*`` and ``any_*`` helpers, and any
+    combination of them, are an integer operation per app.
+    """
+
+    def __init__(self, status: Status):
+        self._status = status
+        self.codes: dict[str, int] = {}
+        self._codes_lock = threading.Lock()
+        self._workload_masks: dict[str, int] = {}
+        self._agent_masks: dict[str, int] = {}
+
+    def code(self, state: str) -> int:
+        """Return the small int that encodes *state* in this table."""
+        code = self.codes.get(state)
+        if code is None:
+            # The table is shared by the threads sharing the status; each state needs one bit.
+            with self._codes_lock:
+                code = self.codes.setdefault(state, len(self.codes))
+        return code
+
+    def all_statuses_are(self, expected: str, apps: Iterable[str]) -> bool:
+        """Report whether the app and workload statuses of all *apps* are *expected*."""
+        bit = 1 << self.code(expected)
+        return all(self._workload_mask(app) == bit for app in apps or self._status.apps)
+
+    def any_status_is(self, expected: str, apps: Iterable[str]) -> bool:
+        """Report whether the app or workload status of any of *apps* is *expected*."""
+        bit = 1 << self.code(expected)
+        return any((self._workload_mask(app) or 0) & bit for app in apps or self._status.apps)
+
+    def all_agent_statuses_are(self, expected: str, apps: Iterable[str]) -> bool:
+        """Report whether the unit agent statuses of all *apps* are *expected*."""
+        others = ~(1 << self.code(expected))
+        for app in apps or self._status.apps:
+            mask = self._agent_mask(app)
+            if mask is None or mask & others:
+                return False
+        return True
+
+    def _workload_mask(self, app: str) -> int | None:
+        """Return the bitmask of *app*'s status and its units' workload statuses."""
+        mask = self._workload_masks.get(app)
+        if mask is None:
+            app_info = self._status.apps.get(app)
+            if app_info is None:
+                return None
+            units = self._status.get_units(app).values()
+            states = {u.workload_status.current for u in units}
+            states.add(app_info.app_status.current)
+            mask = self._workload_masks[app] = self._mask(states)
+        return mask
+
+    def _agent_mask(self, app: str) -> int | None:
+        """Return the bitmask of *app*'s unit agent statuses."""
+        mask = self._agent_masks.get(app)
+        if mask is None:
+            if app not in self._status.apps:
+                return None
+            units = self._status.get_units(app).values()
+            mask = self._agent_masks[app] = self._mask({u.juju_status.current for u in units})
+        return mask
+
+    def _mask(self, states: set[str]) -> int:
+        mask = 0
+        for state in states:
+            mask |= 1 << self.code(state)
+        return mask
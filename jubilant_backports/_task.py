@@ -3,6 +3,7 @@ from __future__ import annotations
 import dataclasses
 from typing import Any, Literal
 
+import jubilant
 from jubilant import _pretty
 
 
@@ -19,6 +20,26 @@ class TaskError29(Exception):  # noqa: N818
         return f'task error: {self.task}'
 
 
+class MultiTaskError(Exception):
+    """Exception raised when an action run on several units fails on any of them."""
+
+    tasks: dict[str, Task29 | jubilant.Task]
+    """Task for each unit, including those where the action succeeded."""
+
+    def __init__(self, tasks: dict[str, Task29 | jubilant.Task]):
+        self.tasks = tasks
+
+    @property
+    def failed(self) -> dict[str, Task29 | jubilant.Task]:
+        """Task for each unit where the action failed."""
+        return {unit: task for unit, task in self.tasks.items() if not task.success}
+
+    def __str__(self) -> str:
+        failed = self.failed
+        details = '\n'.join(f'{unit}: {task}' for unit, task in failed.items())
+        return f'task error on {len(failed)} of {len(self.tasks)} units:\n{details}'
+
+
 @dataclasses.dataclass(frozen=True)
 class Task29:
     """A task holds the results of Juju running an action command on a single unit."""
@@ -74,7 +95,7 @@ class Task29:
 
     @classmethod
     def _from_dict(cls, d: dict[str, Any]) -> Task29:
-        results: dict[str, Any] = d.get('results') or {}
+        results: dict[str, Any] = dict(d.get('results') or {})
         return_code = results.pop('ReturnCode', 0)
         stdout = results.pop('Stdout', '')
         stderr = results.pop('Stderr', '')
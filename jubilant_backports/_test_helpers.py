@@ -2,8 +2,9 @@ from __future__ import annotations
 
 import contextlib
 import secrets
-from typing import Generator
+from typing import AsyncIterator, Generator
 
+from ._async import AsyncJuju29
 from ._juju import Juju29
 
 
@@ -28,3 +29,26 @@ def temp_model(keep: bool = False, controller: str | None = None) -> Generator[J
     finally:
         if not keep:
             juju.destroy_model(model, destroy_storage=True, force=True)
+
+
+@contextlib.asynccontextmanager
+async def async_temp_model(
+    keep: bool = False, controller: str | None = None
+) -> AsyncIterator[AsyncJuju29]:
+    """Async context manager to create a temporary model for running tests in.
+
+    This is the asyncio counterpart of :func:`temp_model`, and provides an
+    :class:`AsyncJuju` instance to operate on.
+
+    Args:
+        keep: If true, keep the created model around when the context manager exits.
+        controller: Name of controller where the temporary model will be added.
+    """
+    juju = AsyncJuju29()
+    model = 'jubilant-' + secrets.token_hex(4)  # 4 bytes (8 hex digits) should be plenty
+    await juju.add_model(model, controller=controller)
+    try:
+        yield juju
+    finally:
+        if not keep:
+            await juju.destroy_model(model, destroy_storage=True, force=True)
@@ -0,0 +1,427 @@
+"""Transports run the Juju commands for :class:`Juju <jubilant_backports.Juju>`."""
+
+from __future__ import annotations
+
+import abc
+import json
+import logging
+import pathlib
+import subprocess
+import threading
+import time
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Tuple
+
+import jubilant
+from jubilant import _yaml
+
+from . import _api
+from ._commands import host_name
+
+if TYPE_CHECKING:
+    from ._juju import Juju29
+
+logger = logging.getLogger('jubilant')
+
+# Options of the commands the API transport handles (all take a value).
+_OPTIONS = frozenset(
+    ['--application', '--format', '--machine', '--model', '--params', '--unit', '--wait']
+)
+
+# Parsed command: the command name, its options, and its positional arguments.
+_Command = Tuple[str, Dict[str, str], List[str]]
+
+# Seconds a connection may be idle before it's checked with a ping before it's used.
+_PING_AFTER = 10.0
+
+# Seconds to use the fallback for a model after failing to connect to it, before trying again.
+_RETRY_AFTER = 30.0
+
+
+class _UseFallback(Exception):  # noqa: N818
+    """Raised by an API request when the command must be run by the fallback instead."""
+
+
+class Transport(abc.ABC):
+    """Runs Juju CLI commands for :class:`Juju <jubilant_backports.Juju>`.
+
+    Every command a :class:`Juju` instance runs, from :meth:`Juju.cli
+    <jubilant_backports.Juju.cli>` or any other method, goes through its transport. Subclass
+    this and override :meth:`run` to run the commands some other way; the output must be the
+    same as the Juju CLI's.
+    """
+
+    def __enter__(self) -> Transport:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @abc.abstractmethod
+    def run(
+        self, juju: Juju29, args: Sequence[str], *, stdin: str | None = None
+    ) -> tuple[str, str]:
+        """Run the command and return its standard output and standard error.
+
+        Args:
+            juju: The instance running the command.
+            args: Command-line arguments (excluding ``juju``), including ``--model`` if needed.
+            stdin: Standard input to send to the command, if any.
+
+        Raises:
+            CLIError: if the command failed.
+        """
+
+    def close(self) -> None:  # noqa: B027
+        """Release any resources held, such as connections."""
+
+
+class CLITransport(Transport):
+    """Run each command as a ``juju`` process (the default)."""
+
+    def run(
+        self, juju: Juju29, args: Sequence[str], *, stdin: str | None = None
+    ) -> tuple[str, str]:
+        """Run the command with the instance's CLI binary."""
+        try:
+            process = subprocess.run(
+                [juju.cli_binary, *args],
+                check=True,
+                capture_output=True,
+                encoding='utf-8',
+                input=stdin,
+            )
+        except subprocess.CalledProcessError as e:
+            raise jubilant.CLIError(e.returncode, e.cmd, e.stdout, e.stderr) from None
+        return (process.stdout, process.stderr)
+
+    def __repr__(self) -> str:
+        return 'CLITransport()'
+
+
+class APITransport(Transport):
+    """Run the most frequent commands over a persistent connection to the controller's API.
+
+    Running ``juju`` means starting a process that reads the client's configuration, connects
+    to the controller, and logs in, before doing any work. This transport does that once for
+    each model, keeping the connection open, and runs these commands as API calls instead:
+
+    * ``juju status --format json`` without filters, with ``Client.FullStatus``, for models
+      without storage (which ``FullStatus`` doesn't include)
+    * ``juju run --format json <unit> <action>``, with ``Action.EnqueueOperation``
+    * ``juju exec --format json``, with ``Action.Run``
+
+    The output is converted to the same JSON that the CLI outputs. Other commands, and all
+    commands when the connection can't be made (for example, if the user logs in with an
+    external identity provider rather than a password), are run by *fallback*. Actions and
+    ``exec`` go through the API only with a Juju 3 CLI, because Juju 2.9 outputs them in a
+    different form.
+
+    The controller address, model UUID, and credentials are read from the Juju client's
+    files, in *juju_data*.
+
+    Example::
+
+        with jubilant.APITransport() as transport:
+            juju = jubilant.Juju(model='test', transport=transport)
+            juju.wait(jubilant.all_active)
+
+    Args:
+        juju_data: Juju client data directory. Default is ``$JUJU_DATA``, or
+            ``~/.local/share/juju``.
+        fallback: Transport for the commands not run over the API. Default is a
+            :class:`CLITransport`.
+        timeout: Timeout in seconds for connecting and for each API call.
+        tls: Whether to connect with TLS. Only disable this to talk to a local fake API server.
+    """
+
+    api_calls: int
+    """Number of commands run over the API."""
+
+    fallback_calls: int
+    """Number of commands run by the fallback transport."""
+
+    def __init__(
+        self,
+        juju_data: str | pathlib.Path | None = None,
+        *,
+        fallback: Transport | None = None,
+        timeout: float = 60.0,
+        tls: bool = True,
+    ):
+        self.juju_data = pathlib.Path(juju_data) if juju_data is not None else None
+        self.fallback = fallback if fallback is not None else CLITransport()
+        self.timeout = timeout
+        self.tls = tls
+        self.api_calls = 0
+        self.fallback_calls = 0
+        self._lock = threading.Lock()
+        # Connection and controller name for each model connected to.
+        self._connections: dict[str | None, tuple[_api.Connection, str]] = {}
+        # For each model that couldn't be connected to, when to try again (inf for never).
+        self._retry_at: dict[str | None, float] = {}
+
+    def __repr__(self) -> str:
+        return f'APITransport(juju_data={self.juju_data!r}, fallback={self.fallback!r})'
+
+    def run(
+        self, juju: Juju29, args: Sequence[str], *, stdin: str | None = None
+    ) -> tuple[str, str]:
+        """Run the command over the API if it's one this transport handles, else fall back."""
+        command = _parse_args(args) if stdin is None else None
+        request = self._request(juju, command) if command is not None else None
+        model = command[1].get('--model') if command is not None else None
+        connection = self._connection(model, juju.cli_version) if request is not None else None
+        if request is None or connection is None:
+            return self._fall_back(juju, args, stdin)
+
+        try:
+            output = request(*connection)
+        except _UseFallback:
+            return self._fall_back(juju, args, stdin)
+        except _api.APIError as exc:
+            self._count_api_call()
+            raise jubilant.CLIError(1, [juju.cli_binary, *args], '', f'ERROR {exc}\n') from None
+        except OSError as exc:
+            self._count_api_call()
+            self._forget(model, connection[0])
+            msg = f'ERROR connection to controller lost: {exc}\n'
+            raise jubilant.CLIError(1, [juju.cli_binary, *args], '', msg) from None
+        self._count_api_call()
+        return json.dumps(output), ''
+
+    def close(self) -> None:
+        """Close the connections, and the fallback transport."""
+        with self._lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+            self._retry_at.clear()
+        for connection, _ in connections:
+            connection.close()
+        self.fallback.close()
+
+    def _fall_back(self, juju: Juju29, args: Sequence[str], stdin: str | None) -> tuple[str, str]:
+        with self._lock:
+            self.fallback_calls += 1
+        return self.fallback.run(juju, args, stdin=stdin)
+
+    def _count_api_call(self) -> None:
+        with self._lock:
+            self.api_calls += 1
+
+    def _connection(
+        self, model: str | None, cli_version: str
+    ) -> tuple[_api.Connection, str] | None:
+        """Return a working connection to *model*, or None if the fallback must be used.
+
+        Connecting happens outside the lock, so a slow controller doesn't hold up commands for
+        other models. If connecting fails, the fallback is used for that model for a while, or
+        for good if the client's files don't have what's needed to connect.
+        """
+        with self._lock:
+            entry = self._connections.get(model)
+            retry_at = self._retry_at.get(model)
+        if retry_at is not None and time.monotonic() < retry_at:
+            return None
+        if entry is not None:
+            if time.monotonic() - entry[0].last_used < _PING_AFTER:
+                return entry
+            # The controller may have dropped an idle connection; check before using it.
+            try:
+                entry[0].call('Pinger', 'Ping')
+                return entry
+            except (OSError, _api.APIError):
+                self._forget(model, entry[0])
+
+        try:
+            details = _api.client_details(self.juju_data or _api.juju_data_dir(), model)
+            connection = _api.Connection(
+                details['addresses'],
+                details['model_uuid'],
+                details['username'],
+                details['password'],
+                ca_cert=details['ca_cert'],
+                tls=self.tls,
+                client_version=cli_version,
+                timeout=self.timeout,
+            )
+        except (LookupError, OSError, ValueError, _api.APIError) as exc:
+            permanent = isinstance(exc, LookupError) or (
+                isinstance(exc, _api.APIError) and exc.code == 'not supported'
+            )
+            retry_at = float('inf') if permanent else time.monotonic() + _RETRY_AFTER
+            logger.info('api: using the fallback transport for model %r: %s', model, exc)
+            with self._lock:
+                self._retry_at[model] = retry_at
+            return None
+
+        with self._lock:
+            # Another thread may have connected to the model at the same time.
+            existing = self._connections.get(model)
+            if existing is None:
+                entry = self._connections[model] = (connection, details['controller'])
+                self._retry_at.pop(model, None)
+        if existing is not None:
+            connection.close()
+            return existing
+        return entry
+
+    def _forget(self, model: str | None, connection: _api.Connection) -> None:
+        with self._lock:
+            entry = self._connections.get(model)
+            if entry is not None and entry[0] is connection:
+                del self._connections[model]
+        connection.close()
+
+    def _request(
+        self, juju: Juju29, command: _Command
+    ) -> Callable[[_api.Connection, str], Any] | None:
+        """Return a function that runs the command over the API, or None if it can't."""
+        name, options, positional = command
+        if options.get('--format') != 'json':
+            return None
+        if name == 'status' and not positional and options.keys() <= {'--format', '--model'}:
+            return _status
+        if name not in ('exec', 'run') or juju.cli_major_version < 3:
+            return None
+
+        try:
+            wait = _parse_duration(options['--wait']) if '--wait' in options else None
+        except ValueError:
+            return None
+        targeted = options.keys() & {'--application', '--machine', '--unit'}
+        if name == 'run' and len(positional) >= 2 and not targeted:
+            units, action = positional[:-1], positional[-1]
+            params: dict[str, Any] = {}
+            if '--params' in options:
+                try:
+                    with open(options['--params']) as f:
+                        params = _yaml.safe_load(f) or {}
+                except OSError:
+                    return None
+
+            def run_action(connection: _api.Connection, controller: str) -> dict[str, Any]:
+                actions = [
+                    {'receiver': _receiver(unit), 'name': action, 'parameters': params}
+                    for unit in units
+                ]
+                enqueued = connection.call('Action', 'EnqueueOperation', {'actions': actions})
+                return _wait_for_tasks(connection, enqueued, wait)
+
+            return run_action
+
+        if name == 'exec' and positional and targeted and '--params' not in options:
+            targets = {
+                key: options[flag].split(',')
+                for key, flag in [
+                    ('applications', '--application'),
+                    ('machines', '--machine'),
+                    ('units', '--unit'),
+                ]
+                if flag in options
+            }
+            exec_params = {
+                'commands': ' '.join(positional),
+                'timeout': 0 if wait is None else int(wait * 1e9),
+                **targets,
+            }
+
+            def run_exec(connection: _api.Connection, controller: str) -> dict[str, Any]:
+                enqueued = connection.call('Action', 'Run', exec_params)
+                return _wait_for_tasks(connection, enqueued, wait)
+
+            return run_exec
+
+        return None
+
+
+def _status(connection: _api.Connection, controller: str) -> dict[str, Any]:
+    # FullStatus doesn't include storage, so leave models with storage to the CLI rather than
+    # return a status without it.
+    try:
+        storage = connection.call('Storage', 'ListStorageDetails', {'filters': [{}]})
+    except _api.APIError:
+        raise _UseFallback from None
+    storage_results: list[dict[str, Any]] = storage.get('results') or []
+    if any(r.get('result') or r.get('error') for r in storage_results):
+        raise _UseFallback
+    full_status = connection.call('Client', 'FullStatus', {'patterns': []})
+    return _api.status_json(full_status, controller)
+
+
+def _wait_for_tasks(
+    connection: _api.Connection, enqueued: dict[str, Any], wait: float | None
+) -> dict[str, Any]:
+    """Wait for the enqueued tasks to finish, and return them keyed by unit or machine."""
+    tags: list[str] = []
+    enqueued_results: list[dict[str, Any]] = enqueued.get('actions') or []
+    for result in enqueued_results:
+        if result.get('error'):
+            raise _api.APIError(result['error'].get('message') or str(result['error']))
+        tags.append(result['action']['tag'])
+
+    start = time.monotonic()
+    delay = 0.05
+    while True:
+        response = connection.call(
+            'Action', 'Actions', {'entities': [{'tag': tag} for tag in tags]}
+        )
+        results: list[dict[str, Any]] = response.get('results') or []
+        if all(r.get('status') not in ('pending', 'running', 'aborting') for r in results):
+            break
+        if wait is not None and time.monotonic() - start > wait:
+            raise _api.APIError(f'timed out waiting for results from {len(tags)} task(s)')
+        time.sleep(delay)
+        delay = min(delay * 2, 1.0)
+
+    tasks: dict[str, Any] = {}
+    for result in results:
+        if result.get('error'):
+            raise _api.APIError(result['error'].get('message') or str(result['error']))
+        tasks[host_name(result['action']['receiver'])] = _api.task_json(result)
+    return tasks
+
+
+def _parse_args(args: Sequence[str]) -> _Command | None:
+    """Split a command into its name, options, and positional arguments.
+
+    Return None if it has an option the API transport doesn't know about.
+    """
+    options: dict[str, str] = {}
+    positional: list[str] = []
+    i = 1
+    while i < len(args):
+        arg = args[i]
+        if arg == '--':
+            positional.extend(args[i + 1 :])
+            break
+        if arg.startswith('-'):
+            name, eq, value = arg.partition('=')
+            if name not in _OPTIONS:
+                return None
+            if not eq:
+                i += 1
+                if i == len(args):
+                    return None
+                value = args[i]
+            options[name] = value
+        else:
+            positional.append(arg)
+        i += 1
+    return args[0], options, positional
+
+
+def _parse_duration(value: str) -> float:
+    """Parse a duration like the CLI's ``--wait``, for example "30s" or "1.5s"."""
+    units = {'ms': 0.001, 's': 1.0, 'm': 60.0, 'h': 3600.0}
+    for suffix in sorted(units, key=len, reverse=True):
+        if value.endswith(suffix):
+            return float(value[: -len(suffix)]) * units[suffix]
+    return float(value)
+
+
+def _receiver(unit: str) -> str:
+    # The controller resolves "<app>/leader" itself; other units are given by tag.
+    if unit.endswith('/leader'):
+        return unit
+    return f'unit-{unit.replace("/", "-")}'
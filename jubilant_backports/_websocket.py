@@ -0,0 +1,157 @@
+"""A minimal websocket client (RFC 6455), enough to talk to the Juju API."""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import os
+import socket
+import ssl
+import struct
+
+_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+_CONTINUATION = 0x0
+_TEXT = 0x1
+_CLOSE = 0x8
+_PING = 0x9
+_PONG = 0xA
+
+
+class WebSocket:
+    """A client websocket connection that sends and receives text messages.
+
+    Args:
+        host: Host name or IP address to connect to.
+        port: Port to connect to.
+        path: Path to request, for example ``/model/<uuid>/api``.
+        ssl_context: If specified, connect with TLS using this context.
+        server_hostname: Name to check the server's certificate against, if not *host*.
+        timeout: Timeout in seconds for connecting and for each receive.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        path: str,
+        *,
+        ssl_context: ssl.SSLContext | None = None,
+        server_hostname: str | None = None,
+        timeout: float | None = None,
+    ):
+        sock = socket.create_connection((host, port), timeout=timeout)
+        try:
+            if ssl_context is not None:
+                sock = ssl_context.wrap_socket(sock, server_hostname=server_hostname or host)
+            self._sock = sock
+            self._buffer = bytearray()
+            self._handshake(host, port, path)
+        except BaseException:
+            sock.close()
+            raise
+
+    def send(self, text: str) -> None:
+        """Send a text message."""
+        self._send_frame(_TEXT, text.encode())
+
+    def recv(self) -> str:
+        """Receive the next text message, answering any pings on the way.
+
+        Raises:
+            ConnectionError: if the server closed the connection.
+        """
+        message = b''
+        while True:
+            fin, opcode, payload = self._recv_frame()
+            if opcode == _PING:
+                self._send_frame(_PONG, payload)
+            elif opcode == _CLOSE:
+                raise ConnectionError('websocket closed by server')
+            elif opcode in (_TEXT, _CONTINUATION):
+                message += payload
+                if fin:
+                    return message.decode()
+
+    def close(self) -> None:
+        """Close the connection."""
+        try:
+            self._send_frame(_CLOSE, struct.pack('!H', 1000))
+        except OSError:
+            pass
+        finally:
+            self._sock.close()
+
+    def _handshake(self, host: str, port: int, path: str) -> None:
+        key = base64.b64encode(os.urandom(16)).decode()
+        request = (
+            f'GET {path} HTTP/1.1\r\n'
+            f'Host: {host}:{port}\r\n'
+            'Upgrade: websocket\r\n'
+            'Connection: Upgrade\r\n'
+            f'Sec-WebSocket-Key: {key}\r\n'
+            'Sec-WebSocket-Version: 13\r\n'
+            '\r\n'
+        )
+        self._sock.sendall(request.encode())
+
+        while b'\r\n\r\n' not in self._buffer:
+            self._fill()
+        end = self._buffer.index(b'\r\n\r\n')
+        head = self._read(end + 4)[:end]
+        status_line, *header_lines = head.decode('latin-1').split('\r\n')
+        if status_line.split(' ', 2)[1:2] != ['101']:
+            raise ConnectionError(f'websocket handshake failed: {status_line}')
+        headers: dict[str, str] = {}
+        for line in header_lines:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+        digest = hashlib.sha1((key + _GUID).encode()).digest()  # noqa: S324
+        if headers.get('sec-websocket-accept') != base64.b64encode(digest).decode():
+            raise ConnectionError('websocket handshake failed: bad Sec-WebSocket-Accept')
+
+    def _send_frame(self, opcode: int, payload: bytes) -> None:
+        # Frames from a client must be masked.
+        header = bytes([0x80 | opcode])
+        length = len(payload)
+        if length < 126:
+            header += bytes([0x80 | length])
+        elif length < 1 << 16:
+            header += bytes([0x80 | 126]) + struct.pack('!H', length)
+        else:
+            header += bytes([0x80 | 127]) + struct.pack('!Q', length)
+        mask = os.urandom(4)
+        self._sock.sendall(header + mask + _apply_mask(payload, mask))
+
+    def _recv_frame(self) -> tuple[bool, int, bytes]:
+        first, second = self._read(2)
+        length = second & 0x7F
+        if length == 126:
+            (length,) = struct.unpack('!H', self._read(2))
+        elif length == 127:
+            (length,) = struct.unpack('!Q', self._read(8))
+        mask = self._read(4) if second & 0x80 else None
+        payload = self._read(length)
+        if mask is not None:
+            payload = _apply_mask(payload, mask)
+        return bool(first & 0x80), first & 0x0F, payload
+
+    def _read(self, n: int) -> bytes:
+        while len(self._buffer) < n:
+            self._fill()
+        data = bytes(self._buffer[:n])
+        del self._buffer[:n]
+        return data
+
+    def _fill(self) -> None:
+        chunk = self._sock.recv(65536)
+        if not chunk:
+            raise ConnectionError('websocket connection closed')
+        self._buffer += chunk
+
+
+def _apply_mask(payload: bytes, mask: bytes) -> bytes:
+    # XOR the payload with the repeated mask, a whole integer at a time.
+    repeated = (mask * (len(payload) // 4 + 1))[: len(payload)]
+    masked = int.from_bytes(payload, 'big') ^ int.from_bytes(repeated, 'big')
+    return masked.to_bytes(len(payload), 'big')
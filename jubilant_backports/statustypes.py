@@ -3,7 +3,12 @@
 from __future__ import annotations
 
 import dataclasses
-from typing import Any
+import functools
+import hashlib
+import json
+import threading
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any, Callable, TypeVar, cast
 
 from jubilant import Status as JubilantStatus
 from jubilant import _pretty
@@ -32,6 +37,9 @@ from jubilant.statustypes import (
     VolumeInfo,
 )
 
+from ._status_json import same_section
+from ._status_table import StatusTable
+
 __all__ = [
     'AppStatus',
     'BranchStatus',
@@ -61,6 +69,233 @@ __all__ = [
 ]
 
 
+_T = TypeVar('_T')
+
+
+class _Sourced:
+    """Mixin for status dataclasses that remember the decoded JSON they were built from.
+
+    Only objects built by a lazy parse (``_from_dict(..., lazy=True)``) have a ``_source``. The
+    next parse uses it to reuse objects whose JSON hasn't changed (see the *previous* argument
+    of :meth:`Status._from_dict`), and it's the input for the cached content fingerprint.
+    """
+
+    __slots__ = ()
+
+    _source: Mapping[str, Any]
+    _fingerprint: bytes
+    _exact_fingerprint: bytes
+
+    def _content_hash(self, *, exact: bool = False) -> bytes | None:
+        """Return a digest of this object's JSON, excluding falsy values (which parse as defaults).
+
+        Unless *exact* is true, ``since`` timestamps are excluded too. Returns None if the
+        object wasn't built by a lazy parse. Two objects have the same digest only if they have
+        the same contents, so comparisons can skip descending into them.
+        """
+        attr = '_exact_fingerprint' if exact else '_fingerprint'
+        fingerprint = _peek(self, attr)
+        if fingerprint is None:
+            source = _peek(self, '_source')
+            if source is None:
+                return None
+            fingerprint = _fingerprint(source, exact=exact)
+            object.__setattr__(self, attr, fingerprint)
+        return fingerprint
+
+
+class _Lazy(_Sourced):
+    """Mixin for status dataclasses that can defer building some of their fields.
+
+    When created with ``_from_dict(..., lazy=True)``, the expensive fields are removed from the
+    instance and a factory for each is recorded in ``_pending``. The first attribute access
+    builds the value and stores it on the instance, so later accesses are plain lookups.
+
+    Fields are built under a lock, so threads sharing a status (such as the callers of a
+    :class:`StatusBroker <jubilant_backports.StatusBroker>`) see a single value. Copying or
+    pickling builds all the pending fields first, so the copy doesn't share the factories.
+    """
+
+    __slots__ = ()
+
+    _pending: dict[str, Callable[[], Any]]
+
+    if not TYPE_CHECKING:  # Don't hide attribute typos from static type checkers.
+
+        def __getattr__(self, name: str) -> Any:
+            pending: dict[str, Callable[[], Any]] = _peek(self, '_pending') or {}
+            if name not in pending:
+                raise AttributeError(f'{type(self).__name__!r} object has no attribute {name!r}')
+            with _build_lock:
+                # Another thread may have built it while we waited for the lock.
+                value = _peek(self, name, _MISSING)
+                if value is _MISSING:
+                    value = pending[name]()
+                    object.__setattr__(self, name, value)
+                    del pending[name]
+            return value
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Only used by classes with a __dict__; _slotted classes have their own __getstate__,
+        # which builds the fields by reading them.
+        for name in list(_peek(self, '_pending') or ()):
+            getattr(self, name)
+        state = dict(self.__dict__)
+        state.pop('_pending', None)
+        return state
+
+
+# Guards building the pending fields of _Lazy objects. Reentrant because building a field can
+# read pending fields of other objects.
+_build_lock = threading.RLock()
+
+_MISSING = object()
+
+
+def _defer(obj: _Lazy, source: Mapping[str, Any], **factories: Callable[[], Any]) -> None:
+    """Replace the given fields of *obj* with factories that are called on first access."""
+    for name in factories:
+        object.__delattr__(obj, name)
+    object.__setattr__(obj, '_pending', factories)
+    object.__setattr__(obj, '_source', source)
+
+
+def _peek(obj: object, name: str, default: Any = None) -> Any:
+    """Return attribute *name* of *obj* if it's set, without building pending fields."""
+    try:
+        return object.__getattribute__(obj, name)
+    except AttributeError:
+        return default
+
+
+_S = TypeVar('_S', bound=_Sourced)
+
+
+def _share(
+    raw: dict[str, Any],
+    build: Callable[[Any, Any], _S],
+    prev_raw: dict[str, Any] | None,
+    prev: dict[str, _S] | None,
+    *,
+    keep_source: bool,
+) -> dict[str, _S]:
+    """Build a dict of status objects, reusing objects from *prev* if their JSON is unchanged.
+
+    Args:
+        raw: Decoded JSON for each object, keyed by name.
+        build: Called with the JSON and the previous object of the same name (or None) to build
+            a new object.
+        prev_raw: Decoded JSON that *prev* was built from.
+        prev: Objects built in the previous parse; must be None if *prev_raw* is None.
+        keep_source: If true, record each new object's JSON in its ``_source``.
+    """
+    result: dict[str, _S] = {}
+    for k, v in raw.items():
+        old = prev.get(k) if prev is not None else None
+        if old is not None and prev_raw is not None and prev_raw.get(k) == v:
+            result[k] = old
+            continue
+        obj = build(v, old)
+        if keep_source and _peek(obj, '_source') is None:
+            object.__setattr__(obj, '_source', v)
+        result[k] = obj
+    return result
+
+
+def _fingerprint(value: Any, *, exact: bool = False) -> bytes:
+    """Digest decoded JSON, ignoring falsy values (which parse as defaults).
+
+    Unless *exact* is true, ``since`` keys are ignored too. This is a BLAKE2 digest of the
+    canonical JSON rather than a ``hash()``, which collides too easily (``hash(-1) ==
+    hash(-2)``) for equal digests to stand for equal contents.
+    """
+    text = json.dumps(_canonical(value, exact), sort_keys=True, separators=(',', ':'))
+    return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+
+def _canonical(value: Any, exact: bool) -> Any:
+    """Return decoded JSON without falsy values, and without ``since`` keys unless *exact*."""
+    if isinstance(value, dict):
+        return {
+            k: _canonical(v, exact)
+            for k, v in value.items()  # type: ignore
+            if v and (exact or k != 'since')
+        }
+    if isinstance(value, list):
+        return [_canonical(v, exact) for v in value]  # type: ignore
+    return value
+
+
+def _same_content(a: object, b: object, *, exact: bool = False) -> bool | None:
+    """Report whether two status objects have the same content.
+
+    Unless *exact* is true, ``since`` timestamps are ignored. Returns None if that can't be
+    determined cheaply, because one of them has no fingerprint.
+    """
+    if a is b:
+        return True
+    fa = a._content_hash(exact=exact) if isinstance(a, _Sourced) else None
+    fb = b._content_hash(exact=exact) if isinstance(b, _Sourced) else None
+    if fa is None or fb is None:
+        return None
+    return fa == fb
+
+
+def _dicts_equal(a: dict[str, Any], b: dict[str, Any]) -> bool:
+    """Compare two dicts of status objects, by fingerprint where both values have one.
+
+    Only values without fingerprints (from an eager parse) are compared field by field.
+    """
+    if a is b:
+        return True
+    if a.keys() != b.keys():
+        return False
+    for k, x in a.items():
+        same = _same_content(x, b[k], exact=True)
+        if same is None:
+            same = x == b[k]
+        if not same:
+            return False
+    return True
+
+
+def _slotted(cls: type[_T]) -> type[_T]:
+    """Recreate the frozen dataclass *cls* with ``__slots__`` and no per-instance ``__dict__``.
+
+    This is what ``dataclass(slots=True)`` does on Python 3.10+, which we can't use yet.
+    """
+    field_names = tuple(f.name for f in dataclasses.fields(cls))  # type: ignore
+    cls_dict = dict(cls.__dict__)
+    # Private attributes are annotated on the (non-dataclass) mixins, such as _Lazy.
+    extra_slots: list[str] = []
+    for base in cls.__mro__[1:]:
+        if '__dataclass_fields__' not in base.__dict__:
+            extra_slots.extend(base.__dict__.get('__annotations__', {}))
+    cls_dict['__slots__'] = field_names + tuple(extra_slots)
+    for name in field_names:
+        # Remove the class attributes for defaults, which would clash with the slots. The
+        # generated __init__ and the dataclass fields keep their own reference to the defaults.
+        cls_dict.pop(name, None)
+    cls_dict.pop('__dict__', None)
+    cls_dict.pop('__weakref__', None)
+
+    # Frozen dataclasses raise on setattr, so the default slots pickling can't restore state.
+    def __getstate__(self: Any) -> list[Any]:  # noqa: N807
+        return [getattr(self, name) for name in field_names]
+
+    def __setstate__(self: Any, state: list[Any]) -> None:  # noqa: N807
+        for name, value in zip(field_names, state):
+            object.__setattr__(self, name, value)
+
+    cls_dict['__getstate__'] = __getstate__
+    cls_dict['__setstate__'] = __setstate__
+
+    new_cls = cast('type[_T]', type(cls.__name__, cls.__bases__, cls_dict))
+    new_cls.__qualname__ = cls.__qualname__
+    return new_cls
+
+
+@_slotted
 @dataclasses.dataclass(frozen=True)
 class MeterStatus:
     color: str = ''
@@ -74,8 +309,9 @@ class MeterStatus:
         )
 
 
+@_slotted
 @dataclasses.dataclass(frozen=True)
-class UnitStatus:
+class UnitStatus(_Sourced):
     workload_status: StatusInfo = dataclasses.field(default_factory=StatusInfo)
     juju_status: StatusInfo = dataclasses.field(default_factory=StatusInfo)
     meter_status: MeterStatus = dataclasses.field(default_factory=MeterStatus)
@@ -149,8 +385,9 @@ class UnitStatus:
         return self.workload_status.current == 'waiting'
 
 
+@_slotted
 @dataclasses.dataclass(frozen=True)
-class AppStatus:
+class AppStatus(_Lazy):
     charm: str
     series: str
     os: str
@@ -175,7 +412,9 @@ class AppStatus:
     endpoint_bindings: dict[str, str] = dataclasses.field(default_factory=dict)  # type: ignore
 
     @classmethod
-    def _from_dict(cls, d: dict[str, Any]) -> AppStatus:
+    def _from_dict(
+        cls, d: dict[str, Any], *, lazy: bool = False, previous: AppStatus | None = None
+    ) -> AppStatus:
         if 'status-error' in d:
             return cls(
                 charm='<failed>',
@@ -187,7 +426,22 @@ class AppStatus:
                 exposed=False,
                 app_status=StatusInfo(current='failed', message=d['status-error']),
             )
-        return cls(
+
+        prev_d: dict[str, Any] | None = _peek(previous, '_source')
+        prev_units: dict[str, UnitStatus] | None = _peek(previous, 'units')
+
+        def units() -> dict[str, UnitStatus]:
+            if 'units' not in d:
+                return {}
+            return _share(
+                d['units'],
+                lambda v, _: UnitStatus._from_dict(v),
+                prev_d.get('units') if prev_d is not None else None,
+                prev_units,
+                keep_source=lazy,
+            )
+
+        app = cls(
             charm=d['charm'],
             series=d['series'],
             os=d['os'],
@@ -210,14 +464,13 @@ class AppStatus:
             ),
             relations=d.get('relations') or {},
             subordinate_to=d.get('subordinate-to') or [],
-            units=(
-                {k: UnitStatus._from_dict(v) for k, v in d['units'].items()}
-                if 'units' in d
-                else {}
-            ),
+            units={} if lazy else units(),
             version=d.get('version') or '',
             endpoint_bindings=d.get('endpoint-bindings') or {},
         )
+        if lazy:
+            _defer(app, d, units=units)
+        return app
 
     @property
     def is_active(self) -> bool:
@@ -245,6 +498,7 @@ class AppStatus:
         return self.app_status.current == 'waiting'
 
 
+@_slotted
 @dataclasses.dataclass(frozen=True)
 class BranchStatus:
     ref: str = ''
@@ -262,8 +516,9 @@ class BranchStatus:
         )
 
 
+@_slotted
 @dataclasses.dataclass(frozen=True)
-class MachineStatus:
+class MachineStatus(_Sourced):
     series: str
 
     juju_status: StatusInfo = dataclasses.field(default_factory=StatusInfo)
@@ -332,6 +587,7 @@ class MachineStatus:
         )
 
 
+@_slotted
 @dataclasses.dataclass(frozen=True)
 class ModelStatus:
     name: str
@@ -367,7 +623,7 @@ class ModelStatus:
 
 
 @dataclasses.dataclass(frozen=True)
-class Status:
+class Status(_Lazy):
     """Parsed version of the status object returned by "juju status --format=json"."""
 
     model: ModelStatus
@@ -381,24 +637,77 @@ class Status:
     branches: dict[str, BranchStatus] = dataclasses.field(default_factory=dict)  # type: ignore
 
     @classmethod
-    def _from_dict(cls, d: dict[str, Any]) -> Status:
-        return cls(
+    def _from_dict(
+        cls, d: Mapping[str, Any], *, lazy: bool = False, previous: Status | None = None
+    ) -> Status:
+        """Build a status object from the decoded ``juju status`` JSON.
+
+        If *lazy* is true, :attr:`machines`, :attr:`apps`, :attr:`offers`, :attr:`storage`, and
+        the units of each app, are only built from *d* when they are first accessed. Callers
+        that only look at part of the status (like most ``wait`` predicates) then skip the rest.
+
+        If *previous* is a status that was built lazily, apps, units, and machines whose JSON is
+        unchanged since *previous* was built are reused rather than rebuilt, so comparing them
+        with the previous status is an identity check. Only sections of *previous* that were
+        already built are reused; *previous* itself isn't referenced by the new status.
+        """
+        prev_d: Mapping[str, Any] | None = _peek(previous, '_source')
+        prev_machines: dict[str, MachineStatus] | None = _peek(previous, 'machines')
+        prev_apps: dict[str, AppStatus] | None = _peek(previous, 'apps')
+
+        def unchanged(key: str, built: dict[str, _S] | None) -> bool:
+            # If the section's text hasn't changed, what was built from it can all be reused.
+            return built is not None and prev_d is not None and same_section(d, prev_d, key)
+
+        def previous_section(key: str, built: dict[str, _S] | None) -> dict[str, Any] | None:
+            # Only decode the previous section if it was built, so there's something to reuse.
+            if prev_d is None or built is None:
+                return None
+            return prev_d[key]
+
+        def machines() -> dict[str, MachineStatus]:
+            if prev_machines is not None and unchanged('machines', prev_machines):
+                return dict(prev_machines)
+            return _share(
+                d['machines'],
+                lambda v, _: MachineStatus._from_dict(v),
+                previous_section('machines', prev_machines),
+                prev_machines,
+                keep_source=lazy,
+            )
+
+        def apps() -> dict[str, AppStatus]:
+            if prev_apps is not None and unchanged('applications', prev_apps):
+                return dict(prev_apps)
+            return _share(
+                d['applications'],
+                lambda v, old: AppStatus._from_dict(v, lazy=lazy, previous=old),
+                previous_section('applications', prev_apps),
+                prev_apps,
+                keep_source=lazy,
+            )
+
+        def offers() -> dict[str, OfferStatus]:
+            if 'offers' not in d:
+                return {}
+            return {k: OfferStatus._from_dict(v) for k, v in d['offers'].items()}
+
+        def storage() -> CombinedStorage:
+            if 'storage' not in d:
+                return CombinedStorage()
+            return CombinedStorage._from_dict(d['storage'])
+
+        status = cls(
             model=ModelStatus._from_dict(d['model']),
-            machines={k: MachineStatus._from_dict(v) for k, v in d['machines'].items()},
-            apps={k: AppStatus._from_dict(v) for k, v in d['applications'].items()},
+            machines={} if lazy else machines(),
+            apps={} if lazy else apps(),
             app_endpoints=(
                 {k: RemoteAppStatus._from_dict(v) for k, v in d['application-endpoints'].items()}
                 if 'application-endpoints' in d
                 else {}
             ),
-            offers=(
-                {k: OfferStatus._from_dict(v) for k, v in d['offers'].items()}
-                if 'offers' in d
-                else {}
-            ),
-            storage=(
-                CombinedStorage._from_dict(d['storage']) if 'storage' in d else CombinedStorage()
-            ),
+            offers={} if lazy else offers(),
+            storage=CombinedStorage() if lazy else storage(),
             controller=(
                 ControllerStatus._from_dict(d['controller'])
                 if 'controller' in d
@@ -410,6 +719,9 @@ class Status:
                 else {}
             ),
         )
+        if lazy:
+            _defer(status, d, machines=machines, apps=apps, offers=offers, storage=storage)
+        return status
 
     def __repr__(self) -> str:
         """Return a pretty-printed version of the status."""
@@ -425,12 +737,19 @@ class Status:
         This excludes the :attr:`controller` attribute, because that only has a timestamp that
         constantly updates.
         """
+        if self is other:
+            return True
         if not isinstance(other, (Status, JubilantStatus)):
             return False
         for field in dataclasses.fields(self):
             if field.name == 'controller':
                 continue
-            if getattr(self, field.name) != getattr(other, field.name):
+            value = getattr(self, field.name)
+            other_value = getattr(other, field.name)
+            if field.name in ('apps', 'machines'):
+                if not _dicts_equal(value, other_value):
+                    return False
+            elif value != other_value:
                 return False
         return True
 
@@ -450,12 +769,63 @@ class Status:
             return {}
         if not app_info.subordinate_to:
             return app_info.units
-
-        units: dict[str, UnitStatus] = {}
-        app_prefix = app + '/'
-        for principal in app_info.subordinate_to:
-            for unit_info in self.apps[principal].units.values():
-                for sub_name, sub in unit_info.subordinates.items():
-                    if sub_name.startswith(app_prefix):
-                        units[sub_name] = sub  # noqa: PERF403
-        return units
+        # A copy, so that changes to it don't leak into the cached index.
+        return dict(self._app_units[app])
+
+    # The indexes below are built on first use from the (immutable) status, then cached on the
+    # instance, so predicates that look up units repeatedly on one status don't rescan it.
+
+    @functools.cached_property
+    def _app_units(self) -> dict[str, dict[str, UnitStatus]]:
+        """Map of app name to all its units, including the units of subordinate apps."""
+        index: dict[str, dict[str, UnitStatus]] = {}
+        for app, app_info in self.apps.items():
+            if not app_info.subordinate_to:
+                index[app] = app_info.units
+                continue
+            units = index[app] = {}
+            app_prefix = app + '/'
+            for principal in app_info.subordinate_to:
+                principal_info = self.apps.get(principal)
+                if principal_info is None:
+                    continue
+                for unit_info in principal_info.units.values():
+                    for sub_name, sub in unit_info.subordinates.items():
+                        if sub_name.startswith(app_prefix):
+                            units[sub_name] = sub  # noqa: PERF403
+        return index
+
+    @functools.cached_property
+    def _unit_apps(self) -> dict[str, str]:
+        """Map of unit name to app name, including subordinate units."""
+        return {unit: app for app, units in self._app_units.items() for unit in units}
+
+    @functools.cached_property
+    def _machine_units(self) -> dict[str, dict[str, UnitStatus]]:
+        """Map of machine (or container) ID to the units on it, including subordinate units."""
+        index: dict[str, dict[str, UnitStatus]] = {}
+        for app_info in self.apps.values():
+            for unit, unit_info in app_info.units.items():
+                if not unit_info.machine:
+                    continue
+                units = index.setdefault(unit_info.machine, {})
+                units[unit] = unit_info
+                units.update(unit_info.subordinates)
+        return index
+
+    @functools.cached_property
+    def _table(self) -> StatusTable:
+        """Per-app summaries of the states, used by the ``all_*`` and ``any_*`` helpers."""
+        return StatusTable(self)
+
+    @functools.cached_property
+    def _parent_machines(self) -> dict[str, str]:
+        """Map of container ID to the ID of the machine it's on, for nested containers too."""
+        index: dict[str, str] = {}
+        todo = list(self.machines.items())
+        while todo:
+            machine, machine_info = todo.pop()
+            for container, container_info in machine_info.containers.items():
+                index[container] = machine
+                todo.append((container, container_info))
+        return index
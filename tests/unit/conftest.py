@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import pathlib
 from collections.abc import Generator
 
 import pytest
@@ -16,10 +17,28 @@ def run(monkeypatch: pytest.MonkeyPatch) -> Generator[mocks.Run]:
     assert len(run_mock.calls) >= 1, 'subprocess.run not called'
 
 
+@pytest.fixture
+def async_run(monkeypatch: pytest.MonkeyPatch) -> Generator[mocks.AsyncRun]:
+    """Pytest fixture that patches asyncio.create_subprocess_exec with mocks.AsyncRun."""
+    run_mock = mocks.AsyncRun()
+    monkeypatch.setattr('asyncio.create_subprocess_exec', run_mock.exec)
+    yield run_mock
+    assert len(run_mock.calls) >= 1, 'asyncio.create_subprocess_exec not called'
+
+
 @pytest.fixture
 def time(monkeypatch: pytest.MonkeyPatch) -> Generator[mocks.Time]:
     """Pytest fixture that patches time.monotonic and time.sleep with mocks.Time."""
     time_mock = mocks.Time()
     monkeypatch.setattr('time.monotonic', time_mock.monotonic)
     monkeypatch.setattr('time.sleep', time_mock.sleep)
+    monkeypatch.setattr('asyncio.sleep', time_mock.async_sleep)
     yield time_mock
+
+
+@pytest.fixture(autouse=True)
+def cli_info_dir(monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path) -> pathlib.Path:
+    """Pytest fixture that gives each test an empty cache of CLI versions and capabilities."""
+    cache_dir = tmp_path / 'jubilant-cache'
+    monkeypatch.setenv('JUBILANT_CACHE_DIR', str(cache_dir))
+    return cache_dir
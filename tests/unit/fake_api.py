@@ -0,0 +1,160 @@
+"""A fake Juju API server, speaking just enough websocket for the API transport's tests."""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import pathlib
+import socket
+import socketserver
+import struct
+import threading
+from typing import Any, Callable
+
+_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+MODEL_UUID = 'ad1e6fb0-2d6b-4bdc-8c6e-4c3f1e0b5c1d'
+
+FACADES = [
+    {'name': 'Action', 'versions': [7]},
+    {'name': 'Client', 'versions': [6, 7, 8]},
+    {'name': 'Pinger', 'versions': [1]},
+    {'name': 'Storage', 'versions': [6]},
+]
+
+
+class APIServer:
+    """Fake API server, running in a thread, that answers requests with :meth:`handle`.
+
+    Each request is recorded in :attr:`requests` as ``(facade, method, params)``.
+    """
+
+    def __init__(self):
+        self._handlers: dict[tuple[str, str], Callable[[dict[str, Any]], Any]] = {}
+        self.requests: list[tuple[str, str, dict[str, Any]]] = []
+        self.paths: list[str] = []
+        self.handle('Admin', 'Login', {'facades': FACADES, 'server-version': '3.6.1'})
+        self.handle('Pinger', 'Ping', {})
+        self.handle('Storage', 'ListStorageDetails', {'results': [{'result': []}]})
+
+        server = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                server._serve(self.request)
+
+        self._server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self.port: int = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, args=(0.01,), daemon=True
+        )
+        self._thread.start()
+
+    def handle(self, facade: str, method: str, response: Any):
+        """Answer requests for *method* on *facade* with *response*.
+
+        The response may be a function that takes the params and returns the response, or
+        an exception to return an error.
+        """
+        self._handlers[facade, method] = response if callable(response) else lambda _: response
+
+    def write_juju_data(self, path: pathlib.Path, *, password: bool = True):
+        """Write Juju client files for a controller "ctl" with the model "mdl" on this server.
+
+        The user is "admin", with the password "hunter2" unless *password* is false.
+        """
+        path.mkdir(parents=True, exist_ok=True)
+        controller = {'uuid': 'c1', 'api-endpoints': [f'127.0.0.1:{self.port}']}
+        (path / 'controllers.yaml').write_text(
+            json.dumps({'controllers': {'ctl': controller}, 'current-controller': 'ctl'})
+        )
+        models = {'models': {'admin/mdl': {'uuid': MODEL_UUID}}, 'current-model': 'admin/mdl'}
+        (path / 'models.yaml').write_text(json.dumps({'controllers': {'ctl': models}}))
+        account: dict[str, str] = {'user': 'admin'}
+        if password:
+            account['password'] = 'hunter2'  # noqa: S105
+        (path / 'accounts.yaml').write_text(json.dumps({'controllers': {'ctl': account}}))
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _serve(self, sock: socket.socket):
+        conn = _Connection(sock)
+        request = b''
+        while b'\r\n\r\n' not in request:
+            request += sock.recv(4096)
+        lines = request.decode().split('\r\n')
+        self.paths.append(lines[0].split()[1])
+        key = next(
+            line.split(':', 1)[1].strip() for line in lines if line.startswith('Sec-WebSocket-Key')
+        )
+        accept = base64.b64encode(hashlib.sha1((key + _GUID).encode()).digest()).decode()  # noqa: S324
+        sock.sendall(
+            (
+                'HTTP/1.1 101 Switching Protocols\r\n'
+                'Upgrade: websocket\r\nConnection: Upgrade\r\n'
+                f'Sec-WebSocket-Accept: {accept}\r\n\r\n'
+            ).encode()
+        )
+        while True:
+            try:
+                opcode, payload = conn.recv()
+            except ConnectionError:
+                return
+            if opcode == 0x8:
+                return
+            message = json.loads(payload)
+            facade, method = message['type'], message['request']
+            self.requests.append((facade, method, message['params']))
+            reply: dict[str, Any] = {'request-id': message['request-id']}
+            handler = self._handlers.get((facade, method))
+            if handler is None:
+                response = Exception(
+                    f'no such request - method {facade}.{method} is not implemented'
+                )
+            else:
+                response = handler(message['params'])
+            if isinstance(response, Exception):
+                reply['error'] = str(response)
+                reply['error-code'] = 'not found'
+            else:
+                reply['response'] = response
+            conn.send(json.dumps(reply).encode())
+
+
+class _Connection:
+    def __init__(self, sock: socket.socket):
+        self._sock = sock
+
+    def recv(self) -> tuple[int, bytes]:
+        first, second = self._read(2)
+        length = second & 0x7F
+        if length == 126:
+            (length,) = struct.unpack('!H', self._read(2))
+        elif length == 127:
+            (length,) = struct.unpack('!Q', self._read(8))
+        mask = self._read(4)
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(self._read(length)))
+        return first & 0x0F, payload
+
+    def send(self, payload: bytes):
+        length = len(payload)
+        if length < 126:
+            header = bytes([0x81, length])
+        elif length < 1 << 16:
+            header = bytes([0x81, 126]) + struct.pack('!H', length)
+        else:
+            header = bytes([0x81, 127]) + struct.pack('!Q', length)
+        self._sock.sendall(header + payload)
+
+    def _read(self, n: int) -> bytes:
+        data = b''
+        while len(data) < n:
+            chunk = self._sock.recv(n - len(data))
+            if not chunk:
+                raise ConnectionError('closed')
+            data += chunk
+        return data
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import asyncio
 import dataclasses
 import subprocess
+from typing import Any
 
 
 @dataclasses.dataclass(frozen=True)
@@ -80,3 +82,44 @@ class Time:
 
     def sleep(self, seconds: float):
         self._monotonic += seconds
+
+    async def async_sleep(self, seconds: float):
+        """Mock for asyncio.sleep, which advances the clock like :meth:`sleep`."""
+        self._monotonic += seconds
+
+
+class AsyncRun(Run):
+    """Mock for asyncio.create_subprocess_exec, with commands handled as for :class:`Run`.
+
+    Patch asyncio.create_subprocess_exec with the :meth:`exec` method.
+    """
+
+    async def exec(self, program: str, *args: str, **kwargs: Any) -> Process:
+        args_tuple = (program, *args)
+        assert kwargs['stdout'] == asyncio.subprocess.PIPE
+        assert kwargs['stderr'] == asyncio.subprocess.PIPE
+        assert args_tuple in self._commands, f'unhandled command {list(args_tuple)}'
+
+        returncode, stdout, stderr = self._commands[args_tuple]
+        self.calls.append(
+            Call(args=args_tuple, returncode=returncode, stdin=None, stdout=stdout, stderr=stderr)
+        )
+        return Process(returncode, stdout, stderr)
+
+
+class Process:
+    """Mock for asyncio.subprocess.Process, as returned by :meth:`AsyncRun.exec`."""
+
+    def __init__(self, returncode: int, stdout: str, stderr: str):
+        self.returncode = returncode
+        self._stdout = stdout
+        self._stderr = stderr
+
+    async def communicate(self, input: bytes | None = None) -> tuple[bytes, bytes]:
+        return self._stdout.encode(), self._stderr.encode()
+
+    async def wait(self) -> int:
+        return self.returncode
+
+    def kill(self):
+        pass
@@ -0,0 +1,66 @@
+import concurrent.futures
+import json
+from typing import Any, Callable, Tuple
+
+import pytest
+
+import jubilant_backports as jubilant
+
+from .fake_statuses import STATUS_ERRORS_JSON29, SUBORDINATES_JSON29
+
+
+def _subordinates_status() -> jubilant.Status:
+    d: Any = json.loads(SUBORDINATES_JSON29)
+    # nrpe/1 is a subordinate of ubuntu/0.
+    ubuntu0 = d['applications']['ubuntu']['units']['ubuntu/0']
+    ubuntu0['subordinates']['nrpe/1']['workload-status']['current'] = 'error'
+    ubuntu0['juju-status']['current'] = 'executing'
+    return jubilant.Status._from_dict(d)
+
+
+@pytest.mark.parametrize(
+    'func,apps,expected',
+    [
+        (jubilant.all_active, (), False),
+        (jubilant.all_active, ('ubun2',), True),
+        (jubilant.all_active, ('ubun2', 'ubuntu'), True),
+        (jubilant.all_active, ('ubun2', 'foo'), False),
+        (jubilant.all_blocked, ('nrpe',), False),
+        (jubilant.any_blocked, (), True),
+        (jubilant.any_blocked, ('ubuntu',), False),
+        (jubilant.any_blocked, ('foo',), False),
+        (jubilant.any_error, (), True),
+        (jubilant.any_error, ('nrpe',), True),
+        (jubilant.any_error, ('ubun2', 'ubuntu'), False),
+        (jubilant.any_maintenance, (), False),
+        (jubilant.all_agents_idle, (), False),
+        (jubilant.all_agents_idle, ('ubun2', 'nrpe'), True),
+        (jubilant.all_agents_idle, ('ubuntu',), False),
+        (jubilant.all_agents_idle, ('foo',), False),
+    ],
+)
+def test_subordinates(func: Callable[..., bool], apps: Tuple[str, ...], expected: bool):
+    assert func(_subordinates_status(), *apps) is expected
+
+
+def test_no_units():
+    status = jubilant.Status._from_dict(json.loads(STATUS_ERRORS_JSON29))
+    assert not jubilant.any_error(status)
+    assert jubilant.all_agents_idle(status, 'app-failed')
+    assert not jubilant.all_agents_idle(status, 'unit-failed')
+    assert not jubilant.any_active(status, 'unit-failed')
+
+
+def test_table_codes():
+    status = _subordinates_status()
+    table = status._table
+    assert table is status._table
+    states = [f'state{i}' for i in range(100)]
+
+    with concurrent.futures.ThreadPoolExecutor(4) as executor:
+        for _ in range(4):
+            list(executor.map(table.code, states))
+
+    # Each state has its own bit, even when first seen by several threads at once.
+    assert sorted(table.codes.values()) == list(range(len(table.codes)))
+    assert table.codes.keys() == set(states)
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import asyncio
+
+import jubilant as real_jubilant
+import pytest
+
+import jubilant_backports as jubilant
+
+from . import mocks
+from .fake_statuses import SNAPPASS_JSON, SNAPPASS_JSON29
+
+RUN29_JSON = """
+{
+  "unit-mysql-0": {
+    "UnitId": "mysql/0",
+    "id": "36",
+    "results": {"password": "pass", "ReturnCode": 0, "Stdout": "OUT"},
+    "status": "completed"
+  }
+}
+"""
+
+RUN_JSON = """
+{
+  "mysql/0": {
+    "id": "42",
+    "results": {"password": "pass", "return-code": 0, "stdout": "OUT"},
+    "status": "completed"
+  }
+}
+"""
+
+
+def test_version(async_run: mocks.AsyncRun):
+    async_run.handle(['juju', 'version', '--format', 'json'], stdout='"2.9.52"\n')
+    async_run.handle(['juju', 'relate', 'a', 'b'])
+    juju = jubilant.AsyncJuju()
+    assert juju.cli_version is None
+
+    asyncio.run(juju.integrate('a', 'b'))
+
+    assert juju.cli_version == '2.9.52'
+    assert [call.args[1] for call in async_run.calls] == ['version', 'relate']
+
+
+def test_cli_error(async_run: mocks.AsyncRun):
+    async_run.handle(
+        ['juju', 'status', '--model', 'm', '--format', 'json'], returncode=1, stderr='E'
+    )
+    juju = jubilant.AsyncJuju(model='m', cli_version='3.6.8')
+
+    with pytest.raises(jubilant.CLIError) as excinfo:
+        asyncio.run(juju.status())
+
+    assert excinfo.value.returncode == 1
+    assert excinfo.value.stderr == 'E'
+
+
+@pytest.mark.parametrize(
+    'juju_version,expected',
+    [
+        ('2.9.52', ['deploy', 'ch', 'app', '--series', 'jammy', '--trust']),
+        ('3.6.8', ['deploy', 'ch', 'app', '--base', 'ubuntu@22.04', '--trust']),
+    ],
+)
+def test_deploy(async_run: mocks.AsyncRun, juju_version: str, expected: list[str]):
+    async_run.handle(['juju', *expected])
+    juju = jubilant.AsyncJuju(cli_version=juju_version)
+
+    asyncio.run(juju.deploy('ch', 'app', base='ubuntu@22.04', trust=True))
+
+    assert len(async_run.calls) == 1
+
+
+@pytest.mark.parametrize(
+    'juju_version,expected',
+    [
+        ('2.9.52', [['refresh', 'app', '--channel', 'edge'], ['trust', 'app']]),
+        ('3.6.8', [['refresh', 'app', '--channel', 'edge', '--trust']]),
+    ],
+)
+def test_refresh(async_run: mocks.AsyncRun, juju_version: str, expected: list[list[str]]):
+    for args in expected:
+        async_run.handle(['juju', *args])
+    juju = jubilant.AsyncJuju(cli_version=juju_version)
+
+    asyncio.run(juju.refresh('app', channel='edge', trust=True))
+
+    assert [list(call.args[1:]) for call in async_run.calls] == expected
+
+
+@pytest.mark.parametrize(
+    'juju_version,args,stdout',
+    [
+        (
+            '2.9.52',
+            ['run-action', '--format', 'json', 'mysql/0', 'get-password', '--wait'],
+            RUN29_JSON,
+        ),
+        ('3.6.8', ['run', '--format', 'json', 'mysql/0', 'get-password'], RUN_JSON),
+    ],
+)
+def test_run(async_run: mocks.AsyncRun, juju_version: str, args: list[str], stdout: str):
+    async_run.handle(['juju', *args], stdout=stdout)
+    juju = jubilant.AsyncJuju(cli_version=juju_version)
+
+    task = asyncio.run(juju.run('mysql/0', 'get-password'))
+
+    assert task.results == {'password': 'pass'}
+    assert task.stdout == 'OUT'
+    task_cls = jubilant.Task if juju_version[0] == '2' else real_jubilant.Task
+    assert isinstance(task, task_cls)
+
+
+def test_exec(async_run: mocks.AsyncRun):
+    stdout = '[{"unit": "ubuntu/0", "return-code": 1, "stderr": "ERR"}]'
+    async_run.handle(
+        ['juju', 'exec', '--format', 'json', '--unit', 'ubuntu/0', '--', 'false'],
+        returncode=1,
+        stdout=stdout,
+        stderr='ERROR task failed',
+    )
+    juju = jubilant.AsyncJuju(cli_version='2.9.52')
+
+    with pytest.raises(jubilant.TaskError) as excinfo:
+        asyncio.run(juju.exec('false', unit='ubuntu/0'))
+
+    assert excinfo.value.task.return_code == 1
+    assert excinfo.value.task.stderr == 'ERR'
+
+
+@pytest.mark.parametrize(
+    'juju_version,stdout',
+    [('2.9.52', SNAPPASS_JSON29), ('3.6.8', SNAPPASS_JSON)],
+)
+def test_wait(async_run: mocks.AsyncRun, time: mocks.Time, juju_version: str, stdout: str):
+    async_run.handle(['juju', 'status', '--format', 'json'], stdout=stdout)
+    juju = jubilant.AsyncJuju(cli_version=juju_version)
+
+    status = asyncio.run(juju.wait(jubilant.all_active))
+
+    assert status.apps['snappass-test'].is_active
+    assert len(async_run.calls) == 3
+    assert time.monotonic() == 2
+
+
+def test_wait_timeout(async_run: mocks.AsyncRun, time: mocks.Time):
+    async_run.handle(['juju', 'status', '--format', 'json'], stdout=SNAPPASS_JSON29)
+    juju = jubilant.AsyncJuju(cli_version='2.9.52')
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(juju.wait(jubilant.all_blocked, timeout=5))
+
+    assert len(async_run.calls) == 5
+    assert time.monotonic() == 5
+
+
+def test_concurrent_waits(async_run: mocks.AsyncRun, time: mocks.Time):
+    models = [f'm{i}' for i in range(10)]
+    for model in models:
+        async_run.handle(
+            ['juju', 'status', '--model', model, '--format', 'json'], stdout=SNAPPASS_JSON29
+        )
+
+    async def wait_all():
+        jujus = [jubilant.AsyncJuju(model=model, cli_version='2.9.52') for model in models]
+        return await asyncio.gather(*(juju.wait(jubilant.all_active) for juju in jujus))
+
+    statuses = asyncio.run(wait_all())
+
+    assert len(statuses) == 10
+    assert len(async_run.calls) == 30
+
+
+def mock_token_hex(n: int):
+    assert n == 4
+    return 'abcd1234'
+
+
+def test_async_temp_model(async_run: mocks.AsyncRun, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr('secrets.token_hex', mock_token_hex)
+    async_run.handle(['juju', 'version', '--format', 'json'], stdout='"3.6.8"\n')
+    async_run.handle(['juju', 'add-model', '--no-switch', 'jubilant-abcd1234'])
+    async_run.handle(['juju', 'integrate', '--model', 'jubilant-abcd1234', 'a', 'b'])
+    async_run.handle(
+        [
+            'juju',
+            'destroy-model',
+            'jubilant-abcd1234',
+            '--no-prompt',
+            '--destroy-storage',
+            '--force',
+        ]
+    )
+
+    async def use_model():
+        async with jubilant.async_temp_model() as juju:
+            assert juju.model == 'jubilant-abcd1234'
+            await juju.integrate('a', 'b')
+        return juju
+
+    juju = asyncio.run(use_model())
+
+    assert juju.model is None
+    assert [call.args[1] for call in async_run.calls] == [
+        'add-model',
+        'version',
+        'integrate',
+        'destroy-model',
+    ]
+
+
+def test_exec_multiple(async_run: mocks.AsyncRun):
+    stdout = '[{"unit": "ubuntu/0", "return-code": 0}, {"unit": "ubuntu/1", "return-code": 1}]'
+    async_run.handle(
+        ['juju', 'exec', '--format', 'json', '--application', 'ubuntu', '--', 'true'],
+        returncode=1,
+        stdout=stdout,
+        stderr='ERROR task failed',
+    )
+    juju = jubilant.AsyncJuju(cli_version='2.9.52')
+
+    tasks = asyncio.run(juju.exec_multiple('true', apps='ubuntu'))
+
+    assert {unit: task.success for unit, task in tasks.items()} == {
+        'ubuntu/0': True,
+        'ubuntu/1': False,
+    }
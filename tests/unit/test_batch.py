@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import concurrent.futures
+import threading
+
+import pytest
+
+import jubilant_backports as jubilant
+
+from . import mocks
+
+
+def test_runs_all(run: mocks.Run):
+    run.handle(['juju', 'deploy', 'a'])
+    run.handle(['juju', 'deploy', 'b'])
+    run.handle(['juju', 'relate', 'a', 'b'])
+    juju = jubilant.Juju(cli_version='2.9.52')
+
+    with juju.batch() as batch:
+        a = batch.submit(juju.deploy, 'a')
+        b = batch.submit(juju.deploy, 'b')
+        relate = batch.submit(juju.integrate, 'a', 'b', after=[a, b])
+
+    assert relate.result() is None
+    assert len(run.calls) == 3
+    assert run.calls[2].args[1] == 'relate'
+
+
+def test_concurrent():
+    batch = jubilant.Batch(max_workers=3)
+    barrier = threading.Barrier(3, timeout=5)
+
+    futures = [batch.submit(barrier.wait) for _ in range(3)]
+    batch._finish(cancel=False)
+
+    # All three must have been running at once to pass the barrier.
+    assert sorted(f.result() for f in futures) == [0, 1, 2]
+
+
+def test_ordering():
+    order: list[str] = []
+    lock = threading.Lock()
+    first_done = threading.Event()
+
+    def record(name: str, delay: float = 0):
+        if delay:
+            first_done.wait(delay)
+        with lock:
+            order.append(name)
+        return name
+
+    batch = jubilant.Batch(max_workers=4)
+    slow = batch.submit(record, 'slow', 0.05)
+    fast = batch.submit(record, 'fast')
+    last = batch.submit(record, 'last', after=[slow, fast])
+    batch._finish(cancel=False)
+
+    assert order == ['fast', 'slow', 'last']
+    assert last.result() == 'last'
+
+
+def test_error(run: mocks.Run):
+    run.handle(['juju', 'deploy', 'a'], returncode=1, stderr='ERROR no such charm')
+    run.handle(['juju', 'deploy', 'b'])
+    juju = jubilant.Juju(cli_version='2.9.52')
+
+    batch = juju.batch()
+    a = batch.submit(juju.deploy, 'a')
+    b = batch.submit(juju.deploy, 'b')
+    relate = batch.submit(juju.integrate, 'a', 'b', after=[a, b])
+    with pytest.raises(jubilant.CLIError) as excinfo:
+        batch.__exit__(None, None, None)
+
+    assert excinfo.value.stderr == 'ERROR no such charm'
+    assert isinstance(a.exception(), jubilant.CLIError)
+    assert b.result() is None
+    assert relate.cancelled()
+    assert len(run.calls) == 2
+
+
+def test_body_raises():
+    batch_futures: list[concurrent.futures.Future[bool]] = []
+    juju = jubilant.Juju(cli_version='2.9.52')
+    gate = threading.Event()
+
+    with pytest.raises(ValueError), juju.batch(max_workers=1) as batch:
+        batch_futures.append(batch.submit(gate.wait, 5))
+        batch_futures.append(batch.submit(gate.wait, 5))
+        gate.set()
+        raise ValueError
+
+    assert all(f.done() for f in batch_futures)
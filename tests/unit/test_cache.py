@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import pytest
+
+import jubilant_backports as jubilant
+
+from . import mocks
+from .fake_statuses import MINIMAL_JSON29, MINIMAL_STATUS29
+
+CONFIG_JSON = '{"settings": {"foo": {"type": "string", "value": "bar"}}}'
+
+
+@pytest.fixture
+def juju(run: mocks.Run) -> jubilant.Juju:
+    run.handle(['juju', 'status', '--model', 'm', '--format', 'json'], stdout=MINIMAL_JSON29)
+    run.handle(['juju', 'config', '--model', 'm', '--format', 'json', 'a'], stdout=CONFIG_JSON)
+    run.handle(['juju', 'config', '--model', 'm', '--format', 'json', 'b'], stdout=CONFIG_JSON)
+    run.handle(['juju', 'config', '--model', 'm', 'a', 'foo=baz'])
+    run.handle(['juju', 'deploy', '--model', 'm', 'c'])
+    run.handle(['juju', 'version', '--format', 'json'], stdout='"2.9.52"\n')
+    return jubilant.Juju(model='m', cache=jubilant.CLICache(max_age=10))
+
+
+def _count(run: mocks.Run, command: str) -> int:
+    return sum(1 for call in run.calls if call.args[1] == command)
+
+
+def test_hits_and_misses(juju: jubilant.Juju, run: mocks.Run):
+    assert juju.cache is not None
+
+    assert juju.status() == MINIMAL_STATUS29
+    assert juju.status() == MINIMAL_STATUS29
+    assert juju.config('a') == {'foo': 'bar'}
+    assert juju.config('a') == {'foo': 'bar'}
+
+    assert _count(run, 'status') == 1
+    assert _count(run, 'config') == 1
+    assert (juju.cache.hits, juju.cache.misses) == (2, 3)  # including the version
+
+
+def test_max_age(juju: jubilant.Juju, run: mocks.Run, time: mocks.Time):
+    juju.status()
+    time.sleep(10)
+    juju.status()
+    time.sleep(0.1)
+    juju.status()
+
+    assert _count(run, 'status') == 2
+
+
+def test_lru_eviction(run: mocks.Run):
+    run.handle(['juju', 'config', '--format', 'json', 'a'], stdout=CONFIG_JSON)
+    run.handle(['juju', 'config', '--format', 'json', 'b'], stdout=CONFIG_JSON)
+    run.handle(['juju', 'config', '--format', 'json', 'c'], stdout=CONFIG_JSON)
+    cache = jubilant.CLICache(max_size=2)
+    juju = jubilant.Juju(cli_version='2.9.52', cache=cache)
+
+    for app in ['a', 'b', 'a', 'c', 'a', 'b']:
+        juju.config(app)
+
+    # "b" was evicted when "c" was added, as "a" had been used more recently.
+    assert [call.args[-1] for call in run.calls] == ['a', 'b', 'c', 'b']
+    assert len(cache) == 2
+
+
+def test_config_set_invalidates_app(juju: jubilant.Juju, run: mocks.Run):
+    juju.status()
+    juju.config('a')
+    juju.config('b')
+
+    juju.config('a', {'foo': 'baz'})
+    juju.status()
+    juju.config('a')
+    juju.config('b')
+
+    assert _count(run, 'status') == 2
+    assert [call.args[-1] for call in run.calls if call.args[1] == 'config'] == [
+        'a',
+        'b',
+        'foo=baz',
+        'a',
+    ]
+
+
+def test_deploy_invalidates_model(juju: jubilant.Juju, run: mocks.Run):
+    juju.status()
+    juju.config('b')
+
+    juju.deploy('c')
+    juju.status()
+    juju.config('b')
+    juju.cli('version', '--format', 'json', include_model=False)
+
+    assert _count(run, 'status') == 2
+    assert _count(run, 'config') == 2
+    assert _count(run, 'version') == 1
+
+
+def test_exec_invalidates_model(juju: jubilant.Juju, run: mocks.Run):
+    stdout = '[{"unit": "a/0", "return-code": 0, "stdout": ""}]'
+    run.handle(
+        ['juju', 'exec', '--model', 'm', '--format', 'json', '--unit', 'a/0', '--', 'touch x'],
+        stdout=stdout,
+    )
+    juju.status()
+
+    juju.exec_multiple('touch x', units='a/0')
+    juju.status()
+
+    assert _count(run, 'status') == 2
+
+
+def test_wait_bypasses_cache(juju: jubilant.Juju, run: mocks.Run):
+    juju.status()
+    juju.wait(lambda status: True, successes=1)
+
+    assert _count(run, 'status') == 2
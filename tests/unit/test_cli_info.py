@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import pathlib
+
+import pytest
+
+import jubilant_backports as jubilant
+
+from . import mocks
+
+HELP_COMMANDS = """\
+add-model            Adds a workload model.
+deploy               Deploys a new application or bundle.
+wait-for             Wait for an entity to reach a specified state.
+"""
+
+DEPLOY_HELP = """\
+Usage: juju deploy [options] <charm or bundle> [<application name>]
+
+Options:
+--channel (= "")
+    Channel to use when deploying a charm or bundle from the charm store.
+--overlay  (= )
+    Bundles to overlay on the primary bundle, applied in order.
+-n, --num-units (= 1)
+    Number of application units to deploy for principal charms.
+"""
+
+
+@pytest.fixture
+def juju_binary(tmp_path: pathlib.Path) -> pathlib.Path:
+    path = tmp_path / 'juju'
+    path.write_text('#!/bin/sh\n')
+    path.chmod(0o755)
+    return path
+
+
+def test_version_remembered(run: mocks.Run, juju_binary: pathlib.Path, cli_info_dir: pathlib.Path):
+    run.handle([str(juju_binary), 'version', '--format', 'json'], stdout='"2.9.52"\n')
+
+    assert jubilant.Juju(cli_binary=juju_binary).cli_version == '2.9.52'
+    assert jubilant.Juju(cli_binary=juju_binary).cli_version == '2.9.52'
+    assert len(run.calls) == 1
+
+    (entry,) = json.loads((cli_info_dir / 'cli-info.json').read_text()).items()
+    assert entry[0].startswith(f'{os.path.realpath(juju_binary)}:')
+    assert entry[1] == {'version': '2.9.52'}
+
+
+def test_binary_changed(run: mocks.Run, juju_binary: pathlib.Path, cli_info_dir: pathlib.Path):
+    run.handle([str(juju_binary), 'version', '--format', 'json'], stdout='"2.9.52"\n')
+    jubilant.Juju(cli_binary=juju_binary)
+
+    juju_binary.write_text('#!/bin/sh\n# upgraded\n')
+    run.handle([str(juju_binary), 'version', '--format', 'json'], stdout='"3.6.8"\n')
+
+    assert jubilant.Juju(cli_binary=juju_binary).cli_version == '3.6.8'
+    assert len(run.calls) == 2
+    # The entry for the old binary is replaced.
+    entries = json.loads((cli_info_dir / 'cli-info.json').read_text())
+    assert [entry['version'] for entry in entries.values()] == ['3.6.8']
+
+
+def test_async_version_remembered(async_run: mocks.AsyncRun, juju_binary: pathlib.Path):
+    async_run.handle([str(juju_binary), 'version', '--format', 'json'], stdout='"2.9.52"\n')
+    async_run.handle([str(juju_binary), 'status', '--format', 'json'], stdout='{}')
+
+    for _ in range(2):
+        juju = jubilant.AsyncJuju(cli_binary=juju_binary)
+        asyncio.run(juju.cli('status', '--format', 'json'))
+        asyncio.run(juju._cli_major_version())
+
+    assert [call.args[1] for call in async_run.calls] == ['status', 'version', 'status']
+
+
+def test_supports(run: mocks.Run, juju_binary: pathlib.Path):
+    run.handle([str(juju_binary), 'version', '--format', 'json'], stdout='"2.9.52"\n')
+    run.handle([str(juju_binary), 'help', 'commands'], stdout=HELP_COMMANDS)
+    run.handle([str(juju_binary), 'deploy', '--help'], stdout=DEPLOY_HELP)
+    juju = jubilant.Juju(cli_binary=juju_binary)
+
+    assert juju.supports('wait-for')
+    assert not juju.supports('exec')
+    assert not juju.supports('exec', '--application')
+    assert juju.supports('deploy', '--overlay')
+    assert juju.supports('deploy', '--num-units')
+    assert not juju.supports('deploy', '--base')
+    calls = len(run.calls)
+
+    other = jubilant.Juju(cli_binary=juju_binary)
+    assert other.supports('wait-for')
+    assert other.supports('deploy', '--channel')
+    assert len(run.calls) == calls
+
+
+def test_binary_not_found(run: mocks.Run, cli_info_dir: pathlib.Path):
+    run.handle(['/nonexistent/juju', 'version', '--format', 'json'], stdout='"2.9.52"\n')
+
+    jubilant.Juju(cli_binary='/nonexistent/juju')
+    jubilant.Juju(cli_binary='/nonexistent/juju')
+
+    assert len(run.calls) == 2
+    assert not cli_info_dir.exists()
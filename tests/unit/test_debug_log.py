@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import pathlib
+import sys
+import time
+
+from jubilant_backports._debug_log import LogActivity
+
+FAKE_DEBUG_LOG = """\
+import sys, time
+for line in sys.argv[1:]:
+    print(line, flush=True)
+time.sleep(60)
+"""
+
+
+def _follow(tmp_path: pathlib.Path, *lines: str, settle: float = 0.0) -> LogActivity:
+    script = tmp_path / 'debug_log.py'
+    script.write_text(FAKE_DEBUG_LOG)
+    return LogActivity([sys.executable, str(script), *lines], settle=settle)
+
+
+def test_hook_activity(tmp_path: pathlib.Path):
+    activity = _follow(
+        tmp_path,
+        'machine-0: 12:00:00 INFO juju.worker.logger logger worker started',
+        'unit-ubuntu-0: 12:00:01 INFO juju.worker.uniter.operation ran "install" hook',
+    )
+    try:
+        assert activity.wait(30)
+        activity.clear()
+        assert not activity.wait(0.05)
+    finally:
+        activity.close()
+
+
+def test_no_activity(tmp_path: pathlib.Path):
+    activity = _follow(tmp_path, 'machine-0: 12:00:00 INFO juju.worker.logger logger started')
+    try:
+        assert not activity.wait(0.2)
+    finally:
+        activity.close()
+
+
+def test_command_fails():
+    activity = LogActivity([sys.executable, '-c', 'raise SystemExit(1)'])
+    try:
+        assert not activity.wait(0.05)
+    finally:
+        activity.close()
+
+
+def test_settle_within_timeout(tmp_path: pathlib.Path):
+    activity = _follow(tmp_path, 'unit-ubuntu-0: 12:00:01 INFO ran "install" hook', settle=60)
+    try:
+        assert activity._event.wait(30)
+        start = time.monotonic()
+        assert activity.wait(0.1)
+        assert time.monotonic() - start < 5
+    finally:
+        activity.close()
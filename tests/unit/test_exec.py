@@ -1,3 +1,5 @@
+import json
+
 import pytest
 
 import jubilant_backports as jubilant
@@ -28,3 +30,85 @@ def test_wait_timeout(juju_version: str, run: mocks.Run):
 
     with pytest.raises(TimeoutError):
         juju.exec('sleep 1', unit='ubuntu/0', wait=0.001)
+
+
+EXEC_MULTIPLE_JSON29 = json.dumps(
+    [
+        {'unit': 'mysql/0', 'return-code': 0, 'stdout': 'db0\n'},
+        {'unit': 'mysql/1', 'return-code': 1, 'stderr': 'ERR'},
+        {'unit': 'ubuntu/0', 'return-code': 0, 'stdout': 'u0\n'},
+        {'machine': '3', 'return-code': 0, 'stdout': 'm3\n'},
+    ]
+)
+EXEC_MULTIPLE_JSON = json.dumps(
+    {
+        'mysql/0': {
+            'id': '1',
+            'status': 'completed',
+            'results': {'return-code': 0, 'stdout': 'db0\n'},
+        },
+        'mysql/1': {'id': '2', 'status': 'failed', 'results': {'return-code': 1, 'stderr': 'ERR'}},
+        'ubuntu/0': {
+            'id': '3',
+            'status': 'completed',
+            'results': {'return-code': 0, 'stdout': 'u0\n'},
+        },
+        '3': {'id': '4', 'status': 'completed', 'results': {'return-code': 0, 'stdout': 'm3\n'}},
+    }
+)
+
+
+@pytest.mark.parametrize(
+    'juju_version,stdout', [('2.9.52', EXEC_MULTIPLE_JSON29), ('3.6.8', EXEC_MULTIPLE_JSON)]
+)
+def test_exec_multiple(run: mocks.Run, juju_version: str, stdout: str):
+    run.handle(
+        [
+            'juju',
+            'exec',
+            '--format',
+            'json',
+            '--machine',
+            '3',
+            '--unit',
+            'ubuntu/0',
+            '--application',
+            'mysql',
+            '--',
+            'hostname',
+        ],
+        returncode=1,
+        stdout=stdout,
+        stderr='ERROR task failed',
+    )
+    juju = jubilant.Juju(cli_version=juju_version)
+
+    tasks = juju.exec_multiple('hostname', machines=[3], units=['ubuntu/0'], apps='mysql')
+
+    assert list(tasks) == ['mysql/0', 'mysql/1', 'ubuntu/0', '3']
+    assert {k: t.stdout for k, t in tasks.items() if t.success} == {
+        'mysql/0': 'db0\n',
+        'ubuntu/0': 'u0\n',
+        '3': 'm3\n',
+    }
+    assert not tasks['mysql/1'].success
+    assert tasks['mysql/1'].stderr == 'ERR'
+    assert len(run.calls) == 1
+
+
+def test_exec_multiple_missing_unit(run: mocks.Run):
+    run.handle(
+        ['juju', 'exec', '--format', 'json', '--unit', 'ubuntu/0,ubuntu/1', '--', 'true'],
+        stdout='[{"unit": "ubuntu/0", "return-code": 0}]',
+    )
+    juju = jubilant.Juju(cli_version='2.9.52')
+
+    with pytest.raises(ValueError, match="'ubuntu/1' not found"):
+        juju.exec_multiple('true', units=['ubuntu/0', 'ubuntu/1'])
+
+
+def test_exec_multiple_no_targets():
+    juju = jubilant.Juju(cli_version='3.6.8')
+
+    with pytest.raises(TypeError):
+        juju.exec_multiple('true', units=[])
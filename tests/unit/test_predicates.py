@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import pytest
+
+import jubilant_backports as jubilant
+
+from . import mocks
+from .fake_statuses import SNAPPASS_JSON, SNAPPASS_JSON29, SUBORDINATES_JSON29
+
+
+def always(status: Any) -> bool:
+    return True
+
+
+def never(status: Any) -> bool:
+    return False
+
+
+def has_nrpe(status: Any) -> bool:
+    return 'nrpe' in status.apps
+
+
+class Counter:
+    def __init__(self, result: bool):
+        self.result = result
+        self.calls = 0
+
+    def __call__(self, status: Any) -> bool:
+        self.calls += 1
+        return self.result
+
+
+def test_combinators():
+    status = jubilant.Status._from_dict(json.loads(SUBORDINATES_JSON29))
+    active = jubilant.Predicate(jubilant.all_active, 'ubuntu', 'ubun2')
+    blocked = jubilant.Predicate(jubilant.any_blocked)
+    idle = jubilant.Predicate(jubilant.all_agents_idle, 'nrpe')
+
+    assert active(status)
+    assert blocked(status)
+    assert not (active & ~blocked)(status)
+    assert (active & idle)(status)
+    assert (~active | blocked)(status)
+    assert not (~active | ~idle)(status)
+    assert (active & has_nrpe)(status)
+    assert (never | idle)(status)
+
+
+def test_memoised():
+    first = jubilant.Status._from_dict(json.loads(SUBORDINATES_JSON29))
+    second = jubilant.Status._from_dict(json.loads(SUBORDINATES_JSON29))
+    counter = Counter(True)
+    leaf = jubilant.Predicate(counter)
+    combined = leaf & ~leaf | leaf
+
+    assert combined(first)
+    assert combined(first)
+    assert counter.calls == 1
+    assert combined(second)
+    assert counter.calls == 2
+
+
+def test_short_circuits():
+    status = jubilant.Status._from_dict(json.loads(SUBORDINATES_JSON29))
+    counter = Counter(True)
+
+    assert not (jubilant.Predicate(never) & counter)(status)
+    assert (jubilant.Predicate(always) | counter)(status)
+    assert counter.calls == 0
+
+
+def test_repr():
+    predicate = jubilant.Predicate(jubilant.all_active, 'a', 'b') & ~jubilant.Predicate(
+        jubilant.any_error
+    )
+    assert repr(predicate) == "(all_active('a', 'b') & ~any_error())"
+    assert predicate.__qualname__ == repr(predicate)
+
+
+@pytest.mark.parametrize(
+    'version,input_status',
+    [
+        pytest.param('2.9.52', SNAPPASS_JSON29, id='2.9'),
+        pytest.param('3.6.8', SNAPPASS_JSON, id='3'),
+    ],
+)
+def test_wait(version: str, input_status: str, run: mocks.Run, time: mocks.Time):
+    run.handle(['juju', 'status', '--format', 'json'], stdout=input_status)
+    juju = jubilant.Juju(cli_version=version)
+    any_error = jubilant.Predicate(jubilant.any_error)
+
+    status = juju.wait(jubilant.Predicate(jubilant.all_active) & ~any_error, error=any_error)
+    assert status.apps['snappass-test'].is_active
+
+    with pytest.raises(jubilant.WaitError, match=r'any_active\(\)'):
+        juju.wait(jubilant.all_blocked, error=jubilant.Predicate(jubilant.any_active))
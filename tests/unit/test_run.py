@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import json
+
 import jubilant as real_jubilant
 import pytest
 
@@ -160,3 +162,113 @@ def test_failed29(run: mocks.Run):
         stderr='ERR',
         log=[],
     )
+
+
+def _operation_json(status0: str, status1: str, *, unit_tags: bool) -> str:
+    def host(unit: str) -> str:
+        return 'unit-' + unit.replace('/', '-') if unit_tags else unit
+
+    code = 'ReturnCode' if unit_tags else 'return-code'
+    return json.dumps(
+        {
+            'summary': 'backup run on mysql/0,mysql/1',
+            'status': 'running',
+            'tasks': {
+                '6': {'host': host('mysql/0'), 'status': status0, 'results': {code: 0}},
+                '7': {
+                    'host': host('mysql/1'),
+                    'status': status1,
+                    'results': {'path': '/b1', code: 0},
+                },
+            },
+        }
+    )
+
+
+QUEUED = """\
+Scheduled operation 5 with 2 tasks
+  - task 6 on unit-mysql-0
+  - task 7 on unit-mysql-1
+"""
+
+
+@pytest.mark.parametrize(
+    'juju_version,queue_args',
+    [('2.9.52', ['run-action']), ('3.6.8', ['run', '--background'])],
+)
+def test_run_multiple(
+    monkeypatch: pytest.MonkeyPatch,
+    run: mocks.Run,
+    time: mocks.Time,
+    juju_version: str,
+    queue_args: list[str],
+):
+    unit_tags = juju_version[0] == '2'
+    run.handle(['juju', *queue_args, 'mysql/0', 'mysql/1', 'backup'], stderr=QUEUED)
+    show = ['juju', 'show-operation', '5', '--format', 'json']
+    run.handle(show, stdout=_operation_json('completed', 'running', unit_tags=unit_tags))
+
+    def sleep(seconds: float):
+        time.sleep(seconds)
+        run.handle(show, stdout=_operation_json('completed', 'completed', unit_tags=unit_tags))
+
+    monkeypatch.setattr('time.sleep', sleep)
+    juju = jubilant.Juju(cli_version=juju_version)
+
+    tasks = juju.run_multiple(['mysql/0', 'mysql/1'], 'backup', delay=2)
+
+    assert list(tasks) == ['mysql/0', 'mysql/1']
+    assert [task.id for task in tasks.values()] == ['6', '7']
+    assert tasks['mysql/1'].results == {'path': '/b1'}
+    task_cls = jubilant.Task if unit_tags else real_jubilant.Task
+    assert all(isinstance(task, task_cls) for task in tasks.values())
+    assert [call.args[1] for call in run.calls] == [
+        queue_args[0],
+        'show-operation',
+        'show-operation',
+    ]
+    assert time.monotonic() == 2
+
+
+def test_run_multiple_no_task_lines(run: mocks.Run):
+    run.handle(
+        ['juju', 'run-action', 'mysql/0', 'mysql/1', 'backup'],
+        stderr='Scheduled operation 5 with 2 tasks\n',
+    )
+    run.handle(
+        ['juju', 'show-operation', '5', '--format', 'json'],
+        stdout=_operation_json('completed', 'completed', unit_tags=True),
+    )
+    juju = jubilant.Juju(cli_version='2.9.52')
+
+    tasks = juju.run_multiple(['mysql/0', 'mysql/1'], 'backup')
+
+    assert [task.id for task in tasks.values()] == ['6', '7']
+
+
+def test_run_multiple_failed(run: mocks.Run):
+    run.handle(['juju', 'run-action', 'mysql/0', 'mysql/1', 'backup'], stderr=QUEUED)
+    run.handle(
+        ['juju', 'show-operation', '5', '--format', 'json'],
+        stdout=_operation_json('failed', 'completed', unit_tags=True),
+    )
+    juju = jubilant.Juju(cli_version='2.9.52')
+
+    with pytest.raises(jubilant.MultiTaskError) as excinfo:
+        juju.run_multiple(['mysql/0', 'mysql/1'], 'backup')
+
+    assert list(excinfo.value.tasks) == ['mysql/0', 'mysql/1']
+    assert list(excinfo.value.failed) == ['mysql/0']
+    assert 'task error on 1 of 2 units' in str(excinfo.value)
+
+
+def test_run_multiple_timeout(run: mocks.Run, time: mocks.Time):
+    run.handle(['juju', 'run-action', 'mysql/0', 'mysql/1', 'backup'], stderr=QUEUED)
+    run.handle(
+        ['juju', 'show-operation', '5', '--format', 'json'],
+        stdout=_operation_json('completed', 'pending', unit_tags=True),
+    )
+    juju = jubilant.Juju(cli_version='2.9.52')
+
+    with pytest.raises(TimeoutError, match=r"\['mysql/1'\]"):
+        juju.run_multiple(['mysql/0', 'mysql/1'], 'backup', wait=5)
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import subprocess
+
+import pytest
+
+import jubilant_backports as jubilant
+
+from . import mocks
+from .fake_statuses import SNAPPASS_JSON29
+
+
+def test_fixed():
+    schedule = jubilant.FixedSchedule(2.5)
+    assert schedule.next_delay(changed=True) == 2.5
+    assert schedule.next_delay(changed=False) == 2.5
+
+
+def test_next_delay_required():
+    class NoDelay(jubilant.Schedule):
+        pass
+
+    with pytest.raises(TypeError):
+        NoDelay()  # type: ignore
+
+
+def test_backoff():
+    schedule = jubilant.BackoffSchedule(1, 5, jitter=0)
+    delays = [schedule.next_delay(changed=False) for _ in range(5)]
+    assert delays == [1, 2, 4, 5, 5]
+    assert schedule.next_delay(changed=True) == 1
+    assert schedule.next_delay(changed=False) == 2
+    schedule.reset()
+    assert schedule.next_delay(changed=False) == 1
+
+
+def test_backoff_jitter():
+    schedule = jubilant.BackoffSchedule(10, 10, jitter=0.2)
+    for _ in range(20):
+        assert 8 <= schedule.next_delay(changed=False) <= 12
+
+
+def test_adaptive():
+    schedule = jubilant.AdaptiveSchedule(0.5, 5, patience=2)
+    assert schedule.next_delay(changed=True) == 0.5
+    assert schedule.next_delay(changed=False) == 0.5
+    assert schedule.next_delay(changed=False) == 5
+    assert schedule.next_delay(changed=False) == 5
+    assert schedule.next_delay(changed=True) == 0.5
+    schedule.next_delay(changed=False)
+    schedule.reset()
+    assert schedule.next_delay(changed=False) == 0.5
+
+
+class SlowRun(mocks.Run):
+    """Each call takes *duration* seconds of mock time."""
+
+    def __init__(self, time: mocks.Time, duration: float):
+        super().__init__()
+        self.time = time
+        self.duration = duration
+
+    def __call__(
+        self,
+        args: list[str],
+        check: bool = False,
+        capture_output: bool = False,
+        encoding: str | None = None,
+        input: str | None = None,
+    ) -> subprocess.CompletedProcess[str]:
+        self.time.sleep(self.duration)
+        return super().__call__(args, check, capture_output, encoding, input)
+
+
+def test_wait_subtracts_cli_time(monkeypatch: pytest.MonkeyPatch, time: mocks.Time):
+    run = SlowRun(time, 0.25)
+    monkeypatch.setattr('subprocess.run', run)
+    run.handle(['juju', 'status', '--format', 'json'], stdout=SNAPPASS_JSON29)
+    juju = jubilant.Juju(cli_version='2.9.52')
+
+    juju.wait(jubilant.all_active)
+
+    # Polls start at 0, 1, and 2, and the last one takes 0.25s.
+    assert len(run.calls) == 3
+    assert time.monotonic() == 2.25
+
+
+def test_wait_deadline(run: mocks.Run, time: mocks.Time):
+    run.handle(['juju', 'status', '--format', 'json'], stdout=SNAPPASS_JSON29)
+    juju = jubilant.Juju(cli_version='2.9.52')
+
+    with pytest.raises(TimeoutError):
+        juju.wait(jubilant.all_blocked, timeout=10, schedule=jubilant.FixedSchedule(4))
+
+    # Polls at 0, 4, and 8, then a 2s sleep rather than 4s.
+    assert len(run.calls) == 3
+    assert time.monotonic() == 10
+
+
+def test_wait_schedule(run: mocks.Run, time: mocks.Time):
+    run.handle(['juju', 'status', '--format', 'json'], stdout=SNAPPASS_JSON29)
+    juju = jubilant.Juju(cli_version='2.9.52')
+    schedule = jubilant.BackoffSchedule(1, 10, jitter=0)
+
+    with pytest.raises(TimeoutError):
+        juju.wait(jubilant.all_blocked, timeout=20, schedule=schedule)
+
+    # The first status counts as a change; polls at 0, 1, 3, 7, and 15.
+    assert len(run.calls) == 5
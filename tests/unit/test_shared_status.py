@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import json
+import pathlib
+import subprocess
+import sys
+import threading
+
+import pytest
+
+import jubilant_backports as jubilant
+from jubilant_backports._shared_status import SharedStatusFile
+
+from . import mocks
+from .fake_statuses import MINIMAL_JSON29, MINIMAL_STATUS29
+
+
+def _not_called() -> str:
+    raise AssertionError('follower ran juju status')
+
+
+def test_follower_reads_leader_snapshots(tmp_path: pathlib.Path):
+    outputs = iter(['S1', 'S2'])
+    leader = SharedStatusFile(tmp_path, lambda: next(outputs))
+    follower = SharedStatusFile(tmp_path, _not_called, poll_interval=0.001)
+
+    assert leader.fetch() == 'S1'
+    assert leader.leader
+    assert follower.fetch() == 'S1'
+    assert not follower.leader
+
+    # The follower blocks until there's a new snapshot.
+    results: list[str] = []
+    thread = threading.Thread(target=lambda: results.append(follower.fetch()))
+    thread.start()
+    thread.join(0.05)
+    assert thread.is_alive()
+    assert leader.fetch() == 'S2'
+    thread.join()
+    assert results == ['S2']
+
+    leader.close()
+    follower.close()
+
+
+def test_takeover(tmp_path: pathlib.Path):
+    leader = SharedStatusFile(tmp_path, lambda: 'S1')
+    follower = SharedStatusFile(tmp_path, lambda: 'S2', takeover_after=0.01, poll_interval=0.001)
+    leader.fetch()
+    assert follower.fetch() == 'S1'
+
+    leader.close()
+
+    assert follower.fetch() == 'S2'
+    assert follower.leader
+    assert (tmp_path / 'status').read_text() == '2\nS2'
+    follower.close()
+
+
+def test_lock_released_when_process_exits(tmp_path: pathlib.Path):
+    code = f"""
+from jubilant_backports._shared_status import SharedStatusFile
+SharedStatusFile({str(tmp_path)!r}, lambda: 'S1').fetch()
+"""
+    subprocess.run([sys.executable, '-c', code], check=True)
+    other = SharedStatusFile(tmp_path, lambda: 'S2', takeover_after=0.01, poll_interval=0.001)
+
+    # The lock was released, so the next process takes over, continuing the sequence.
+    assert other.fetch() == 'S2'
+    assert other.leader
+    assert (tmp_path / 'status').read_text() == '2\nS2'
+    other.close()
+
+
+def test_juju_shared_broker(run: mocks.Run, tmp_path: pathlib.Path):
+    run.handle(['juju', 'status', '--model', 'mdl', '--format', 'json'], stdout=MINIMAL_JSON29)
+    juju = jubilant.Juju(model='mdl', cli_version='2.9.52')
+    juju.__dict__['_temp_dir'] = str(tmp_path)
+
+    with juju.status_broker(interval=3600, shared=True):
+        assert juju.status() == MINIMAL_STATUS29
+
+    (status_dir,) = tmp_path.iterdir()
+    assert status_dir.name.startswith('jubilant-status-')
+    assert (status_dir / 'status').read_text().endswith(MINIMAL_JSON29)
+
+
+def _write_juju_data(path: pathlib.Path, controller_uuid: str, model_uuid: str):
+    path.mkdir()
+    controllers = {'controllers': {'ctl': {'uuid': controller_uuid}}, 'current-controller': 'ctl'}
+    (path / 'controllers.yaml').write_text(json.dumps(controllers))
+    models = {'models': {'admin/mdl': {'uuid': model_uuid}}, 'current-model': 'admin/mdl'}
+    (path / 'models.yaml').write_text(json.dumps({'controllers': {'ctl': models}}))
+    (path / 'accounts.yaml').write_text(json.dumps({'controllers': {'ctl': {'user': 'admin'}}}))
+
+
+def test_shared_status_key(monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path):
+    _write_juju_data(tmp_path / 'a', 'c1', 'm1')
+    _write_juju_data(tmp_path / 'b', 'c2', 'm2')
+
+    monkeypatch.setenv('JUJU_DATA', str(tmp_path / 'a'))
+    key_a = jubilant.Juju(cli_version='3.6.1')._shared_status_key()
+    assert key_a == ('c1', 'm1')
+    assert jubilant.Juju(model='mdl', cli_version='3.6.1')._shared_status_key() == key_a
+    assert jubilant.Juju(model='ctl:admin/mdl', cli_version='3.6.1')._shared_status_key() == key_a
+
+    monkeypatch.setenv('JUJU_DATA', str(tmp_path / 'b'))
+    assert jubilant.Juju(cli_version='3.6.1')._shared_status_key() == ('c2', 'm2')
+
+    # Models that aren't in the client's files are told apart by the data directory.
+    monkeypatch.setenv('JUJU_DATA', str(tmp_path / 'c'))
+    assert jubilant.Juju(model='x', cli_version='3.6.1')._shared_status_key() == (
+        str(tmp_path / 'c'),
+        'juju',
+        'x',
+    )
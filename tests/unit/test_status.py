@@ -1,5 +1,5 @@
 import dataclasses
-from typing import Union
+from typing import List, Union
 
 import jubilant as real_jubilant
 import pytest
@@ -97,3 +97,20 @@ def test_status_eq(input_status: Union[jubilant.Status, real_jubilant.Status]):
     )
     assert status1 == status1b
     assert status1 == status2
+
+
+@pytest.mark.parametrize('version', ['2.9.52', '3.6.8'])
+@pytest.mark.parametrize(
+    'apps,args',
+    [
+        pytest.param('snappass-test', ['snappass-test'], id='str'),
+        pytest.param(['snappass-test', 'mysql/0'], ['snappass-test', 'mysql/0'], id='list'),
+    ],
+)
+def test_filtered(version: str, apps: Union[str, List[str]], args: List[str], run: mocks.Run):
+    run.handle(['juju', 'status', '--format', 'json', *args], stdout=SNAPPASS_JSON29)
+    juju = jubilant.Juju(cli_version=version)
+
+    status = juju.status(apps=apps)
+
+    assert status.apps['snappass-test'].is_active
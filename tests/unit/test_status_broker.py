@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+import jubilant as real_jubilant
+import pytest
+
+import jubilant_backports as jubilant
+from jubilant_backports import _juju
+
+from . import mocks
+from .fake_statuses import MINIMAL_JSON29, MINIMAL_STATUS29, SNAPPASS_JSON29
+
+
+def test_single_flight():
+    started = threading.Event()
+    release = threading.Event()
+    calls: list[int] = []
+
+    def fetch() -> str:
+        calls.append(1)
+        started.set()
+        release.wait()
+        return MINIMAL_JSON29
+
+    broker = jubilant.StatusBroker(fetch, lambda stdout, previous: MINIMAL_STATUS29)
+    results: list[str] = []
+    leader = threading.Thread(target=lambda: results.append(broker.fetch_raw()))
+    leader.start()
+    started.wait()
+    followers = [
+        threading.Thread(target=lambda: results.append(broker.fetch_raw())) for _ in range(5)
+    ]
+    for thread in followers:
+        thread.start()
+    while broker.coalesced < 5:
+        threading.Event().wait(0.001)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join()
+
+    assert len(calls) == 1
+    assert broker.fetches == 1
+    assert results == [MINIMAL_JSON29] * 6
+
+
+def test_subscribers(caplog: pytest.LogCaptureFixture):
+    outputs = [MINIMAL_JSON29, MINIMAL_JSON29, SNAPPASS_JSON29]
+    parsed: list[str] = []
+
+    def parse(stdout: str, previous: object) -> jubilant.Status:
+        parsed.append(stdout)
+        return MINIMAL_STATUS29
+
+    broker = jubilant.StatusBroker(lambda: outputs.pop(0), parse)
+    received: list[jubilant.Status | real_jubilant.Status] = []
+    unsubscribe = broker.subscribe(received.append)
+
+    def bad_subscriber(status: object):
+        raise RuntimeError('oops')
+
+    broker.subscribe(bad_subscriber)
+    broker.status()
+    broker.status()
+
+    # The second status is the same, so it isn't parsed again or pushed.
+    assert parsed == [MINIMAL_JSON29]
+    assert len(received) == 1
+    assert 'oops' in caplog.text
+
+    unsubscribe()
+    broker.status()
+    assert parsed == [MINIMAL_JSON29, SNAPPASS_JSON29]
+    assert len(received) == 1
+
+    late: list[jubilant.Status | real_jubilant.Status] = []
+    broker.subscribe(late.append)
+    assert late == [MINIMAL_STATUS29]
+
+
+def test_parse_error_reaches_followers():
+    started = threading.Event()
+    release = threading.Event()
+
+    def fetch() -> str:
+        started.set()
+        release.wait()
+        return 'not json'
+
+    def parse(stdout: str, previous: object) -> jubilant.Status:
+        raise ValueError('bad status')
+
+    broker = jubilant.StatusBroker(fetch, parse)
+    errors: list[Exception] = []
+
+    def status():
+        try:
+            broker.status()
+        except ValueError as exc:
+            errors.append(exc)
+
+    leader = threading.Thread(target=status)
+    leader.start()
+    started.wait()
+    follower = threading.Thread(target=status)
+    follower.start()
+    while broker.coalesced < 1:
+        threading.Event().wait(0.001)
+    release.set()
+    leader.join()
+    follower.join()
+
+    assert [str(e) for e in errors] == ['bad status', 'bad status']
+
+
+def test_poller_survives_errors(caplog: pytest.LogCaptureFixture):
+    polled = threading.Event()
+    outputs = ['not json', MINIMAL_JSON29]
+
+    def parse(stdout: str, previous: object) -> jubilant.Status:
+        if stdout != MINIMAL_JSON29:
+            raise ValueError('bad status')
+        return MINIMAL_STATUS29
+
+    with jubilant.StatusBroker(lambda: outputs.pop(0), parse, interval=0.001) as broker:
+        broker.subscribe(lambda status: polled.set())
+        broker.start()
+        assert polled.wait(5)
+
+    assert 'bad status' in caplog.text
+
+
+def test_juju_routes_through_broker(run: mocks.Run):
+    run.handle(['juju', 'status', '--model', 'mdl', '--format', 'json'], stdout=MINIMAL_JSON29)
+    run.handle(['juju', 'status', '--model', 'other', '--format', 'json'], stdout=MINIMAL_JSON29)
+    juju = jubilant.Juju(model='mdl', cli_version='2.9.52')
+    first = threading.Event()
+
+    with juju.status_broker(interval=3600) as broker:
+        broker.subscribe(lambda status: first.set())
+        first.wait()
+        assert broker.fetches == 1
+        assert juju.status_broker() is broker
+
+        assert juju.status() == MINIMAL_STATUS29
+        assert jubilant.Juju(model='mdl', cli_version='2.9.52').status() == MINIMAL_STATUS29
+        jubilant.Juju(model='other', cli_version='2.9.52').status()
+        juju.wait(lambda status: True, successes=1)
+        assert broker.fetches == 4
+
+    assert len(run.calls) == 5
+    juju.status()
+    assert broker.fetches == 4
+
+
+def test_wait_reuses_broker_status(run: mocks.Run, monkeypatch: pytest.MonkeyPatch):
+    run.handle(['juju', 'status', '--model', 'mdl', '--format', 'json'], stdout=MINIMAL_JSON29)
+    juju = jubilant.Juju(model='mdl', cli_version='2.9.52')
+    parsed: list[Any] = []
+    parse_status = _juju._parse_status
+
+    def counting_parse_status(*args: Any, **kwargs: Any) -> Any:
+        status = parse_status(*args, **kwargs)
+        parsed.append(status)
+        return status
+
+    monkeypatch.setattr(_juju, '_parse_status', counting_parse_status)
+
+    with juju.status_broker(interval=3600):
+        status = juju.wait(lambda status: True, successes=1)
+
+    # The broker parsed the status, and wait used that rather than parsing it again.
+    assert len(parsed) == 1
+    assert status is parsed[0]
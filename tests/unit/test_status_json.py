@@ -0,0 +1,107 @@
+import json
+from typing import Any, Dict, Optional, Tuple
+
+import pytest
+
+from jubilant_backports._status_json import (
+    _split,
+    controller_timestamp,
+    fingerprint,
+    loads_sections,
+)
+
+from .fake_statuses import (
+    MINIMAL_JSON29,
+    SNAPPASS_JSON29,
+    STATUS_ERRORS_JSON,
+    STATUS_ERRORS_JSON29,
+    SUBORDINATES_JSON29,
+)
+
+TRICKY: Dict[str, Any] = {
+    'model': {'name': 'm"machines": {', 'message': 'back\\'},
+    'machines': {
+        '0': {
+            'message': '}}] "applications": [',
+            'lxd-profiles': {'p': {'devices': {'applications': {'storage': '{'}}}},
+        },
+    },
+    'applications': {'a': {'message': '\\\\"', 'storage': {'controller': '['}}},
+    'storage': {'storage': {'data/0': {'storage': 'data'}}},
+    'controller': {'timestamp': '"{'},
+}
+
+
+@pytest.mark.parametrize(
+    'text',
+    [
+        MINIMAL_JSON29,
+        SNAPPASS_JSON29,
+        STATUS_ERRORS_JSON,
+        STATUS_ERRORS_JSON29,
+        SUBORDINATES_JSON29,
+    ],
+)
+def test_matches_json_loads(text: str):
+    assert _split(text) is not None
+    assert dict(loads_sections(text)) == json.loads(text)
+
+
+@pytest.mark.parametrize('separators', [(',', ':'), (', ', ': ')])
+@pytest.mark.parametrize('indent', [None, 2])
+def test_tricky_strings(separators: Tuple[str, str], indent: Optional[int]):
+    text = json.dumps(TRICKY, indent=indent, separators=separators)
+    sections = _split(text)
+    assert sections is not None
+    assert list(sections) == ['model', 'machines', 'applications', 'storage', 'controller']
+    assert dict(loads_sections(text)) == TRICKY
+
+
+def test_decodes_on_access():
+    d = loads_sections(json.dumps(TRICKY))
+    assert d['model'] == TRICKY['model']
+    assert 'machines' not in vars(d)['_decoded']
+    assert d['machines'] is d['machines']
+
+
+@pytest.mark.parametrize(
+    'text',
+    [
+        '{}',
+        '[]',
+        '{"model": {}}',
+        '{"machines": {}, "model": {}, "applications": {}}',
+    ],
+)
+def test_falls_back(text: str):
+    assert _split(text) is None
+    assert loads_sections(text) == json.loads(text)
+
+
+def test_bad_split_decodes_all():
+    # An unknown top-level key lands inside the previous section, which fails to decode.
+    text = '{"model": {}, "new": 1, "machines": {"0": {}}, "applications": {}}'
+    d = loads_sections(text)
+    assert d['model'] == {}
+    assert d['machines'] == {'0': {}}
+
+
+def test_fingerprint():
+    later = SNAPPASS_JSON29.replace('21:24:58', '21:25:03').replace('21:19:06', '21:25:01')
+    assert later != SNAPPASS_JSON29
+    assert fingerprint(later) == fingerprint(SNAPPASS_JSON29)
+    assert '21:' not in fingerprint(SNAPPASS_JSON29)
+    # With since=False, only the controller timestamp is ignored.
+    assert fingerprint(later, since=False) != fingerprint(SNAPPASS_JSON29, since=False)
+    same_since = SNAPPASS_JSON29.replace('21:24:58', '21:25:03')
+    assert fingerprint(same_since, since=False) == fingerprint(SNAPPASS_JSON29, since=False)
+    # Real changes still change the fingerprint.
+    blocked = SNAPPASS_JSON29.replace('"active"', '"blocked"')
+    assert fingerprint(blocked) != fingerprint(SNAPPASS_JSON29)
+
+
+def test_controller_timestamp():
+    assert controller_timestamp(SNAPPASS_JSON29) == '21:24:58+12:00'
+    compact = json.dumps(json.loads(SUBORDINATES_JSON29), separators=(',', ':'))
+    assert controller_timestamp(compact) == '22:25:16+12:00'
+    assert controller_timestamp('{"model": {}}') is None
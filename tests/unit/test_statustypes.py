@@ -1,9 +1,16 @@
+import concurrent.futures
+import copy
+import dataclasses
 import json
+import pickle
 
 import jubilant as real_jubilant
 import pytest
 
 import jubilant_backports as jubilant
+from jubilant_backports._juju import _status_diff
+from jubilant_backports._status_json import loads_sections
+from jubilant_backports.statustypes import _same_content
 
 from .fake_statuses import (
     STATUS_ERRORS_JSON,
@@ -144,3 +151,207 @@ def test_get_units(
     assert units[nrpe2].public_address == addr2
 
     assert status.get_units('foo') == {}
+
+
+def test_indexes():
+    d = json.loads(SUBORDINATES_JSON29)
+    container = copy.deepcopy(d['machines']['1'])
+    container['containers'] = {'1/lxd/0/lxd/0': copy.deepcopy(d['machines']['1'])}
+    d['machines']['1']['containers'] = {'1/lxd/0': container}
+    status = jubilant.Status._from_dict(d)
+
+    assert status._unit_apps == {
+        'nrpe/0': 'nrpe',
+        'nrpe/1': 'nrpe',
+        'ubun2/0': 'ubun2',
+        'ubuntu/0': 'ubuntu',
+    }
+    machine_units = {m: sorted(units) for m, units in status._machine_units.items()}
+    assert machine_units == {'0': ['nrpe/1', 'ubuntu/0'], '1': ['nrpe/0', 'ubun2/0']}
+    assert status._parent_machines == {'1/lxd/0': '1', '1/lxd/0/lxd/0': '1/lxd/0'}
+
+
+def test_get_units_copy():
+    status = jubilant.Status._from_dict(json.loads(SUBORDINATES_JSON29))
+
+    units = status.get_units('nrpe')
+    units.clear()
+    units['x/0'] = status.apps['ubuntu'].units['ubuntu/0']
+
+    assert sorted(status.get_units('nrpe')) == ['nrpe/0', 'nrpe/1']
+    assert status._unit_apps['nrpe/0'] == 'nrpe'
+
+
+@pytest.mark.parametrize(
+    'input_status',
+    [
+        pytest.param(SUBORDINATES_JSON29, id='subordinates'),
+        pytest.param(STATUS_ERRORS_JSON29, id='errors'),
+    ],
+)
+def test_lazy_matches_eager(input_status: str):
+    eager = jubilant.Status._from_dict(json.loads(input_status))
+    lazy = jubilant.Status._from_dict(json.loads(input_status), lazy=True)
+
+    assert lazy == eager
+    assert repr(lazy) == repr(eager)
+    for app in eager.apps:
+        assert lazy.get_units(app) == eager.get_units(app)
+
+
+def test_lazy_builds_on_access():
+    status = jubilant.Status._from_dict(json.loads(SUBORDINATES_JSON29), lazy=True)
+    assert 'apps' not in vars(status)
+    assert 'machines' not in vars(status)
+
+    app = status.apps['ubuntu']
+    assert 'apps' in vars(status)
+    assert 'machines' not in vars(status)
+    assert 'units' in app._pending
+
+    assert sorted(app.units) == ['ubuntu/0']
+    assert 'units' not in app._pending
+    assert status.apps['ubuntu'] is app
+
+
+def test_lazy_copy_and_pickle():
+    status = jubilant.Status._from_dict(json.loads(SUBORDINATES_JSON29), lazy=True)
+    copied = copy.copy(status)
+    assert copied.apps['ubuntu'].units['ubuntu/0'].leader
+    assert status.apps is copied.apps
+
+    status = jubilant.Status._from_dict(json.loads(SUBORDINATES_JSON29), lazy=True)
+    app = status.apps['ubuntu']
+    unpickled = pickle.loads(pickle.dumps(status))  # noqa: S301
+    assert unpickled == jubilant.Status._from_dict(json.loads(SUBORDINATES_JSON29))
+    assert '_pending' not in vars(unpickled)
+    assert copy.copy(app).units == app.units
+
+
+def test_lazy_threads():
+    with concurrent.futures.ThreadPoolExecutor(4) as executor:
+        for _ in range(200):
+            status = jubilant.Status._from_dict(json.loads(SUBORDINATES_JSON29), lazy=True)
+            futures = [executor.submit(getattr, status, 'apps') for _ in range(4)]
+            apps = [f.result() for f in futures]
+            assert all(a is apps[0] for a in apps)
+
+
+def test_slotted():
+    status = jubilant.Status._from_dict(json.loads(SUBORDINATES_JSON29))
+    app = status.apps['ubuntu']
+    unit = app.units['ubuntu/0']
+    for obj in [app, unit, status.machines['0'], status.model, unit.meter_status]:
+        assert not hasattr(obj, '__dict__')
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        unit.leader = False  # type: ignore
+
+    assert pickle.loads(pickle.dumps(status)) == status  # noqa: S301
+    assert copy.deepcopy(app) == app
+
+
+def test_previous_shares_unchanged():
+    prev = jubilant.Status._from_dict(json.loads(SUBORDINATES_JSON29), lazy=True)
+    assert prev.apps['ubuntu'].units and prev.apps['ubun2'].units and prev.machines
+
+    d = json.loads(SUBORDINATES_JSON29)
+    d['controller']['timestamp'] = '22:25:17+12:00'
+    d['applications']['ubuntu']['units']['ubuntu/0']['workload-status']['current'] = 'blocked'
+    status = jubilant.Status._from_dict(d, lazy=True, previous=prev)
+
+    assert status.machines['0'] is prev.machines['0']
+    assert status.apps['nrpe'] is prev.apps['nrpe']
+    assert status.apps['ubun2'] is prev.apps['ubun2']
+    assert status.apps['ubuntu'] is not prev.apps['ubuntu']
+    assert status.apps['ubuntu'].units['ubuntu/0'].workload_status.current == 'blocked'
+    assert status != prev
+    assert status == jubilant.Status._from_dict(d)
+
+
+def test_previous_not_built():
+    prev = jubilant.Status._from_dict(json.loads(SUBORDINATES_JSON29), lazy=True)
+
+    status = jubilant.Status._from_dict(json.loads(SUBORDINATES_JSON29), lazy=True, previous=prev)
+
+    # Sections that weren't built in the previous status are built from scratch.
+    assert status.apps['ubuntu'] is not prev.apps['ubuntu']
+    assert status == prev
+
+
+def test_previous_sections_decoded_only_if_needed():
+    prev_d = loads_sections(SUBORDINATES_JSON29)
+    prev = jubilant.Status._from_dict(prev_d, lazy=True)
+    assert prev.apps
+
+    changed = json.loads(SUBORDINATES_JSON29)
+    changed['machines']['1']['hostname'] = 'changed'
+    d = loads_sections(json.dumps(changed, indent=2))
+    status = jubilant.Status._from_dict(d, lazy=True, previous=prev)
+
+    # The previous machines weren't built, so there's nothing to reuse and no need to decode.
+    assert status.machines['1'].hostname == 'changed'
+    assert 'machines' not in prev_d._decoded  # type: ignore
+    # The applications section is unchanged, so its objects are reused without decoding it.
+    text = loads_sections(SUBORDINATES_JSON29)
+    again = jubilant.Status._from_dict(text, lazy=True, previous=prev)
+    assert again.apps['ubuntu'] is prev.apps['ubuntu']
+    assert 'applications' not in text._decoded  # type: ignore
+
+
+def test_fingerprints():
+    d = json.loads(SUBORDINATES_JSON29)
+    prev = jubilant.Status._from_dict(d, lazy=True)
+    d = json.loads(SUBORDINATES_JSON29)
+    d['applications']['ubuntu']['application-status']['since'] = '16 Jul 2025 22:21:35+12:00'
+    d['machines']['1']['hostname'] = 'changed'
+    status = jubilant.Status._from_dict(d, lazy=True)
+
+    assert _same_content(status.apps['ubuntu'], prev.apps['ubuntu'])
+    assert status.apps['ubuntu'] != prev.apps['ubuntu']  # 'since' still counts for equality
+    assert _same_content(status.machines['0'], prev.machines['0'])
+    assert not _same_content(status.machines['1'], prev.machines['1'])
+    assert status != prev
+
+    eager = jubilant.Status._from_dict(json.loads(SUBORDINATES_JSON29))
+    assert _same_content(eager.apps['ubuntu'], prev.apps['ubuntu']) is None
+    assert eager == prev
+
+
+def test_equal_by_fingerprint():
+    a = jubilant.Status._from_dict(json.loads(SUBORDINATES_JSON29), lazy=True)
+    b = jubilant.Status._from_dict(json.loads(SUBORDINATES_JSON29), lazy=True)
+
+    assert a == b
+    # Matching fingerprints are enough, so the apps' units weren't built to compare them.
+    assert 'units' in a.apps['ubuntu']._pending
+    assert 'units' in b.apps['ubuntu']._pending
+
+
+def test_equal_fingerprint_collision():
+    # hash(-1) == hash(-2) in CPython, so these mustn't be compared by hash().
+    d1 = json.loads(SUBORDINATES_JSON29)
+    d1['applications']['ubuntu']['charm-rev'] = -1
+    d2 = json.loads(SUBORDINATES_JSON29)
+    d2['applications']['ubuntu']['charm-rev'] = -2
+
+    lazy1 = jubilant.Status._from_dict(d1, lazy=True)
+    lazy2 = jubilant.Status._from_dict(d2, lazy=True)
+
+    assert lazy1 != lazy2
+    assert _same_content(lazy1.apps['ubuntu'], lazy2.apps['ubuntu']) is False
+    assert jubilant.Status._from_dict(d1) != jubilant.Status._from_dict(d2)
+
+
+def test_status_diff_skips_unchanged():
+    prev = jubilant.Status._from_dict(json.loads(SUBORDINATES_JSON29), lazy=True)
+    d = json.loads(SUBORDINATES_JSON29)
+    d['applications']['ubuntu']['application-status']['since'] = '16 Jul 2025 22:21:35+12:00'
+    d['applications']['nrpe']['application-status']['current'] = 'active'
+    status = jubilant.Status._from_dict(d, lazy=True)
+
+    diff = _status_diff(prev, status)
+
+    assert diff.splitlines() == [
+        "- .apps['nrpe'].app_status.current = 'blocked'",
+        "+ .apps['nrpe'].app_status.current = 'active'",
+    ]
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import jubilant as real_jubilant
+import pytest
+
+import jubilant_backports as jubilant
+
+from . import mocks
+
+
+def _operation(*tasks: tuple[str, str, str, list[str]], **results: Any) -> str:
+    return json.dumps(
+        {
+            'status': 'running',
+            'tasks': {
+                task_id: {'host': host, 'status': status, 'log': log, 'results': dict(results)}
+                for task_id, host, status, log in tasks
+            },
+        }
+    )
+
+
+def test_run_async(monkeypatch: pytest.MonkeyPatch, run: mocks.Run, time: mocks.Time):
+    run.handle(
+        ['juju', 'run-action', 'mysql/0', 'create-backup'],
+        stderr='Scheduled operation 5 with task 6\n',
+    )
+    show = ['juju', 'show-operation', '5', '--format', 'json']
+    outputs = [
+        _operation(('6', 'unit-mysql-0', 'running', ['starting'])),
+        _operation(('6', 'unit-mysql-0', 'running', ['starting', 'copying'])),
+        _operation(('6', 'unit-mysql-0', 'completed', ['starting', 'copying', 'done']), path='/b'),
+    ]
+    run.handle(show, stdout=outputs.pop(0))
+
+    def sleep(seconds: float):
+        time.sleep(seconds)
+        run.handle(show, stdout=outputs.pop(0))
+
+    monkeypatch.setattr('time.sleep', sleep)
+    juju = jubilant.Juju(cli_version='2.9.52')
+
+    handle = juju.run_async('mysql/0', 'create-backup')
+
+    assert handle.operation == '5'
+    assert handle.id == '6'
+    assert handle.status == 'pending'
+    assert len(run.calls) == 1
+    assert list(handle.logs()) == ['starting', 'copying', 'done']
+    assert handle.done()
+    task = handle.result()
+    assert task == jubilant.Task(
+        id='6', status='completed', results={'path': '/b'}, log=handle.log
+    )
+    assert [call.args[1] for call in run.calls].count('show-operation') == 3
+
+
+def test_result_failed_and_timeout(run: mocks.Run, time: mocks.Time):
+    run.handle(
+        ['juju', 'run', '--background', 'a/0', 'act'], stderr='Scheduled operation 1 with task 2'
+    )
+    run.handle(
+        ['juju', 'run', '--background', 'b/0', 'act'], stderr='Scheduled operation 3 with task 4'
+    )
+    run.handle(
+        ['juju', 'show-operation', '1', '--format', 'json'],
+        stdout=_operation(('2', 'a/0', 'failed', [])),
+    )
+    run.handle(
+        ['juju', 'show-operation', '3', '--format', 'json'],
+        stdout=_operation(('4', 'b/0', 'running', [])),
+    )
+    juju = jubilant.Juju(cli_version='3.6.8')
+
+    failing = juju.run_async('a/0', 'act')
+    slow = juju.run_async('b/0', 'act')
+
+    with pytest.raises(real_jubilant.TaskError):
+        failing.result()
+    with pytest.raises(TimeoutError):
+        slow.result(timeout=10)
+    assert time.monotonic() > 10
+
+
+def test_poll_tasks(run: mocks.Run):
+    run.handle(
+        ['juju', 'show-operation', '1', '--format', 'json'],
+        stdout=_operation(('2', 'unit-a-0', 'completed', []), ('3', 'unit-a-1', 'running', [])),
+    )
+    run.handle(
+        ['juju', 'show-operation', '4', '--format', 'json'],
+        stdout=_operation(('5', 'machine-0', 'running', ['x'])),
+    )
+    juju = jubilant.Juju(cli_version='2.9.52')
+    handles = [
+        jubilant.TaskHandle(juju, '1', '2'),
+        jubilant.TaskHandle(juju, '1', '3'),
+        jubilant.TaskHandle(juju, '4', '5', exec=True),
+    ]
+
+    juju.poll_tasks(handles)
+
+    assert [h.status for h in handles] == ['completed', 'running', 'running']
+    assert handles[2].log == ['x']
+    assert sorted(call.args[2] for call in run.calls) == ['1', '4']
+
+    calls = len(run.calls)
+    juju.poll_tasks(handles[:1])
+    assert len(run.calls) == calls
+
+
+def test_cancel(run: mocks.Run):
+    run.handle(
+        ['juju', 'show-operation', '1', '--format', 'json'],
+        stdout=_operation(('2', 'unit-a-0', 'running', [])),
+    )
+    run.handle(['juju', 'cancel-task', '2'])
+    juju = jubilant.Juju(cli_version='3.6.8')
+
+    assert jubilant.TaskHandle(juju, '1', '2').cancel()
+    assert run.calls[-1].args == ('juju', 'cancel-task', '2')
+
+
+@pytest.mark.parametrize('juju_version', ['2.9.52', '3.6.8'])
+def test_exec_async(run: mocks.Run, juju_version: str):
+    run.handle(
+        ['juju', 'exec', '--format', 'json', '--unit', 'ubuntu/0', '--background', '--', 'ls'],
+        stderr='Scheduled operation 7 with task 8\n',
+    )
+    results = {'return-code': 0, 'stdout': 'file\n'}
+    run.handle(
+        ['juju', 'show-operation', '7', '--format', 'json'],
+        stdout=_operation(('8', 'unit-ubuntu-0', 'completed', []), **results),
+    )
+    juju = jubilant.Juju(cli_version=juju_version)
+
+    task = juju.exec_async('ls', unit='ubuntu/0').result()
+
+    assert task.return_code == 0
+    assert task.stdout == 'file\n'
+    assert isinstance(task, jubilant.ExecTask) == (juju_version[0] == '2')
+
+
+def test_exec_async_juju29_keys(run: mocks.Run):
+    run.handle(
+        ['juju', 'exec', '--format', 'json', '--unit', 'ubuntu/0', '--background', '--', 'false'],
+        stderr='Scheduled operation 7 with task 8\n',
+    )
+    run.handle(
+        ['juju', 'show-operation', '7', '--format', 'json'],
+        stdout=_operation(('8', 'unit-ubuntu-0', 'completed', []), Code='1', Stderr='oops\n'),
+    )
+    juju = jubilant.Juju(cli_version='2.9.52')
+
+    with pytest.raises(jubilant.TaskError) as excinfo:
+        juju.exec_async('false', unit='ubuntu/0').result()
+    task = excinfo.value.task
+    assert isinstance(task, jubilant.ExecTask)
+    assert task.return_code == 1
+    assert task.stderr == 'oops\n'
+
+
+def test_result_repeated(run: mocks.Run):
+    run.handle(
+        ['juju', 'show-operation', '1', '--format', 'json'],
+        stdout=_operation(('2', 'unit-a-0', 'completed', []), ReturnCode=1, Stdout='out'),
+    )
+    juju = jubilant.Juju(cli_version='2.9.52')
+    handle = jubilant.TaskHandle(juju, '1', '2')
+
+    for _ in range(2):
+        with pytest.raises(jubilant.TaskError) as excinfo:
+            handle.result()
+        assert excinfo.value.task.return_code == 1
+        assert excinfo.value.task.stdout == 'out'
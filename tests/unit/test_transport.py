@@ -0,0 +1,365 @@
+from __future__ import annotations
+
+import pathlib
+from collections.abc import Generator
+from typing import Any
+
+import jubilant as real_jubilant
+import pytest
+
+import jubilant_backports as jubilant
+
+from . import mocks
+from .fake_api import FACADES, MODEL_UUID, APIServer
+
+FULL_STATUS: dict[str, Any] = {
+    'model': {
+        'name': 'mdl',
+        'type': 'caas',
+        'cloud-tag': 'cloud-microk8s',
+        'region': 'localhost',
+        'version': '3.6.1',
+        'model-status': {'status': 'available', 'since': '2025-02-24T12:02:57.5+13:00'},
+        'sla': 'unsupported',
+    },
+    'machines': {},
+    'applications': {
+        'snappass-test': {
+            'charm': 'ch:amd64/focal/snappass-test-9',
+            'base': {'name': 'ubuntu', 'channel': '20.04/stable'},
+            'charm-channel': 'latest/stable',
+            'int': 1,
+            'exposed': False,
+            'life': 'alive',
+            'status': {'status': 'active', 'info': 'snappass started'},
+            'units': {
+                'snappass-test/0': {
+                    'workload-status': {'status': 'active', 'info': 'snappass started'},
+                    'agent-status': {
+                        'status': 'idle',
+                        'since': '2025-02-23T23:03:18Z',
+                        'version': '3.6.1',
+                    },
+                    'leader': True,
+                    'address': '10.1.164.138',
+                },
+            },
+        },
+    },
+    'relations': [
+        {
+            'interface': 'snappass-peers',
+            'scope': 'global',
+            'endpoints': [{'application': 'snappass-test', 'name': 'peers', 'role': 'peer'}],
+        },
+    ],
+    'controller-timestamp': '2025-02-24T12:04:55.123456789+13:00',
+}
+
+
+@pytest.fixture
+def api(tmp_path: pathlib.Path) -> Generator[tuple[APIServer, jubilant.APITransport]]:
+    server = APIServer()
+    server.write_juju_data(tmp_path / 'juju')
+    transport = jubilant.APITransport(tmp_path / 'juju', tls=False)
+    yield server, transport
+    transport.close()
+    server.close()
+
+
+def _action_result(tag: str, receiver: str, status: str, **output: Any) -> dict[str, Any]:
+    return {
+        'action': {'tag': tag, 'receiver': receiver},
+        'status': status,
+        'output': output,
+        'log': [{'timestamp': '2025-02-24T12:05:00Z', 'message': 'working'}],
+    }
+
+
+def test_status(api: tuple[APIServer, jubilant.APITransport]):
+    server, transport = api
+    server.handle('Client', 'FullStatus', FULL_STATUS)
+    juju = jubilant.Juju(model='mdl', cli_version='3.6.1', transport=transport)
+
+    status = juju.status()
+    juju.status()
+
+    assert isinstance(status, real_jubilant.Status)
+    assert status.model.controller == 'ctl'
+    assert status.model.cloud == 'microk8s'
+    assert status.model.model_status.since == '24 Feb 2025 12:02:57+13:00'
+    app = status.apps['snappass-test']
+    assert app.charm == 'snappass-test'
+    assert app.charm_origin == 'charmhub'
+    assert app.charm_rev == 9
+    assert app.base == real_jubilant.statustypes.FormattedBase(name='ubuntu', channel='20.04')
+    assert app.scale == 1
+    assert app.is_active
+    assert app.relations['peers'][0].related_app == 'snappass-test'
+    unit = app.units['snappass-test/0']
+    assert unit.leader
+    assert unit.juju_status.since == '23 Feb 2025 23:03:18Z'
+    assert unit.juju_status.version == '3.6.1'
+    assert status.controller.timestamp == '12:04:55+13:00'
+
+    # One connection and login, then the status calls, each checking for storage first.
+    assert server.paths == [f'/model/{MODEL_UUID}/api']
+    assert [r[1] for r in server.requests] == [
+        'Login',
+        'ListStorageDetails',
+        'FullStatus',
+        'ListStorageDetails',
+        'FullStatus',
+    ]
+    assert server.requests[0][2]['credentials'] == 'hunter2'
+    assert (transport.api_calls, transport.fallback_calls) == (2, 0)
+
+
+def test_status_juju29_controller(api: tuple[APIServer, jubilant.APITransport]):
+    server, transport = api
+    full_status = {
+        'model': {**FULL_STATUS['model'], 'version': '2.9.52'},
+        'machines': {
+            '0': {
+                'agent-status': {'status': 'started'},
+                'instance-status': {'status': 'running'},
+                'series': 'focal',
+                'dns-name': '10.0.0.1',
+            },
+        },
+        'applications': {
+            'ubuntu': {
+                'charm': 'cs:ubuntu-21',
+                'series': 'focal',
+                'exposed': False,
+                'status': {'status': 'active'},
+            },
+            'ntp': {'charm': 'local:focal/ntp-3', 'series': 'focal', 'subordinate-to': ['ubuntu']},
+        },
+        'relations': [
+            {
+                'interface': 'juju-info',
+                'scope': 'container',
+                'endpoints': [
+                    {'application': 'ntp', 'name': 'juju-info', 'role': 'requirer'},
+                    {'application': 'ubuntu', 'name': 'juju-info', 'role': 'provider'},
+                ],
+            },
+        ],
+    }
+    server.handle('Client', 'FullStatus', full_status)
+    juju = jubilant.Juju(model='mdl', cli_version='2.9.52', transport=transport)
+
+    status = juju.status()
+
+    assert isinstance(status, jubilant.Status)
+    assert status.machines['0'].series == 'focal'
+    assert status.machines['0'].dns_name == '10.0.0.1'
+    assert status.apps['ubuntu'].charm_origin == 'charmstore'
+    assert status.apps['ubuntu'].os == 'ubuntu'
+    assert status.apps['ubuntu'].relations == {'juju-info': ['ntp']}
+    assert status.apps['ntp'].charm == 'local:focal/ntp-3'
+    assert status.apps['ntp'].charm_name == 'ntp'
+    assert status.apps['ntp'].subordinate_to == ['ubuntu']
+
+
+def test_run(api: tuple[APIServer, jubilant.APITransport], time: mocks.Time):
+    server, transport = api
+    server.handle(
+        'Action',
+        'EnqueueOperation',
+        {'operation': 'operation-1', 'actions': [{'action': {'tag': 'action-2'}}]},
+    )
+    results = [
+        _action_result('action-2', 'unit-mysql-0', 'running'),
+        _action_result('action-2', 'unit-mysql-0', 'completed', username='user0'),
+    ]
+
+    def actions(params: dict[str, Any]) -> dict[str, Any]:
+        return {'results': [results.pop(0)]}
+
+    server.handle('Action', 'Actions', actions)
+    juju = jubilant.Juju(model='mdl', cli_version='3.6.1', transport=transport)
+
+    task = juju.run('mysql/0', 'get-password', {'user': 'admin'})
+
+    assert task.id == '2'
+    assert task.status == 'completed'
+    assert task.results == {'username': 'user0'}
+    assert task.log == ['2025-02-24T12:05:00Z working']
+    enqueue = server.requests[1]
+    assert enqueue[:2] == ('Action', 'EnqueueOperation')
+    assert enqueue[2]['actions'] == [
+        {'receiver': 'unit-mysql-0', 'name': 'get-password', 'parameters': {'user': 'admin'}}
+    ]
+    assert [r[1] for r in server.requests[2:]] == ['Actions', 'Actions']
+    assert time.monotonic() > 0
+
+
+def test_run_failed(api: tuple[APIServer, jubilant.APITransport]):
+    server, transport = api
+    server.handle(
+        'Action',
+        'EnqueueOperation',
+        {'operation': 'operation-1', 'actions': [{'action': {'tag': 'action-2'}}]},
+    )
+    failed = {**_action_result('action-2', 'unit-mysql-0', 'failed'), 'message': 'oops'}
+    server.handle('Action', 'Actions', {'results': [failed]})
+    juju = jubilant.Juju(model='mdl', cli_version='3.6.1', transport=transport)
+
+    with pytest.raises(real_jubilant.TaskError) as excinfo:
+        juju.run('mysql/0', 'get-password')
+    assert excinfo.value.task.message == 'oops'
+
+
+def test_run_error(api: tuple[APIServer, jubilant.APITransport]):
+    server, transport = api
+    server.handle(
+        'Action',
+        'EnqueueOperation',
+        {'actions': [{'error': {'message': 'action "foo" not defined on unit "mysql/0"'}}]},
+    )
+    juju = jubilant.Juju(model='mdl', cli_version='3.6.1', transport=transport)
+
+    with pytest.raises(jubilant.CLIError) as excinfo:
+        juju.run('mysql/0', 'foo')
+    assert 'action "foo" not defined' in excinfo.value.stderr
+
+
+def test_exec(api: tuple[APIServer, jubilant.APITransport]):
+    server, transport = api
+    server.handle(
+        'Action',
+        'Run',
+        {'operation': 'operation-1', 'actions': [{'action': {'tag': 'action-2'}}]},
+    )
+    result = _action_result(
+        'action-2', 'unit-mysql-0', 'completed', **{'return-code': 0, 'stdout': 'hi\n'}
+    )
+    server.handle('Action', 'Actions', {'results': [result]})
+    juju = jubilant.Juju(model='mdl', cli_version='3.6.1', transport=transport)
+
+    task = juju.exec('echo', 'hi', unit='mysql/0', wait=5)
+
+    assert task.stdout == 'hi\n'
+    assert task.return_code == 0
+    assert server.requests[1] == (
+        'Action',
+        'Run',
+        {'commands': 'echo hi', 'timeout': 5_000_000_000, 'units': ['mysql/0']},
+    )
+
+
+def test_api_error(api: tuple[APIServer, jubilant.APITransport]):
+    server, transport = api
+    server.handle('Client', 'FullStatus', Exception('model "mdl" not found'))
+    juju = jubilant.Juju(model='mdl', cli_version='3.6.1', transport=transport)
+
+    with pytest.raises(jubilant.CLIError) as excinfo:
+        juju.status()
+    assert excinfo.value.stderr == 'ERROR model "mdl" not found\n'
+
+
+def test_fallback(api: tuple[APIServer, jubilant.APITransport], run: mocks.Run):
+    server, transport = api
+    run.handle(['juju', 'config', '--model', 'mdl', 'app'], stdout='{}')
+    run.handle(['juju', 'status', '--model', 'mdl', '--format', 'json', 'app'], stdout='{}')
+    run.handle(['juju', 'run-action', '--model', 'mdl', 'mysql/0', 'backup'], stdout='{}')
+    juju = jubilant.Juju(model='mdl', cli_version='3.6.1', transport=transport)
+    juju29 = jubilant.Juju(model='mdl', cli_version='2.9.52', transport=transport)
+
+    juju.cli('config', 'app')
+    juju.cli('status', '--format', 'json', 'app')
+    juju29.cli('run-action', 'mysql/0', 'backup')
+
+    assert len(run.calls) == 3
+    assert server.requests == []
+    assert (transport.api_calls, transport.fallback_calls) == (0, 3)
+
+
+def test_fallback_without_password(tmp_path: pathlib.Path, run: mocks.Run):
+    server = APIServer()
+    server.write_juju_data(tmp_path / 'juju', password=False)
+    run.handle(['juju', 'status', '--model', 'mdl', '--format', 'json'], stdout='{}')
+    transport = jubilant.APITransport(tmp_path / 'juju', tls=False)
+    juju = jubilant.Juju(model='mdl', cli_version='3.6.1', transport=transport)
+
+    try:
+        juju.cli('status', '--format', 'json')
+        juju.cli('status', '--format', 'json')
+    finally:
+        transport.close()
+        server.close()
+
+    assert len(run.calls) == 2
+    assert server.paths == []
+    assert transport.fallback_calls == 2
+
+
+def test_idle_connection_checked(api: tuple[APIServer, jubilant.APITransport], time: mocks.Time):
+    server, transport = api
+    server.handle('Client', 'FullStatus', FULL_STATUS)
+    juju = jubilant.Juju(model='mdl', cli_version='3.6.1', transport=transport)
+
+    juju.status()
+    time.sleep(60)
+    juju.status()
+    server.handle('Pinger', 'Ping', Exception('connection is shut down'))
+    time.sleep(60)
+    juju.status()
+
+    # The failed ping means a new connection, with a new login.
+    assert [r[1] for r in server.requests if r[1] != 'ListStorageDetails'] == [
+        'Login',
+        'FullStatus',
+        'Ping',
+        'FullStatus',
+        'Ping',
+        'Login',
+        'FullStatus',
+    ]
+    assert len(server.paths) == 2
+
+
+def test_status_with_storage(api: tuple[APIServer, jubilant.APITransport], run: mocks.Run):
+    server, transport = api
+    storage = {'storage-tag': 'storage-data-0', 'kind': 2, 'status': {'status': 'attached'}}
+    server.handle('Storage', 'ListStorageDetails', {'results': [{'result': [storage]}]})
+    run.handle(['juju', 'status', '--model', 'mdl', '--format', 'json'], stdout='{}')
+    juju = jubilant.Juju(model='mdl', cli_version='3.6.1', transport=transport)
+
+    juju.cli('status', '--format', 'json')
+
+    # The API status wouldn't have the storage, so the CLI is used.
+    assert len(run.calls) == 1
+    assert [r[1] for r in server.requests] == ['Login', 'ListStorageDetails']
+    assert (transport.api_calls, transport.fallback_calls) == (0, 1)
+
+
+def test_connect_retried(
+    api: tuple[APIServer, jubilant.APITransport], run: mocks.Run, time: mocks.Time
+):
+    server, transport = api
+    server.handle('Admin', 'Login', Exception('controller is busy'))
+    server.handle('Client', 'FullStatus', FULL_STATUS)
+    run.handle(['juju', 'status', '--model', 'mdl', '--format', 'json'], stdout='{}')
+    juju = jubilant.Juju(model='mdl', cli_version='3.6.1', transport=transport)
+
+    juju.cli('status', '--format', 'json')
+    server.handle('Admin', 'Login', {'facades': FACADES, 'server-version': '3.6.1'})
+    juju.cli('status', '--format', 'json')
+    assert len(server.paths) == 1
+
+    # After a while, the API is tried again.
+    time.sleep(60)
+    juju.cli('status', '--format', 'json')
+    assert len(server.paths) == 2
+    assert (transport.api_calls, transport.fallback_calls) == (1, 2)
+
+
+def test_run_required():
+    class NoRun(jubilant.Transport):
+        pass
+
+    with pytest.raises(TypeError):
+        NoRun()  # type: ignore
@@ -0,0 +1,302 @@
+from __future__ import annotations
+
+import subprocess
+import time as time_module
+
+import pytest
+
+import jubilant_backports as jubilant
+
+from . import mocks
+from .fake_statuses import SNAPPASS_JSON, SNAPPASS_JSON29
+
+
+def test_ready(run: mocks.Run, time: mocks.Time):
+    run.handle(['juju', 'status', '--format', 'json'], stdout=SNAPPASS_JSON29)
+    juju = jubilant.Juju(cli_version='2.9.52')
+
+    status = juju.wait(jubilant.all_active)
+
+    assert status.apps['snappass-test'].is_active
+    assert len(run.calls) == 3
+    assert time.monotonic() == 2
+
+
+def test_error(run: mocks.Run, time: mocks.Time):
+    run.handle(['juju', 'status', '--format', 'json'], stdout=SNAPPASS_JSON29)
+    juju = jubilant.Juju(cli_version='2.9.52')
+
+    with pytest.raises(jubilant.WaitError):
+        juju.wait(jubilant.all_blocked, error=jubilant.any_active)
+
+    assert len(run.calls) == 1
+
+
+def test_timeout(run: mocks.Run, time: mocks.Time):
+    run.handle(['juju', 'status', '--format', 'json'], stdout=SNAPPASS_JSON29)
+    juju = jubilant.Juju(cli_version='2.9.52')
+
+    with pytest.raises(TimeoutError):
+        juju.wait(jubilant.all_blocked, timeout=5)
+
+    assert len(run.calls) == 5
+
+
+@pytest.mark.parametrize(
+    'version,input_status',
+    [
+        pytest.param('2.9.52', SNAPPASS_JSON29, id='2.9'),
+        pytest.param('3.6.8', SNAPPASS_JSON, id='3'),
+    ],
+)
+def test_filtered(version: str, input_status: str, run: mocks.Run, time: mocks.Time):
+    run.handle(['juju', 'status', '--format', 'json', 'snappass-test'], stdout=input_status)
+    juju = jubilant.Juju(cli_version=version)
+
+    status = juju.wait(jubilant.all_active, apps=['snappass-test'], successes=1)
+
+    assert status.apps['snappass-test'].is_active
+    assert len(run.calls) == 1
+
+
+MAINTENANCE_JSON29 = SNAPPASS_JSON29.replace('"active"', '"maintenance"')
+ACTIVE_QUERY = (
+    'forEach(applications, app => app.status == "active") && '
+    'forEach(units, unit => unit.workload-status == "active")'
+)
+WAIT_FOR = ['juju', 'wait-for', 'model', 'tt', '--query', ACTIVE_QUERY, '--timeout']
+
+
+class BecomesActive(mocks.Run):
+    """Returns a status in maintenance until "juju wait-for" is run."""
+
+    def __call__(
+        self,
+        args: list[str],
+        check: bool = False,
+        capture_output: bool = False,
+        encoding: str | None = None,
+        input: str | None = None,
+    ) -> subprocess.CompletedProcess[str]:
+        if args[1] == 'wait-for':
+            self.handle(['juju', 'status', '--format', 'json'], stdout=SNAPPASS_JSON29)
+        return super().__call__(args, check, capture_output, encoding, input)
+
+
+def test_server_side(monkeypatch: pytest.MonkeyPatch, time: mocks.Time):
+    run = BecomesActive()
+    monkeypatch.setattr('subprocess.run', run)
+    run.handle(['juju', 'status', '--format', 'json'], stdout=MAINTENANCE_JSON29)
+    run.handle([*WAIT_FOR, '180s'])
+    juju = jubilant.Juju(cli_version='2.9.52')
+
+    status = juju.wait(jubilant.all_active, server_side=True)
+
+    assert status.apps['snappass-test'].is_active
+    assert [call.args[1] for call in run.calls] == ['status', 'wait-for', 'status']
+    assert time.monotonic() == 0
+
+
+def test_server_side_error_timeout(run: mocks.Run, time: mocks.Time):
+    run.handle(['juju', 'status', '--format', 'json'], stdout=MAINTENANCE_JSON29)
+    run.handle([*WAIT_FOR, '1s'])
+    juju = jubilant.Juju(cli_version='2.9.52')
+
+    with pytest.raises(TimeoutError):
+        juju.wait(
+            jubilant.all_active,
+            error=jubilant.any_error,
+            delay=0.1,
+            timeout=0.25,
+            server_side=True,
+        )
+
+    # Each wait-for is limited to 10 * delay. It returned, but the status still isn't ready,
+    # so wait() sleeps before the next one.
+    assert [call.args[1] for call in run.calls] == ['status', 'wait-for', 'status'] * 3
+
+
+def test_server_side_fallback(run: mocks.Run, time: mocks.Time):
+    run.handle(['juju', 'status', '--format', 'json'], stdout=MAINTENANCE_JSON29)
+    run.handle([*WAIT_FOR, '3s'], returncode=2, stderr='ERROR invalid query')
+    juju = jubilant.Juju(cli_version='2.9.52')
+
+    with pytest.raises(TimeoutError):
+        juju.wait(jubilant.all_active, timeout=3, server_side=True)
+
+    assert [call.args[1] for call in run.calls] == ['status', 'wait-for', 'status', 'status']
+
+
+def test_server_side_untranslatable(run: mocks.Run, time: mocks.Time):
+    run.handle(['juju', 'status', '--format', 'json'], stdout=SNAPPASS_JSON29)
+    juju = jubilant.Juju(cli_version='2.9.52')
+
+    status = juju.wait(
+        lambda status: jubilant.any_active(status, 'snappass-test'), server_side=True
+    )
+
+    assert status.apps['snappass-test'].is_active
+    assert [call.args[1] for call in run.calls] == ['status'] * 3
+
+
+class FakeActivity:
+    """Stands in for LogActivity, reporting activity for the first *active* waits."""
+
+    def __init__(self, args: list[str], *, settle: float, active: int):
+        self.args = args
+        self.settle = settle
+        self.active = active
+        self.waits: list[float] = []
+        self.closed = False
+
+    def clear(self):
+        pass
+
+    def wait(self, timeout: float) -> bool:
+        self.waits.append(timeout)
+        if len(self.waits) <= self.active:
+            time_module.sleep(self.settle)
+            return True
+        time_module.sleep(timeout)
+        return False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.mark.parametrize('active,elapsed', [(2, 1.0), (1, 10.5), (0, 20.0)])
+def test_activity(
+    active: int, elapsed: float, monkeypatch: pytest.MonkeyPatch, run: mocks.Run, time: mocks.Time
+):
+    fakes: list[FakeActivity] = []
+
+    def fake_activity(args: list[str], *, settle: float) -> FakeActivity:
+        fakes.append(FakeActivity(args, settle=settle, active=active))
+        return fakes[-1]
+
+    monkeypatch.setattr('jubilant_backports._juju.LogActivity', fake_activity)
+    run.handle(['juju', 'status', '--model', 'mdl', '--format', 'json'], stdout=SNAPPASS_JSON29)
+    juju = jubilant.Juju(model='mdl', cli_version='2.9.52')
+
+    juju.wait(jubilant.all_active, delay=10, activity_delay=0.5)
+
+    (fake,) = fakes
+    assert fake.args == ['juju', 'debug-log', '--model', 'mdl', '--tail', '--lines', '0']
+    assert fake.waits == [10, 10]
+    assert fake.closed
+    assert len(run.calls) == 3
+    assert time.monotonic() == elapsed
+
+
+def test_stable_for(run: mocks.Run, time: mocks.Time):
+    run.handle(['juju', 'status', '--format', 'json'], stdout=SNAPPASS_JSON29)
+    juju = jubilant.Juju(cli_version='2.9.52')
+
+    status = juju.wait(jubilant.all_active, stable_for=60)
+
+    assert status.apps['snappass-test'].is_active
+    assert len(run.calls) == 1
+    assert time.monotonic() == 0
+
+
+@pytest.mark.parametrize(
+    'stdout,stable_for',
+    [
+        pytest.param(SNAPPASS_JSON29, 10**10, id='not-long-enough'),
+        pytest.param(SNAPPASS_JSON29.replace('"idle"', '"executing"'), 60, id='not-idle'),
+        pytest.param(SNAPPASS_JSON29.replace('15 Jul 2025', 'yesterday'), 60, id='bad-since'),
+    ],
+)
+def test_stable_for_not_settled(run: mocks.Run, time: mocks.Time, stdout: str, stable_for: float):
+    run.handle(['juju', 'status', '--format', 'json'], stdout=stdout)
+    juju = jubilant.Juju(cli_version='2.9.52')
+
+    juju.wait(jubilant.all_active, stable_for=stable_for)
+
+    # Falls back to counting successes.
+    assert len(run.calls) == 3
+    assert time.monotonic() == 2
+
+
+def test_pipeline(run: mocks.Run, caplog: pytest.LogCaptureFixture):
+    run.handle(['juju', 'status', '--format', 'json'], stdout=SNAPPASS_JSON29)
+    juju = jubilant.Juju(cli_version='2.9.52')
+
+    with caplog.at_level('DEBUG', logger='jubilant.wait'):
+        status = juju.wait(jubilant.all_active, delay=0.2, pipeline=True)
+
+    assert status.apps['snappass-test'].is_active
+    # The fetch started after the last status is abandoned before it runs.
+    assert len(run.calls) == 3
+    stats = [r.getMessage() for r in caplog.records if 'status calls' in r.getMessage()]
+    assert len(stats) == 1
+    assert stats[0].startswith('wait: 3 status calls, mean call time ')
+    assert 'mean poll period 0.2' in stats[0]
+    assert stats[0].endswith('FixedSchedule(0.2)')
+
+
+def test_pipeline_cli_error(run: mocks.Run):
+    run.handle(['juju', 'status', '--format', 'json', 'x'], returncode=1, stderr='boom')
+    juju = jubilant.Juju(cli_version='2.9.52')
+
+    with pytest.raises(jubilant.CLIError):
+        juju.wait(jubilant.all_active, apps=['x'], delay=0.01, pipeline=True)
+
+
+def test_pipeline_through_broker(run: mocks.Run):
+    run.handle(['juju', 'status', '--format', 'json'], stdout=SNAPPASS_JSON29)
+    juju = jubilant.Juju(cli_version='2.9.52')
+
+    with juju.status_broker(interval=3600) as broker:
+        status = juju.wait(jubilant.all_active, delay=0.2, pipeline=True)
+        fetches = broker.fetches
+
+    assert status.apps['snappass-test'].is_active
+    # Every status call went through the broker, as it does without pipelining.
+    assert fetches == len(run.calls)
+
+
+def test_pipeline_incompatible():
+    juju = jubilant.Juju(cli_version='2.9.52')
+
+    with pytest.raises(TypeError):
+        juju.wait(jubilant.all_active, pipeline=True, server_side=True)
+    with pytest.raises(TypeError):
+        juju.wait(jubilant.all_active, pipeline=True, activity_delay=0.1)
+
+
+class Ticking(mocks.Run):
+    """Returns the same status each time, except for the controller timestamp."""
+
+    def __call__(
+        self,
+        args: list[str],
+        check: bool = False,
+        capture_output: bool = False,
+        encoding: str | None = None,
+        input: str | None = None,
+    ) -> subprocess.CompletedProcess[str]:
+        stdout = SNAPPASS_JSON29.replace('21:24:58', f'21:24:{len(self.calls):02d}')
+        self.handle(['juju', 'status', '--format', 'json'], stdout=stdout)
+        return super().__call__(args, check, capture_output, encoding, input)
+
+
+def test_unchanged_output_not_rechecked(monkeypatch: pytest.MonkeyPatch, time: mocks.Time):
+    run = Ticking()
+    monkeypatch.setattr('subprocess.run', run)
+    juju = jubilant.Juju(cli_version='2.9.52')
+    checked: list[str] = []
+
+    def ready(status: jubilant.Status) -> bool:
+        checked.append('ready')
+        return True
+
+    def error(status: jubilant.Status) -> bool:
+        checked.append('error')
+        return False
+
+    status = juju.wait(ready, error=error)
+
+    assert len(run.calls) == 3
+    assert checked == ['error', 'ready']
+    assert status.controller.timestamp == '21:24:00+12:00'